@@ -4,12 +4,14 @@ FastAPI Backend Server for Market Hunt Frontend
 Provides RESTful API endpoints for the Next.js frontend
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from datetime import datetime, timedelta
 import pymongo
-from pymongo import MongoClient
+from pymongo import MongoClient, WriteConcern
+import motor.motor_asyncio
 from bson import ObjectId
 import logging
 from typing import List, Dict, Any, Optional, Union
@@ -17,12 +19,30 @@ from pydantic import BaseModel
 import uvicorn
 import asyncio
 import aiohttp
+import time
 import pandas as pd  # Added for indicator optimizations
 import numpy as np  # Added for enhanced analytics
 import random  # Added for simulation
 import json  # Added for enhanced JSON serialization
+import bisect
+import operator
+import statistics
+import os
+import traceback
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from functools import lru_cache, reduce
+from itertools import groupby
+from dateutil.relativedelta import relativedelta
+import orjson
 import io  # Added for PDF generation
 from fastapi.responses import StreamingResponse  # Added for PDF downloads
+from indicator_data_manager import IndicatorDataManager
+from stock_data_manager import StockDataManager
+import momentum_kernels
 from brokerage_calculator import (
     BrokerageCalculator, 
     TransactionCharges, 
@@ -49,6 +69,11 @@ def sanitize_for_json(obj):
     else:
         return obj
 
+class NumpyORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also serializes numpy scalars/arrays (simulation payloads)"""
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
 # FastAPI app
 app = FastAPI(
     title="Market Hunt API",
@@ -65,6 +90,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (e.g. index distribution with symbol breakdown)
+app.add_middleware(GZipMiddleware, minimum_size=10_000)
+
 # MongoDB connection
 MONGO_URI = "mongodb://localhost:27017/"
 DB_NAME = "market_hunt"
@@ -73,11 +101,16 @@ class MongoDBConnection:
     def __init__(self):
         self.client = None
         self.db = None
+        # Async (Motor) client for async endpoints so queries don't block the event loop
+        self.async_client = None
+        self.async_db = None
     
     def connect(self):
         try:
             self.client = MongoClient(MONGO_URI)
             self.db = self.client[DB_NAME]
+            self.async_client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI)
+            self.async_db = self.async_client[DB_NAME]
             logger.info(f"Connected to MongoDB: {DB_NAME}")
             return True
         except Exception as e:
@@ -87,6 +120,8 @@ class MongoDBConnection:
     def close(self):
         if self.client:
             self.client.close()
+        if self.async_client:
+            self.async_client.close()
 
 # Global MongoDB connection
 mongo_conn = MongoDBConnection()
@@ -147,11 +182,54 @@ def serialize_doc(doc):
 @app.on_event("startup")
 async def startup_event():
     mongo_conn.connect()
+    
+    # Shared data managers reused across requests (one connection pool each)
+    app.state.indicator_mgr = None
+    app.state.stock_mgr = None
+    try:
+        app.state.indicator_mgr = await IndicatorDataManager().__aenter__()
+        app.state.stock_mgr = await StockDataManager().__aenter__()
+    except Exception as e:
+        logger.error(f"Failed to initialize shared data managers: {e}")
+    
+    # Indexes backing the hot lookups (strategy by id, constituents by index)
+    if mongo_conn.async_db is not None:
+        try:
+            await mongo_conn.async_db.simulation_strategies.create_index("id", unique=True)
+            # Compound index also covers distinct("Symbol") per index_name
+            await mongo_conn.async_db.index_meta.create_index([("index_name", 1), ("Symbol", 1)])
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to ensure MongoDB indexes: {e}")
+    
+    # Simulation loads: (indicator_type, symbol, date) on indicators is ensured by
+    # IndicatorDataManager; price partitions need (symbol, date) for the bulk $in reads
+    if app.state.stock_mgr is not None:
+        try:
+            await app.state.stock_mgr.ensure_price_indexes()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to ensure price partition indexes: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    if app.state.stock_mgr is not None:
+        await app.state.stock_mgr.__aexit__(None, None, None)
+    if app.state.indicator_mgr is not None:
+        await app.state.indicator_mgr.__aexit__(None, None, None)
+    if _simulation_executor is not None:
+        _simulation_executor.shutdown(wait=False, cancel_futures=True)
     mongo_conn.close()
 
+# Dependencies providing the shared data managers
+def get_indicator_mgr(request: Request) -> IndicatorDataManager:
+    if request.app.state.indicator_mgr is None:
+        raise HTTPException(status_code=500, detail="Database connection not available")
+    return request.app.state.indicator_mgr
+
+def get_stock_mgr(request: Request) -> StockDataManager:
+    if request.app.state.stock_mgr is None:
+        raise HTTPException(status_code=500, detail="Database connection not available")
+    return request.app.state.stock_mgr
+
 @app.get("/")
 async def root():
     return {"message": "Market Hunt API Server", "version": "1.0.0", "status": "operational"}
@@ -695,6 +773,10 @@ async def process_urls(request: ProcessURLRequest):
         
         loader.close_connection()
         
+        # index_meta may have changed; drop cached index/universe lookups
+        _universe_symbols_cache.clear()
+        _available_indices_cache["expires_at"] = 0.0
+        
         if results.get("success", False):
             processed_count = results.get("processed_count", 0)
             total_count = results.get("total_count", 0)
@@ -801,66 +883,61 @@ class StockDataResponse(BaseModel):
 async def get_symbol_mappings(
     index_name: Optional[str] = None,
     industry: Optional[str] = None,
-    mapped_only: bool = False
+    mapped_only: bool = False,
+    manager: StockDataManager = Depends(get_stock_mgr)
 ):
     """Get symbol mappings between index_meta and NSE scripcode"""
     try:
         if mongo_conn.db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
-        from stock_data_manager import StockDataManager
+        mappings = await manager.get_symbol_mappings(
+            index_name=index_name,
+            industry=industry,
+            mapped_only=mapped_only
+        )
+        
+        # Convert to dict for JSON serialization
+        mappings_data = []
+        for mapping in mappings:
+            mapping_dict = {
+                "symbol": mapping.symbol,
+                "company_name": mapping.company_name,
+                "industry": mapping.industry,
+                "index_names": mapping.index_names,  # Now an array
+                "nse_scrip_code": mapping.nse_scrip_code,
+                "nse_symbol": mapping.nse_symbol,
+                "nse_name": mapping.nse_name,
+                "match_confidence": mapping.match_confidence,
+                "last_updated": mapping.last_updated.isoformat() if mapping.last_updated else None
+            }
+            mappings_data.append(mapping_dict)
+        
+        return JSONResponse(content={
+            "total_mappings": len(mappings_data),
+            "mapped_count": len([m for m in mappings_data if m["nse_scrip_code"] is not None]),
+            "mappings": mappings_data
+        })
         
-        async with StockDataManager() as manager:
-            mappings = await manager.get_symbol_mappings(
-                index_name=index_name,
-                industry=industry,
-                mapped_only=mapped_only
-            )
-            
-            # Convert to dict for JSON serialization
-            mappings_data = []
-            for mapping in mappings:
-                mapping_dict = {
-                    "symbol": mapping.symbol,
-                    "company_name": mapping.company_name,
-                    "industry": mapping.industry,
-                    "index_names": mapping.index_names,  # Now an array
-                    "nse_scrip_code": mapping.nse_scrip_code,
-                    "nse_symbol": mapping.nse_symbol,
-                    "nse_name": mapping.nse_name,
-                    "match_confidence": mapping.match_confidence,
-                    "last_updated": mapping.last_updated.isoformat() if mapping.last_updated else None
-                }
-                mappings_data.append(mapping_dict)
-            
-            return JSONResponse(content={
-                "total_mappings": len(mappings_data),
-                "mapped_count": len([m for m in mappings_data if m["nse_scrip_code"] is not None]),
-                "mappings": mappings_data
-            })
-            
     except Exception as e:
         logger.error(f"Error fetching symbol mappings: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch symbol mappings: {str(e)}")
 
 @app.post("/api/stock/mappings/refresh")
-async def refresh_symbol_mappings():
+async def refresh_symbol_mappings(manager: StockDataManager = Depends(get_stock_mgr)):
     """Refresh symbol mappings from index_meta and NSE masters"""
     try:
         if mongo_conn.db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
-        from stock_data_manager import StockDataManager
+        result = await manager.refresh_symbol_mappings_from_index_meta()
+        
+        return JSONResponse(content={
+            "success": True,
+            "message": "Symbol mappings refreshed successfully",
+            "result": result
+        })
         
-        async with StockDataManager() as manager:
-            result = await manager.refresh_symbol_mappings_from_index_meta()
-            
-            return JSONResponse(content={
-                "success": True,
-                "message": "Symbol mappings refreshed successfully",
-                "result": result
-            })
-            
     except Exception as e:
         logger.error(f"Error refreshing symbol mappings: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to refresh symbol mappings: {str(e)}")
@@ -870,60 +947,58 @@ async def get_stock_price_data(
     symbol: str,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    limit: Optional[int] = 1000  # Increased default limit
+    limit: Optional[int] = 1000,  # Increased default limit
+    manager: StockDataManager = Depends(get_stock_mgr)
 ):
     """Get historical price data for a symbol"""
     try:
         if mongo_conn.db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
-        from stock_data_manager import StockDataManager
-        
         # Parse dates
         start_dt = datetime.fromisoformat(start_date) if start_date else None
         end_dt = datetime.fromisoformat(end_date) if end_date else None
         
-        async with StockDataManager() as manager:
-            # Get total count without limit for progress tracking
-            total_count = await manager.get_price_data_count(
-                symbol=symbol,
-                start_date=start_dt,
-                end_date=end_dt
-            )
-            
-            # Get actual data with limit (sorted by date descending - newest first)
-            price_data = await manager.get_price_data(
-                symbol=symbol,
-                start_date=start_dt,
-                end_date=end_dt,
-                limit=limit,
-                sort_order=-1  # -1 for descending (newest first)
-            )
-            
-            # Convert to dict for JSON serialization
-            price_records = []
-            for record in price_data:
-                price_dict = {
-                    "scrip_code": record.scrip_code,
-                    "symbol": record.symbol,
-                    "date": record.date.isoformat(),
-                    "open_price": record.open_price,
-                    "high_price": record.high_price,
-                    "low_price": record.low_price,
-                    "close_price": record.close_price,
-                    "volume": record.volume,
-                    "value": record.value,
-                    "year_partition": record.year_partition
-                }
-                price_records.append(price_dict)
-            
-            return JSONResponse(content={
-                "symbol": symbol,
-                "total_records": total_count,  # Actual total count
-                "returned_records": len(price_records),  # Records in this response
-                "data": price_records
-            })
-            
+        # Get total count without limit for progress tracking
+        total_count = await manager.get_price_data_count(
+            symbol=symbol,
+            start_date=start_dt,
+            end_date=end_dt
+        )
+        
+        # Get actual data with limit (sorted by date descending - newest first)
+        price_data = await manager.get_price_data(
+            symbol=symbol,
+            start_date=start_dt,
+            end_date=end_dt,
+            limit=limit,
+            sort_order=-1  # -1 for descending (newest first)
+        )
+        
+        # Convert to dict for JSON serialization
+        price_records = []
+        for record in price_data:
+            price_dict = {
+                "scrip_code": record.scrip_code,
+                "symbol": record.symbol,
+                "date": record.date.isoformat(),
+                "open_price": record.open_price,
+                "high_price": record.high_price,
+                "low_price": record.low_price,
+                "close_price": record.close_price,
+                "volume": record.volume,
+                "value": record.value,
+                "year_partition": record.year_partition
+            }
+            price_records.append(price_dict)
+        
+        return JSONResponse(content={
+            "symbol": symbol,
+            "total_records": total_count,  # Actual total count
+            "returned_records": len(price_records),  # Records in this response
+            "data": price_records
+        })
+        
     except Exception as e:
         logger.error(f"Error fetching price data for {symbol}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch price data: {str(e)}")
@@ -1009,26 +1084,23 @@ async def download_stock_data(request: StockDataRequest, background_tasks: Backg
         raise HTTPException(status_code=500, detail=f"Failed to start download: {str(e)}")
 
 @app.get("/api/stock/statistics")
-async def get_stock_data_statistics():
+async def get_stock_data_statistics(manager: StockDataManager = Depends(get_stock_mgr)):
     """Get statistics about stored stock price data"""
     try:
         if mongo_conn.db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
-        from stock_data_manager import StockDataManager
+        stats = await manager.get_data_statistics()
+        
+        # Convert datetime objects to strings for JSON serialization
+        if stats.get("date_range"):
+            if stats["date_range"]["earliest"]:
+                stats["date_range"]["earliest"] = stats["date_range"]["earliest"].isoformat()
+            if stats["date_range"]["latest"]:
+                stats["date_range"]["latest"] = stats["date_range"]["latest"].isoformat()
+        
+        return JSONResponse(content=stats)
         
-        async with StockDataManager() as manager:
-            stats = await manager.get_data_statistics()
-            
-            # Convert datetime objects to strings for JSON serialization
-            if stats.get("date_range"):
-                if stats["date_range"]["earliest"]:
-                    stats["date_range"]["earliest"] = stats["date_range"]["earliest"].isoformat()
-                if stats["date_range"]["latest"]:
-                    stats["date_range"]["latest"] = stats["date_range"]["latest"].isoformat()
-            
-            return JSONResponse(content=stats)
-            
     except Exception as e:
         logger.error(f"Error fetching stock data statistics: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch statistics: {str(e)}")
@@ -1038,64 +1110,62 @@ async def get_available_symbols(
     index_name: Optional[str] = None,
     industry: Optional[str] = None,
     limit: Optional[int] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    manager: StockDataManager = Depends(get_stock_mgr)
 ):
     """Get all available symbols from the database with optional filtering"""
     try:
         if mongo_conn.db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
-        from stock_data_manager import StockDataManager
+        mappings = await manager.get_symbol_mappings(
+            index_name=index_name,
+            industry=industry,
+            mapped_only=True  # Only return symbols with NSE mapping
+        )
+        
+        # Convert to simplified format for frontend
+        symbols_data = []
+        for mapping in mappings:
+            symbol_dict = {
+                "symbol": mapping.symbol,
+                "name": mapping.company_name,
+                "sector": mapping.industry,
+                "index_names": mapping.index_names,
+                "nse_symbol": mapping.nse_symbol,
+                "last_updated": mapping.last_updated.isoformat() if mapping.last_updated else None
+            }
+            symbols_data.append(symbol_dict)
+        
+        # Apply search filter if provided
+        if search:
+            search_lower = search.lower()
+            symbols_data = [
+                s for s in symbols_data 
+                if search_lower in s["symbol"].lower() or 
+                   search_lower in s["name"].lower() or
+                   search_lower in (s["sector"] or "").lower()
+            ]
+        
+        # Apply limit if provided
+        if limit:
+            symbols_data = symbols_data[:limit]
+        
+        # Sort by symbol name for consistent ordering
+        symbols_data.sort(key=lambda x: x["symbol"])
+        
+        return JSONResponse(content={
+            "success": True,
+            "total": len(symbols_data),
+            "symbols": symbols_data,
+            "filters": {
+                "index_name": index_name,
+                "industry": industry,
+                "search": search,
+                "limit": limit
+            }
+        })
         
-        async with StockDataManager() as manager:
-            mappings = await manager.get_symbol_mappings(
-                index_name=index_name,
-                industry=industry,
-                mapped_only=True  # Only return symbols with NSE mapping
-            )
-            
-            # Convert to simplified format for frontend
-            symbols_data = []
-            for mapping in mappings:
-                symbol_dict = {
-                    "symbol": mapping.symbol,
-                    "name": mapping.company_name,
-                    "sector": mapping.industry,
-                    "index_names": mapping.index_names,
-                    "nse_symbol": mapping.nse_symbol,
-                    "last_updated": mapping.last_updated.isoformat() if mapping.last_updated else None
-                }
-                symbols_data.append(symbol_dict)
-            
-            # Apply search filter if provided
-            if search:
-                search_lower = search.lower()
-                symbols_data = [
-                    s for s in symbols_data 
-                    if search_lower in s["symbol"].lower() or 
-                       search_lower in s["name"].lower() or
-                       search_lower in (s["sector"] or "").lower()
-                ]
-            
-            # Apply limit if provided
-            if limit:
-                symbols_data = symbols_data[:limit]
-            
-            # Sort by symbol name for consistent ordering
-            symbols_data.sort(key=lambda x: x["symbol"])
-            
-            return JSONResponse(content={
-                "success": True,
-                "total": len(symbols_data),
-                "symbols": symbols_data,
-                "filters": {
-                    "index_name": index_name,
-                    "industry": industry,
-                    "search": search,
-                    "limit": limit
-                }
-            })
-            
     except Exception as e:
         logger.error(f"Error fetching available symbols: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch available symbols: {str(e)}")
@@ -1158,13 +1228,12 @@ def check_stock_gaps(symbols: List[str]):
         raise HTTPException(status_code=500, detail=f"Failed to check gaps: {str(e)}")
 
 @app.post("/api/stock/indicators")
-async def calculate_stock_indicators(request: IndicatorRequest):
+async def calculate_stock_indicators(request: IndicatorRequest, manager: StockDataManager = Depends(get_stock_mgr)):
     """Calculate technical indicators for stock price data - Optimized"""
     try:
         if mongo_conn.db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
-        from stock_data_manager import StockDataManager
         from indicator_engine import IndicatorEngine
         
         # Optimize date range - if not provided, use smart defaults based on indicator period
@@ -1192,175 +1261,174 @@ async def calculate_stock_indicators(request: IndicatorRequest):
             end_dt = datetime.fromisoformat(request.end_date)
         
         # Get price data with optimized limit
-        async with StockDataManager() as manager:
-            # Calculate appropriate limit based on date range
-            date_range_days = (end_dt - start_dt).days
-            if date_range_days > 365 * 5:  # More than 5 years
-                initial_limit = 50000  # Large limit for ALL timeframe
-            elif date_range_days > 365:    # More than 1 year
-                initial_limit = 20000  # Medium limit for 5Y timeframe
-            else:
-                initial_limit = 10000  # Small limit for 1Y timeframe
-            
-            logger.info(f"Using limit {initial_limit} for {date_range_days} days of data")
+        # Calculate appropriate limit based on date range
+        date_range_days = (end_dt - start_dt).days
+        if date_range_days > 365 * 5:  # More than 5 years
+            initial_limit = 50000  # Large limit for ALL timeframe
+        elif date_range_days > 365:    # More than 1 year
+            initial_limit = 20000  # Medium limit for 5Y timeframe
+        else:
+            initial_limit = 10000  # Small limit for 1Y timeframe
+        
+        logger.info(f"Using limit {initial_limit} for {date_range_days} days of data")
+        
+        price_data = await manager.get_price_data(
+            symbol=request.symbol,
+            start_date=start_dt,
+            end_date=end_dt,
+            limit=initial_limit,
+            sort_order=1  # Ascending order for indicator calculation
+        )
+        
+        if not price_data:
+            raise HTTPException(status_code=404, detail=f"No price data found for symbol {request.symbol}")
+        
+        # Check if we have enough data for the indicator
+        if len(price_data) < request.period:
+            # Try to get more data by extending the date range
+            extended_start = start_dt - pd.Timedelta(days=365)  # Go back 1 year
+            logger.info(f"Insufficient data ({len(price_data)} points), extending range to {extended_start.date()}")
             
             price_data = await manager.get_price_data(
                 symbol=request.symbol,
-                start_date=start_dt,
+                start_date=extended_start,
                 end_date=end_dt,
-                limit=initial_limit,
-                sort_order=1  # Ascending order for indicator calculation
+                limit=20000,
+                sort_order=1
             )
             
-            if not price_data:
-                raise HTTPException(status_code=404, detail=f"No price data found for symbol {request.symbol}")
-            
-            # Check if we have enough data for the indicator
             if len(price_data) < request.period:
-                # Try to get more data by extending the date range
-                extended_start = start_dt - pd.Timedelta(days=365)  # Go back 1 year
-                logger.info(f"Insufficient data ({len(price_data)} points), extending range to {extended_start.date()}")
-                
-                price_data = await manager.get_price_data(
-                    symbol=request.symbol,
-                    start_date=extended_start,
-                    end_date=end_dt,
-                    limit=20000,
-                    sort_order=1
+                raise HTTPException(
+                    status_code=400, 
+                    detail=f"Insufficient data for {request.period}-period indicator. Found {len(price_data)} points, need at least {request.period}"
                 )
-                
-                if len(price_data) < request.period:
-                    raise HTTPException(
-                        status_code=400, 
-                        detail=f"Insufficient data for {request.period}-period indicator. Found {len(price_data)} points, need at least {request.period}"
-                    )
-            
-            # Convert price data to dict format for indicator engine (optimized)
-            price_records = []
-            for record in price_data:
-                price_dict = {
-                    "date": record.date.isoformat(),
-                    "close_price": record.close_price,  # Always include close_price
-                }
-                
-                # Only include other fields if needed
-                if request.price_field != 'close_price':
-                    price_dict[request.price_field] = getattr(record, request.price_field)
-                
-                # For MACD, Bollinger, CRS, Dynamic Fibonacci, and TrueValueX indicators, include OHLC
-                if request.indicator_type in ['macd', 'bollinger', 'crs', 'dynamic_fib', 'truevx']:
-                    price_dict.update({
-                        "open_price": record.open_price,
-                        "high_price": record.high_price,
-                        "low_price": record.low_price,
-                        "volume": record.volume,
-                    })
-                
-                price_records.append(price_dict)
-            
-            # Initialize indicator engine
-            engine = IndicatorEngine()
-            
-            # Prepare parameters for indicator calculation
-            calc_params = {
-                "period": request.period,
-                "price_field": request.price_field
+        
+        # Convert price data to dict format for indicator engine (optimized)
+        price_records = []
+        for record in price_data:
+            price_dict = {
+                "date": record.date.isoformat(),
+                "close_price": record.close_price,  # Always include close_price
             }
             
-            # Add specific parameters for different indicators
-            if request.indicator_type == 'macd':
-                calc_params.update({
-                    "fast_period": request.fast_period,
-                    "slow_period": request.slow_period,
-                    "signal_period": request.signal_period
-                })
-            elif request.indicator_type == 'bollinger':
-                calc_params.update({
-                    "std_dev": request.std_dev
-                })
-            elif request.indicator_type == 'crs':
-                calc_params.update({
-                    "base_symbol": request.base_symbol,
-                    "start_date": start_dt.isoformat() if start_dt else None,
-                    "end_date": end_dt.isoformat() if end_dt else None
-                })
-            elif request.indicator_type == 'dynamic_fib':
-                # Set default lookback periods if not provided
-                lookback_periods = request.lookback if request.lookback else [22, 66, 222]
-                calc_params.update({
-                    "lookback": lookback_periods
-                })
-            elif request.indicator_type == 'truevx':
-                calc_params.update({
-                    "base_symbol": request.base_symbol or "Nifty 50",
-                    "start_date": start_dt.isoformat() if start_dt else None,
-                    "end_date": end_dt.isoformat() if end_dt else None
+            # Only include other fields if needed
+            if request.price_field != 'close_price':
+                price_dict[request.price_field] = getattr(record, request.price_field)
+            
+            # For MACD, Bollinger, CRS, Dynamic Fibonacci, and TrueValueX indicators, include OHLC
+            if request.indicator_type in ['macd', 'bollinger', 'crs', 'dynamic_fib', 'truevx']:
+                price_dict.update({
+                    "open_price": record.open_price,
+                    "high_price": record.high_price,
+                    "low_price": record.low_price,
+                    "volume": record.volume,
                 })
             
-            # Calculate indicator (now with caching and optimization)
-            try:
-                calculation_start = datetime.now()
-                
-                # Special handling for CRS and TrueValueX since they're async
-                if request.indicator_type == 'crs':
-                    indicator_data = await engine.calculate_crs(
-                        data=price_records,
-                        base_symbol=request.base_symbol,
-                        start_date=start_dt.isoformat() if start_dt else None,
-                        end_date=end_dt.isoformat() if end_dt else None
-                    )
-                elif request.indicator_type == 'truevx':
-                    # Pass additional TrueValueX parameters
-                    truevx_params = {}
-                    if request.s1 is not None:
-                        truevx_params['s1'] = request.s1
-                    if request.m2 is not None:
-                        truevx_params['m2'] = request.m2
-                    if request.l3 is not None:
-                        truevx_params['l3'] = request.l3
-                    if request.strength is not None:
-                        truevx_params['strength'] = request.strength
-                    if request.w_long is not None:
-                        truevx_params['w_long'] = request.w_long
-                    if request.w_mid is not None:
-                        truevx_params['w_mid'] = request.w_mid
-                    if request.w_short is not None:
-                        truevx_params['w_short'] = request.w_short
-                    if request.deadband_frac is not None:
-                        truevx_params['deadband_frac'] = request.deadband_frac
-                    if request.min_deadband is not None:
-                        truevx_params['min_deadband'] = request.min_deadband
-                    
-                    indicator_data = await engine.calculate_truevx_ranking(
-                        data=price_records,
-                        base_symbol=request.base_symbol or "Nifty 50",
-                        start_date=start_dt.isoformat() if start_dt else None,
-                        end_date=end_dt.isoformat() if end_dt else None,
-                        **truevx_params
-                    )
-                else:
-                    indicator_data = engine.calculate_indicator(
-                        indicator_type=request.indicator_type,
-                        data=price_records,
-                        **calc_params
-                    )
-                calculation_time = (datetime.now() - calculation_start).total_seconds()
-                
-                logger.info(f"Indicator calculation completed in {calculation_time:.3f}s")
+            price_records.append(price_dict)
+        
+        # Initialize indicator engine
+        engine = IndicatorEngine()
+        
+        # Prepare parameters for indicator calculation
+        calc_params = {
+            "period": request.period,
+            "price_field": request.price_field
+        }
+        
+        # Add specific parameters for different indicators
+        if request.indicator_type == 'macd':
+            calc_params.update({
+                "fast_period": request.fast_period,
+                "slow_period": request.slow_period,
+                "signal_period": request.signal_period
+            })
+        elif request.indicator_type == 'bollinger':
+            calc_params.update({
+                "std_dev": request.std_dev
+            })
+        elif request.indicator_type == 'crs':
+            calc_params.update({
+                "base_symbol": request.base_symbol,
+                "start_date": start_dt.isoformat() if start_dt else None,
+                "end_date": end_dt.isoformat() if end_dt else None
+            })
+        elif request.indicator_type == 'dynamic_fib':
+            # Set default lookback periods if not provided
+            lookback_periods = request.lookback if request.lookback else [22, 66, 222]
+            calc_params.update({
+                "lookback": lookback_periods
+            })
+        elif request.indicator_type == 'truevx':
+            calc_params.update({
+                "base_symbol": request.base_symbol or "Nifty 50",
+                "start_date": start_dt.isoformat() if start_dt else None,
+                "end_date": end_dt.isoformat() if end_dt else None
+            })
+        
+        # Calculate indicator (now with caching and optimization)
+        try:
+            calculation_start = datetime.now()
+            
+            # Special handling for CRS and TrueValueX since they're async
+            if request.indicator_type == 'crs':
+                indicator_data = await engine.calculate_crs(
+                    data=price_records,
+                    base_symbol=request.base_symbol,
+                    start_date=start_dt.isoformat() if start_dt else None,
+                    end_date=end_dt.isoformat() if end_dt else None
+                )
+            elif request.indicator_type == 'truevx':
+                # Pass additional TrueValueX parameters
+                truevx_params = {}
+                if request.s1 is not None:
+                    truevx_params['s1'] = request.s1
+                if request.m2 is not None:
+                    truevx_params['m2'] = request.m2
+                if request.l3 is not None:
+                    truevx_params['l3'] = request.l3
+                if request.strength is not None:
+                    truevx_params['strength'] = request.strength
+                if request.w_long is not None:
+                    truevx_params['w_long'] = request.w_long
+                if request.w_mid is not None:
+                    truevx_params['w_mid'] = request.w_mid
+                if request.w_short is not None:
+                    truevx_params['w_short'] = request.w_short
+                if request.deadband_frac is not None:
+                    truevx_params['deadband_frac'] = request.deadband_frac
+                if request.min_deadband is not None:
+                    truevx_params['min_deadband'] = request.min_deadband
                 
-            except ValueError as ve:
-                raise HTTPException(status_code=400, detail=str(ve))
+                indicator_data = await engine.calculate_truevx_ranking(
+                    data=price_records,
+                    base_symbol=request.base_symbol or "Nifty 50",
+                    start_date=start_dt.isoformat() if start_dt else None,
+                    end_date=end_dt.isoformat() if end_dt else None,
+                    **truevx_params
+                )
+            else:
+                indicator_data = engine.calculate_indicator(
+                    indicator_type=request.indicator_type,
+                    data=price_records,
+                    **calc_params
+                )
+            calculation_time = (datetime.now() - calculation_start).total_seconds()
             
-            return JSONResponse(content={
-                "symbol": request.symbol,
-                "indicator_type": request.indicator_type,
-                "parameters": calc_params,
-                "total_points": len(indicator_data),
-                "price_data_points": len(price_records),
-                "calculation_time_seconds": round(calculation_time, 3),
-                "data": indicator_data
-            })
+            logger.info(f"Indicator calculation completed in {calculation_time:.3f}s")
             
+        except ValueError as ve:
+            raise HTTPException(status_code=400, detail=str(ve))
+        
+        return JSONResponse(content={
+            "symbol": request.symbol,
+            "indicator_type": request.indicator_type,
+            "parameters": calc_params,
+            "total_points": len(indicator_data),
+            "price_data_points": len(price_records),
+            "calculation_time_seconds": round(calculation_time, 3),
+            "data": indicator_data
+        })
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -1432,8 +1500,6 @@ async def get_supported_indicators():
 async def download_symbol_data_task(symbol: str, start_date: datetime, end_date: datetime, force_refresh: bool):
     """Background task to download data for a single symbol"""
     try:
-        from stock_data_manager import StockDataManager
-        
         async with StockDataManager() as manager:
             result = await manager.download_historical_data_for_symbol(
                 symbol=symbol,
@@ -1449,8 +1515,6 @@ async def download_symbol_data_task(symbol: str, start_date: datetime, end_date:
 async def download_symbols_data_task(symbols: List[str], start_date: datetime, end_date: datetime, force_refresh: bool):
     """Background task to download data for multiple symbols"""
     try:
-        from stock_data_manager import StockDataManager
-        
         async with StockDataManager() as manager:
             for symbol in symbols:
                 try:
@@ -1471,8 +1535,6 @@ async def download_symbols_data_task(symbols: List[str], start_date: datetime, e
 async def download_index_data_task(index_name: str, start_date: datetime, end_date: datetime, force_refresh: bool):
     """Background task to download data for an index"""
     try:
-        from stock_data_manager import StockDataManager
-        
         async with StockDataManager() as manager:
             result = await manager.download_historical_data_for_index(
                 index_name=index_name,
@@ -1488,8 +1550,6 @@ async def download_index_data_task(index_name: str, start_date: datetime, end_da
 async def download_industry_data_task(industry_name: str, start_date: datetime, end_date: datetime, force_refresh: bool):
     """Background task to download data for an industry"""
     try:
-        from stock_data_manager import StockDataManager
-        
         async with StockDataManager() as manager:
             result = await manager.download_historical_data_for_industry(
                 industry_name=industry_name,
@@ -1515,7 +1575,7 @@ class BatchIndicatorRequest(BaseModel):
     parameters: Dict[str, Any] = {"s1": 22, "m2": 66, "l3": 222}
 
 @app.post("/api/indicators/batch")
-async def submit_batch_indicator_job(request: BatchIndicatorRequest):
+async def submit_batch_indicator_job(request: BatchIndicatorRequest, stock_manager: StockDataManager = Depends(get_stock_mgr)):
     """
     Submit a batch indicator calculation job
     """
@@ -1538,24 +1598,19 @@ async def submit_batch_indicator_job(request: BatchIndicatorRequest):
             logger.info(f"📅 Empty dates received, determining full range for {request.base_symbol}")
             # Get full data range for base symbol
             try:
-                from stock_data_manager import StockDataManager
-                from datetime import datetime
-                
-                async with StockDataManager() as data_manager:
-                    base_symbol_range = await data_manager.get_symbol_date_range(request.base_symbol)
-                    if base_symbol_range:
-                        if not start_date:
-                            start_date = base_symbol_range['earliest'].strftime('%Y-%m-%d')
-                        if not end_date:
-                            end_date = base_symbol_range['latest'].strftime('%Y-%m-%d')
-                        logger.info(f"📅 Using full data range for {request.base_symbol}: {start_date} to {end_date}")
-                    else:
-                        # Fallback to default range if no data found
-                        start_date = start_date or "2020-01-01"
-                        end_date = end_date or datetime.now().strftime('%Y-%m-%d')
-                        logger.warning(f"⚠️ No data range found for {request.base_symbol}, using fallback: {start_date} to {end_date}")
+                base_symbol_range = await stock_manager.get_symbol_date_range(request.base_symbol)
+                if base_symbol_range:
+                    if not start_date:
+                        start_date = base_symbol_range['earliest'].strftime('%Y-%m-%d')
+                    if not end_date:
+                        end_date = base_symbol_range['latest'].strftime('%Y-%m-%d')
+                    logger.info(f"📅 Using full data range for {request.base_symbol}: {start_date} to {end_date}")
+                else:
+                    # Fallback to default range if no data found
+                    start_date = start_date or "2020-01-01"
+                    end_date = end_date or datetime.now().strftime('%Y-%m-%d')
+                    logger.warning(f"⚠️ No data range found for {request.base_symbol}, using fallback: {start_date} to {end_date}")
             except Exception as e:
-                from datetime import datetime
                 logger.error(f"❌ Failed to get data range for {request.base_symbol}: {e}")
                 # Fallback to default range
                 start_date = start_date or "2020-01-01"
@@ -1657,61 +1712,64 @@ async def list_batch_jobs():
         raise HTTPException(status_code=500, detail=f"Failed to list batch jobs: {str(e)}")
 
 @app.get("/api/indicators/stored")
-async def get_stored_indicators():
+async def get_stored_indicators(data_manager: IndicatorDataManager = Depends(get_indicator_mgr)):
     """
     Get list of all stored pre-calculated indicators
     """
     try:
-        from indicator_data_manager import IndicatorDataManager
-        
-        async with IndicatorDataManager() as data_manager:
-            indicators = await data_manager.get_available_indicators()
-            
-            return JSONResponse(content={
-                "total_indicators": len(indicators),
-                "indicators": indicators
-            })
+        indicators = await data_manager.get_available_indicators()
         
+        return JSONResponse(content={
+            "total_indicators": len(indicators),
+            "indicators": indicators
+        })
+
     except Exception as e:
         logger.error(f"❌ Failed to get stored indicators: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get stored indicators: {str(e)}")
 
 @app.get("/api/indicators/stored/{symbol}/{indicator_type}/{base_symbol}")
 async def get_stored_indicator_data(symbol: str, indicator_type: str, base_symbol: str, 
-                                   start_date: Optional[str] = None, end_date: Optional[str] = None):
+                                   start_date: Optional[str] = None, end_date: Optional[str] = None,
+                                   data_manager: IndicatorDataManager = Depends(get_indicator_mgr)):
     """
     Get stored indicator data for a specific symbol
     """
     try:
-        from indicator_data_manager import IndicatorDataManager
-        
-        async with IndicatorDataManager() as data_manager:
-            data = await data_manager.get_indicator_data(
-                symbol=symbol,
-                indicator_type=indicator_type,
-                base_symbol=base_symbol,
-                start_date=start_date,
-                end_date=end_date
-            )
-            
-            return JSONResponse(content={
-                "symbol": symbol,
-                "indicator_type": indicator_type,
-                "base_symbol": base_symbol,
-                "total_points": len(data),
-                "date_range": {
-                    "start": start_date,
-                    "end": end_date
-                },
-                "data": data
-            })
+        data = await data_manager.get_indicator_data(
+            symbol=symbol,
+            indicator_type=indicator_type,
+            base_symbol=base_symbol,
+            start_date=start_date,
+            end_date=end_date
+        )
         
+        return JSONResponse(content={
+            "symbol": symbol,
+            "indicator_type": indicator_type,
+            "base_symbol": base_symbol,
+            "total_points": len(data),
+            "date_range": {
+                "start": start_date,
+                "end": end_date
+            },
+            "data": data
+        })
+
     except Exception as e:
         logger.error(f"❌ Failed to get stored indicator data: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get stored indicator data: {str(e)}")
 
+# Cache for available indices (index_meta changes only on URL processing)
+AVAILABLE_INDICES_TTL_SECONDS = 300
+_available_indices_cache = {"value": None, "expires_at": 0.0}
+
 async def get_available_indices():
-    """Helper function to get available indices"""
+    """Helper function to get available indices (cached for AVAILABLE_INDICES_TTL_SECONDS)"""
+    now = time.monotonic()
+    if _available_indices_cache["value"] is not None and now < _available_indices_cache["expires_at"]:
+        return _available_indices_cache["value"]
+    
     try:
         if mongo_conn.db is None:
             return []
@@ -1726,10 +1784,75 @@ async def get_available_indices():
             }
         ]
         index_stats = list(collection.aggregate(pipeline))
-        return [stat["_id"] for stat in index_stats if stat["count"] > 10]
+        indices = [stat["_id"] for stat in index_stats if stat["count"] > 10]
+        _available_indices_cache["value"] = indices
+        _available_indices_cache["expires_at"] = now + AVAILABLE_INDICES_TTL_SECONDS
+        return indices
     except Exception:
         return ["NIFTY50", "NIFTY100", "NIFTY 500"]
 
+def get_index_constituents(index_symbol: str, with_metadata: bool = False):
+    """
+    Get the constituent symbols of an index, optionally joined with their
+    symbol_mappings metadata in the same aggregation (single round trip).
+    
+    If the metadata join fails, the symbols are still returned with default
+    metadata (symbol as company name, "Unknown" industry/sector).
+    
+    Returns:
+        Tuple of (symbols list, {symbol: {company_name, name, industry, sector}})
+    """
+    index_meta_coll = mongo_conn.db.index_meta
+    match_stage = {"$match": {"index_name": index_symbol}}
+    
+    if with_metadata:
+        pipeline = [
+            match_stage,
+            {
+                "$lookup": {
+                    "from": "symbol_mappings",
+                    "localField": "Symbol",
+                    "foreignField": "symbol",
+                    "as": "m"
+                }
+            },
+            {
+                "$project": {
+                    "_id": 0,
+                    "Symbol": 1,
+                    "company_name": {"$arrayElemAt": ["$m.company_name", 0]},
+                    "name": {"$arrayElemAt": ["$m.name", 0]},
+                    "industry": {"$arrayElemAt": ["$m.industry", 0]},
+                    "sector": {"$arrayElemAt": ["$m.sector", 0]}
+                }
+            }
+        ]
+        try:
+            symbols = []
+            metadata = {}
+            for doc in index_meta_coll.aggregate(pipeline):
+                symbol = doc["Symbol"]
+                symbols.append(symbol)
+                metadata[symbol] = {
+                    "company_name": doc.get("company_name", symbol),
+                    "name": doc.get("name", symbol),
+                    "industry": doc.get("industry", "Unknown"),
+                    "sector": doc.get("sector", "Unknown")
+                }
+            return symbols, metadata
+        except Exception as e:
+            logger.warning(f"⚠️ Could not retrieve stock metadata for {index_symbol}: {e}")
+    
+    symbols = [doc["Symbol"] for doc in index_meta_coll.aggregate([match_stage, {"$project": {"_id": 0, "Symbol": 1}}])]
+    metadata = {}
+    if with_metadata:
+        # Fallback: use symbol as company name
+        metadata = {
+            symbol: {"company_name": symbol, "name": symbol, "industry": "Unknown", "sector": "Unknown"}
+            for symbol in symbols
+        }
+    return symbols, metadata
+
 @app.get("/api/analytics/index-distribution")
 async def get_index_distribution(
     index_symbol: str = "NIFTY50", 
@@ -1738,7 +1861,9 @@ async def get_index_distribution(
     score_ranges: Optional[str] = None,
     metric: Optional[str] = "truevx_score",  # New parameter for metric selection
     include_price: Optional[bool] = True,  # New parameter to include price data
-    include_symbols: Optional[bool] = False  # New parameter to include symbol breakdown
+    include_symbols: Optional[bool] = False,  # New parameter to include symbol breakdown
+    data_manager: IndicatorDataManager = Depends(get_indicator_mgr),
+    price_manager: StockDataManager = Depends(get_stock_mgr)
 ):
     """
     Get TrueValueX score distribution for an index over time
@@ -1756,11 +1881,6 @@ async def get_index_distribution(
         Historical score distribution data with optional price data and symbol breakdown for visualization
     """
     try:
-        from indicator_data_manager import IndicatorDataManager
-        from datetime import datetime, timedelta
-        import pandas as pd
-        from collections import defaultdict
-        
         logger.info(f"🔍 Getting index distribution for: {index_symbol}, metric: {metric}, include_price: {include_price}, include_symbols: {include_symbols}")
         
         # Validate metric parameter
@@ -1772,8 +1892,11 @@ async def get_index_distribution(
         if not end_date:
             end_date = datetime.now().strftime('%Y-%m-%d')
         if not start_date:
-            start_dt = datetime.now() - timedelta(days=5*365)
-            start_date = start_dt.strftime('%Y-%m-%d')
+            start_date = (datetime.now() - timedelta(days=5*365)).strftime('%Y-%m-%d')
+        
+        # Parse the boundaries once; reused by the indicator query and the price lookup
+        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
         
         logger.info(f"📅 Date range: {start_date} to {end_date}")
         
@@ -1786,13 +1909,30 @@ async def get_index_distribution(
             start_score, end_score = map(int, range_str.split('-'))
             ranges.append((start_score, end_score))
         
+        # Labels (and bucket indices) follow the order of the requested ranges
+        range_labels = [f"{start}-{end}" for start, end in ranges]
+        min_range_start = min(start for start, _ in ranges)
+        last_bucket = len(ranges) - 1
+        
+        # Bisect lookup table: between two consecutive range boundaries every value
+        # lands in the same bucket, the first requested range containing it (the last
+        # range is open-ended above); -1 where no range matches
+        range_bounds = sorted({bound for range_pair in ranges for bound in range_pair})
+        bound_buckets = []
+        for k, lower in enumerate(range_bounds):
+            upper = range_bounds[k + 1] if k + 1 < len(range_bounds) else None
+            bound_buckets.append(next(
+                (i for i, (start, end) in enumerate(ranges)
+                 if start <= lower and ((upper is not None and upper <= end) or i == last_bucket)),
+                -1
+            ))
+        
         if mongo_conn.db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
-        # First, get all stock symbols that belong to this index
-        index_meta_coll = mongo_conn.db.index_meta
-        index_stocks_cursor = index_meta_coll.find({"index_name": index_symbol}, {"Symbol": 1})
-        index_stock_symbols = [doc["Symbol"] for doc in index_stocks_cursor]
+        # Get all stock symbols that belong to this index, joined with their
+        # metadata (company names) when the symbol breakdown is requested
+        index_stock_symbols, stock_metadata = get_index_constituents(index_symbol, with_metadata=include_symbols)
         
         logger.info(f"📊 Found {len(index_stock_symbols)} stocks in {index_symbol} index")
         
@@ -1803,226 +1943,229 @@ async def get_index_distribution(
                 "available_indices": await get_available_indices()
             })
         
-        # Get stock metadata for company names if symbols are requested
-        stock_metadata = {}
         if include_symbols:
-            try:
-                stock_meta_coll = mongo_conn.db.symbol_mappings
-                for stock_doc in stock_meta_coll.find({"symbol": {"$in": index_stock_symbols}}):
-                    stock_metadata[stock_doc["symbol"]] = {
-                        "company_name": stock_doc.get("company_name", stock_doc["symbol"]),
-                        "industry": stock_doc.get("industry", "Unknown"),
-                        "sector": stock_doc.get("sector", "Unknown")
-                    }
-                logger.info(f"📋 Retrieved metadata for {len(stock_metadata)} symbols")
-            except Exception as e:
-                logger.warning(f"⚠️ Could not retrieve stock metadata: {e}")
-                # Fallback: use symbol as company name
-                for symbol in index_stock_symbols:
-                    stock_metadata[symbol] = {
-                        "company_name": symbol,
-                        "industry": "Unknown",
-                        "sector": "Unknown"
-                    }
+            logger.info(f"📋 Retrieved metadata for {len(stock_metadata)} symbols")
         
-        async with IndicatorDataManager() as data_manager:
-            # Get all available indicators for these stocks
-            indicators_coll = data_manager.db[data_manager.indicators_collection]
-            
-            # Query for TrueValueX indicators for stocks in this index
-            query = {
-                "indicator_type": "truevx",
-                "symbol": {"$in": index_stock_symbols},
-                "date": {
-                    "$gte": datetime.strptime(start_date, "%Y-%m-%d"),
-                    "$lte": datetime.strptime(end_date, "%Y-%m-%d")
-                }
+        # Get all available indicators for these stocks
+        indicators_coll = data_manager.db[data_manager.indicators_collection]
+        
+        # Query for TrueValueX indicators for stocks in this index
+        query = {
+            "indicator_type": "truevx",
+            "symbol": {"$in": index_stock_symbols},
+            "date": {
+                "$gte": start_dt,
+                "$lte": end_dt
             }
-            
-            logger.info(f"🔍 Querying indicators with: {query}")
-            
+        }
+        
+        logger.info(f"🔍 Querying indicators with: {query}")
+        
+        def scan_indicators():
+            """Blocking PyMongo scan of the indicator cursor; run in a worker thread"""
             # Get all data points
             cursor = indicators_coll.find(query).sort("date", 1)
             
             # Process data for distribution analysis
-            distribution_data = defaultdict(lambda: defaultdict(int))
-            date_symbols = defaultdict(set)
-            date_symbols_by_range = defaultdict(lambda: defaultdict(list))  # For detailed symbol breakdown
+            bucket_counts = Counter()  # (date_str, bucket_idx) -> count
+            # Per-date symbol sets kept as integer bitmasks over the index constituents
+            symbol_bits = {symbol: 1 << i for i, symbol in enumerate(index_stock_symbols)}
+            date_masks = defaultdict(int)
+            symbol_records = []  # (date_str, bucket_idx, value, symbol) for detailed symbol breakdown
+            
+            # Cursor is sorted by date, so format each distinct date only once
+            last_doc_date = None
+            date_str = None
             
             doc_count = 0
             for doc in cursor:
                 doc_count += 1
-                date_str = doc["date"].strftime('%Y-%m-%d')
+                doc_date = doc["date"]
+                if doc_date != last_doc_date:
+                    last_doc_date = doc_date
+                    date_str = doc_date.date().isoformat()
                 symbol = doc["symbol"]
                 
                 # Get the specified metric value, defaulting to 0 if not found
                 metric_value = doc["data"].get(metric, 0)
                 
-                # Skip if metric value is None or invalid
-                if metric_value is None:
+                # Skip if metric value is None or invalid, or below the lowest range
+                if metric_value is None or metric_value < min_range_start:
                     continue
                 
                 # Add symbol to date tracking
-                date_symbols[date_str].add(symbol)
+                date_masks[date_str] |= symbol_bits[symbol]
                 
-                # Categorize score into ranges
-                for i, (range_start, range_end) in enumerate(ranges):
-                    if range_start <= metric_value < range_end or (i == len(ranges)-1 and metric_value >= range_start):
-                        range_label = f"{range_start}-{range_end}"
-                        distribution_data[date_str][range_label] += 1
-                        
-                        # Store symbol details if requested
-                        if include_symbols:
-                            symbol_info = {
-                                "symbol": symbol,
-                                "value": round(metric_value, 2),
-                                "company_name": stock_metadata.get(symbol, {}).get("company_name", symbol),
-                                "industry": stock_metadata.get(symbol, {}).get("industry", "Unknown"),
-                                "sector": stock_metadata.get(symbol, {}).get("sector", "Unknown")
-                            }
-                            date_symbols_by_range[date_str][range_label].append(symbol_info)
-                        break
-            
-            logger.info(f"📈 Processed {doc_count} indicator data points")
+                # Categorize score into ranges (last range is open-ended above)
+                bucket = bound_buckets[bisect.bisect_right(range_bounds, metric_value) - 1]
+                if bucket < 0:
+                    continue
+                bucket_counts[(date_str, bucket)] += 1
+                
+                # Store a lightweight record if symbol details are requested
+                if include_symbols:
+                    symbol_records.append((date_str, bucket, metric_value, symbol))
             
-            # Fetch base symbol price data if requested
+            return bucket_counts, date_masks, symbol_records, doc_count
+        
+        async def fetch_base_price_data():
+            """Resolve the base symbol and load its price history (Motor-backed, non-blocking)"""
             price_data = {}
             actual_base_symbol = None
             
-            if include_price:
-                try:
-                    # First, get the base_symbol from one of the TrueValueX records for this index
-                    sample_record = indicators_coll.find_one(
-                        {"indicator_type": "truevx", "symbol": {"$in": index_stock_symbols}},
-                        {"base_symbol": 1}
+            try:
+                # First, get the base_symbol from one of the TrueValueX records for this index
+                sample_record = await asyncio.to_thread(
+                    indicators_coll.find_one,
+                    {"indicator_type": "truevx", "symbol": {"$in": index_stock_symbols}},
+                    {"base_symbol": 1}
+                )
+                
+                if sample_record and "base_symbol" in sample_record:
+                    actual_base_symbol = sample_record["base_symbol"]
+                    logger.info(f"💰 Detected base symbol: {actual_base_symbol}")
+                    
+                    # Fetch price data for the actual base symbol used in calculations
+                    logger.info(f"💰 Fetching {actual_base_symbol} price data for date range: {start_date} to {end_date}")
+                    
+                    # Query price data directly from database to avoid API sorting limitations
+                    # The stock data API sorts newest first, but we need full historical range
+                    days_diff = (end_dt - start_dt).days
+                    
+                    logger.info(f"💰 Querying {actual_base_symbol} price data directly from database for {days_diff} days ({days_diff/365:.1f} years)")
+                    
+                    # Get all price data for the date range, sorted oldest first
+                    price_records = await price_manager.get_price_data(
+                        symbol=actual_base_symbol,
+                        start_date=start_dt,
+                        end_date=end_dt,
+                        limit=None,  # No limit - get all available data
+                        sort_order=1  # 1 for ascending (oldest first)
                     )
                     
-                    if sample_record and "base_symbol" in sample_record:
-                        actual_base_symbol = sample_record["base_symbol"]
-                        logger.info(f"💰 Detected base symbol: {actual_base_symbol}")
-                        
-                        # Fetch price data for the actual base symbol used in calculations
-                        logger.info(f"💰 Fetching {actual_base_symbol} price data for date range: {start_date} to {end_date}")
-                        
-                        # Query price data directly from database to avoid API sorting limitations
-                        # The stock data API sorts newest first, but we need full historical range
-                        from stock_data_manager import StockDataManager
-                        
-                        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-                        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-                        days_diff = (end_dt - start_dt).days
-                        
-                        logger.info(f"💰 Querying {actual_base_symbol} price data directly from database for {days_diff} days ({days_diff/365:.1f} years)")
-                        
-                        async with StockDataManager() as price_manager:
-                            # Get all price data for the date range, sorted oldest first
-                            price_records = await price_manager.get_price_data(
-                                symbol=actual_base_symbol,
-                                start_date=start_dt,
-                                end_date=end_dt,
-                                limit=None,  # No limit - get all available data
-                                sort_order=1  # 1 for ascending (oldest first)
-                            )
-                            
-                            logger.info(f"💰 Retrieved {len(price_records)} price records from database")
-                            
-                            # Convert to date-indexed dictionary
-                            for price_record in price_records:
-                                date_str = price_record.date.strftime('%Y-%m-%d')
-                                price_data[date_str] = {
-                                    "open": price_record.open_price,
-                                    "high": price_record.high_price,
-                                    "low": price_record.low_price,
-                                    "close": price_record.close_price,
-                                    "volume": price_record.volume
-                                }
-                            
-                            logger.info(f"💰 Fetched {len(price_data)} {actual_base_symbol} price records from database")
-                            
-                    else:
-                        logger.warning("💰 No base_symbol found in TrueValueX records, skipping price data")
-                        
-                except Exception as price_error:
-                    logger.error(f"💰 Error fetching base symbol price data via API: {price_error}")
-                    price_data = {}
-            
-            # Format data for frontend
-            result_data = []
-            all_dates = sorted(distribution_data.keys())
-            
-            for date_str in all_dates:
-                date_data = {
-                    "date": date_str,
-                    "total_symbols": len(date_symbols[date_str]),
-                    "distribution": {}
-                }
-                
-                # Add price data if available
-                if include_price and date_str in price_data:
-                    date_data["price"] = price_data[date_str]
-                
-                # Add all score ranges with counts
-                for range_start, range_end in ranges:
-                    range_label = f"{range_start}-{range_end}"
-                    count = distribution_data[date_str].get(range_label, 0)
-                    total = len(date_symbols[date_str])
-                    percentage = (count / total * 100) if total > 0 else 0
+                    logger.info(f"💰 Retrieved {len(price_records)} price records from database")
                     
-                    range_data = {
-                        "count": count,
-                        "percentage": round(percentage, 2)
-                    }
+                    # Convert to date-indexed dictionary
+                    for price_record in price_records:
+                        price_data[price_record.date.date().isoformat()] = {
+                            "open": price_record.open_price,
+                            "high": price_record.high_price,
+                            "low": price_record.low_price,
+                            "close": price_record.close_price,
+                            "volume": price_record.volume
+                        }
                     
-                    # Add symbol details if requested
-                    if include_symbols:
-                        symbols_in_range = date_symbols_by_range[date_str].get(range_label, [])
-                        # Sort symbols by value (highest first within each range)
-                        symbols_in_range.sort(key=lambda x: x["value"], reverse=True)
-                        range_data["symbols"] = symbols_in_range
+                    logger.info(f"💰 Fetched {len(price_data)} {actual_base_symbol} price records from database")
                     
-                    date_data["distribution"][range_label] = range_data
-                
-                result_data.append(date_data)
-            
-            # Summary statistics
-            total_data_points = sum(len(date_symbols[date]) for date in date_symbols)
-            unique_symbols = set()
-            for symbols in date_symbols.values():
-                unique_symbols.update(symbols)
+                else:
+                    logger.warning("💰 No base_symbol found in TrueValueX records, skipping price data")
+                    
+            except Exception as price_error:
+                logger.error(f"💰 Error fetching base symbol price data via API: {price_error}")
+                price_data = {}
+            
+            return actual_base_symbol, price_data
+        
+        # The indicator scan uses the synchronous PyMongo client, so run it in a worker
+        # thread and overlap it with the (async) base symbol price fetch
+        if include_price:
+            scan_result, (actual_base_symbol, price_data) = await asyncio.gather(
+                asyncio.to_thread(scan_indicators),
+                fetch_base_price_data()
+            )
+        else:
+            scan_result = await asyncio.to_thread(scan_indicators)
+            actual_base_symbol, price_data = None, {}
+        bucket_counts, date_masks, symbol_records, doc_count = scan_result
+        
+        logger.info(f"📈 Processed {doc_count} indicator data points")
+        
+        # Build symbol detail dicts once, after the scan (metadata resolved per unique symbol)
+        date_symbols_by_range = defaultdict(list)  # (date_str, bucket_idx) -> [symbol_info]
+        if include_symbols:
+            symbol_details = {}
+            for symbol in {record[3] for record in symbol_records}:
+                meta = stock_metadata.get(symbol, {})
+                symbol_details[symbol] = (
+                    meta.get("company_name", symbol),
+                    meta.get("industry", "Unknown"),
+                    meta.get("sector", "Unknown")
+                )
+            # One global sort (date, range, highest value first) yields every group pre-ordered
+            symbol_records.sort(key=lambda record: (record[0], record[1], -record[2]))
+            for group_key, group in groupby(symbol_records, key=operator.itemgetter(0, 1)):
+                symbols_in_range = date_symbols_by_range[group_key]
+                for _, _, metric_value, symbol in group:
+                    company_name, industry, sector = symbol_details[symbol]
+                    symbols_in_range.append({
+                        "symbol": symbol,
+                        "value": round(metric_value, 2),
+                        "company_name": company_name,
+                        "industry": industry,
+                        "sector": sector
+                    })
+        
+        # Format data for frontend
+        result_data = []
+        all_dates = sorted(date_masks.keys())
+        
+        for date_str in all_dates:
+            total = date_masks[date_str].bit_count()
+            date_data = {
+                "date": date_str,
+                "total_symbols": total,
+                "distribution": {}
+            }
             
-            return JSONResponse(content={
-                "success": True,
-                "index_symbol": index_symbol,
-                "metric": metric,
-                "include_price": include_price,
-                "include_symbols": include_symbols,
-                "base_symbol": actual_base_symbol,  # Include the actual base symbol used
-                "date_range": {
-                    "start": start_date,
-                    "end": end_date
-                },
-                "score_ranges": [f"{start}-{end}" for start, end in ranges],
-                "summary": {
-                    "total_data_points": total_data_points,
-                    "unique_symbols": len(unique_symbols),
-                    "date_count": len(all_dates),
-                    "symbols_per_date_avg": round(total_data_points / len(all_dates), 2) if all_dates else 0,
-                    "price_data_points": len(price_data) if include_price else 0
-                },
-                "data": result_data
-            })
+            # Add price data if available
+            if include_price and date_str in price_data:
+                date_data["price"] = price_data[date_str]
             
-    except Exception as e:
-        logger.error(f"❌ Error in get_index_distribution: {e}")
-        return JSONResponse(
-            status_code=500,
-            content={
-                "success": False,
-                "error": str(e),
-                "available_indices": await get_available_indices()
-            }
-        )
+            # Add all score ranges with counts
+            for bucket, range_label in enumerate(range_labels):
+                count = bucket_counts.get((date_str, bucket), 0)
+                percentage = (count / total * 100) if total > 0 else 0
+                
+                range_data = {
+                    "count": count,
+                    "percentage": round(percentage, 2)
+                }
+                
+                # Add symbol details if requested
+                if include_symbols:
+                    # Already sorted by value (highest first within each range)
+                    range_data["symbols"] = date_symbols_by_range.get((date_str, bucket), [])
+                
+                date_data["distribution"][range_label] = range_data
             
+            result_data.append(date_data)
+        
+        # Summary statistics
+        total_data_points = sum(mask.bit_count() for mask in date_masks.values())
+        unique_symbols_mask = reduce(operator.or_, date_masks.values(), 0)
+        
+        return ORJSONResponse(content={
+            "success": True,
+            "index_symbol": index_symbol,
+            "metric": metric,
+            "include_price": include_price,
+            "include_symbols": include_symbols,
+            "base_symbol": actual_base_symbol,  # Include the actual base symbol used
+            "date_range": {
+                "start": start_date,
+                "end": end_date
+            },
+            "score_ranges": range_labels,
+            "summary": {
+                "total_data_points": total_data_points,
+                "unique_symbols": unique_symbols_mask.bit_count(),
+                "date_count": len(all_dates),
+                "symbols_per_date_avg": round(total_data_points / len(all_dates), 2) if all_dates else 0,
+                "price_data_points": len(price_data) if include_price else 0
+            },
+            "data": result_data
+        })
+        
     except Exception as e:
         logger.error(f"❌ Error in get_index_distribution: {e}")
         return JSONResponse(
@@ -2038,7 +2181,8 @@ async def get_index_distribution(
 async def get_index_distribution_symbols(
     index_symbol: str = "NIFTY50",
     date: str = None,  # Specific date to get symbol breakdown
-    metric: str = "truevx_score"
+    metric: str = "truevx_score",
+    data_manager: IndicatorDataManager = Depends(get_indicator_mgr)
 ):
     """
     Get detailed symbol breakdown by score ranges for a specific date
@@ -2052,10 +2196,6 @@ async def get_index_distribution_symbols(
         Detailed breakdown of symbols in each score range for the specified date
     """
     try:
-        from indicator_data_manager import IndicatorDataManager
-        from datetime import datetime
-        from collections import defaultdict
-        
         logger.info(f"🔍 Getting symbol breakdown for: {index_symbol}, date: {date}, metric: {metric}")
         
         # Validate inputs
@@ -2077,10 +2217,8 @@ async def get_index_distribution_symbols(
         if mongo_conn.db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
-        # Get stock symbols for this index
-        index_meta_coll = mongo_conn.db.index_meta
-        index_stocks_cursor = index_meta_coll.find({"index_name": index_symbol}, {"Symbol": 1})
-        index_stock_symbols = [doc["Symbol"] for doc in index_stocks_cursor]
+        # Get stock symbols for this index together with their metadata (single $lookup pipeline)
+        index_stock_symbols, stock_metadata = get_index_constituents(index_symbol, with_metadata=True)
         
         if not index_stock_symbols:
             return JSONResponse(content={
@@ -2088,97 +2226,86 @@ async def get_index_distribution_symbols(
                 "error": f"No stocks found for index: {index_symbol}"
             })
         
-        # Get stock metadata for company names
-        stock_meta_coll = mongo_conn.db.symbol_mappings
-        stock_metadata = {}
-        for stock_doc in stock_meta_coll.find({"symbol": {"$in": index_stock_symbols}}):
-            stock_metadata[stock_doc["symbol"]] = {
-                "name": stock_doc.get("name", stock_doc["symbol"]),
-                "industry": stock_doc.get("industry", "Unknown"),
-                "sector": stock_doc.get("sector", "Unknown")
-            }
+        indicators_coll = data_manager.db[data_manager.indicators_collection]
         
-        async with IndicatorDataManager() as data_manager:
-            indicators_coll = data_manager.db[data_manager.indicators_collection]
-            
-            # Query for TrueValueX indicators for this specific date
-            query = {
-                "indicator_type": "truevx",
-                "symbol": {"$in": index_stock_symbols},
-                "date": target_date
-            }
-            
-            # Get indicator data for the specific date
-            cursor = indicators_coll.find(query)
-            
-            # Define score ranges
-            score_ranges = [
-                (0, 20, "Weak (0-20)", "#ef4444"),
-                (20, 40, "Below Average (20-40)", "#f97316"),
-                (40, 60, "Average (40-60)", "#eab308"),
-                (60, 80, "Above Average (60-80)", "#3b82f6"),
-                (80, 100, "Strong (80-100)", "#22c55e")
-            ]
-            
-            # Organize symbols by score ranges
-            range_symbols = defaultdict(list)
-            total_symbols = 0
-            
-            for doc in cursor:
-                symbol = doc["symbol"]
-                metric_value = doc["data"].get(metric, 0)
-                
-                if metric_value is None:
-                    continue
-                
-                total_symbols += 1
-                
-                # Find appropriate range
-                for range_start, range_end, range_label, color in score_ranges:
-                    if range_start <= metric_value < range_end or (range_start == 80 and metric_value >= range_start):
-                        range_key = f"{range_start}-{range_end}"
-                        
-                        symbol_info = {
-                            "symbol": symbol,
-                            "name": stock_metadata.get(symbol, {}).get("name", symbol),
-                            "industry": stock_metadata.get(symbol, {}).get("industry", "Unknown"),
-                            "sector": stock_metadata.get(symbol, {}).get("sector", "Unknown"),
-                            "score": round(metric_value, 2),
-                            "range_label": range_label,
-                            "color": color
-                        }
-                        range_symbols[range_key].append(symbol_info)
-                        break
+        # Query for TrueValueX indicators for this specific date
+        query = {
+            "indicator_type": "truevx",
+            "symbol": {"$in": index_stock_symbols},
+            "date": target_date
+        }
+        
+        # Get indicator data for the specific date
+        cursor = indicators_coll.find(query)
+        
+        # Define score ranges
+        score_ranges = [
+            (0, 20, "Weak (0-20)", "#ef4444"),
+            (20, 40, "Below Average (20-40)", "#f97316"),
+            (40, 60, "Average (40-60)", "#eab308"),
+            (60, 80, "Above Average (60-80)", "#3b82f6"),
+            (80, 100, "Strong (80-100)", "#22c55e")
+        ]
+        
+        # Organize symbols by score ranges
+        range_symbols = defaultdict(list)
+        total_symbols = 0
+        
+        for doc in cursor:
+            symbol = doc["symbol"]
+            metric_value = doc["data"].get(metric, 0)
             
-            # Sort symbols within each range by score (descending)
-            for range_key in range_symbols:
-                range_symbols[range_key].sort(key=lambda x: x["score"], reverse=True)
+            if metric_value is None:
+                continue
             
-            # Format response
-            result = {
-                "success": True,
-                "index_symbol": index_symbol,
-                "date": date,
-                "metric": metric,
-                "total_symbols": total_symbols,
-                "ranges": {}
-            }
+            total_symbols += 1
             
-            # Add range data
+            # Find appropriate range
             for range_start, range_end, range_label, color in score_ranges:
-                range_key = f"{range_start}-{range_end}"
-                symbols_in_range = range_symbols.get(range_key, [])
-                
-                result["ranges"][range_key] = {
-                    "label": range_label,
-                    "color": color,
-                    "count": len(symbols_in_range),
-                    "percentage": round((len(symbols_in_range) / total_symbols * 100), 2) if total_symbols > 0 else 0,
-                    "symbols": symbols_in_range
-                }
-            
-            return JSONResponse(content=result)
-            
+                if range_start <= metric_value < range_end or (range_start == 80 and metric_value >= range_start):
+                    range_key = f"{range_start}-{range_end}"
+                    
+                    symbol_info = {
+                        "symbol": symbol,
+                        "name": stock_metadata.get(symbol, {}).get("name", symbol),
+                        "industry": stock_metadata.get(symbol, {}).get("industry", "Unknown"),
+                        "sector": stock_metadata.get(symbol, {}).get("sector", "Unknown"),
+                        "score": round(metric_value, 2),
+                        "range_label": range_label,
+                        "color": color
+                    }
+                    range_symbols[range_key].append(symbol_info)
+                    break
+        
+        # Sort symbols within each range by score (descending)
+        for range_key in range_symbols:
+            range_symbols[range_key].sort(key=lambda x: x["score"], reverse=True)
+        
+        # Format response
+        result = {
+            "success": True,
+            "index_symbol": index_symbol,
+            "date": date,
+            "metric": metric,
+            "total_symbols": total_symbols,
+            "ranges": {}
+        }
+        
+        # Add range data
+        for range_start, range_end, range_label, color in score_ranges:
+            range_key = f"{range_start}-{range_end}"
+            symbols_in_range = range_symbols.get(range_key, [])
+            
+            result["ranges"][range_key] = {
+                "label": range_label,
+                "color": color,
+                "count": len(symbols_in_range),
+                "percentage": round((len(symbols_in_range) / total_symbols * 100), 2) if total_symbols > 0 else 0,
+                "symbols": symbols_in_range
+            }
+        
+        return JSONResponse(content=result)
+        
     except Exception as e:
         logger.error(f"❌ Error in get_index_distribution_symbols: {e}")
         return JSONResponse(
@@ -2188,10 +2315,6 @@ async def get_index_distribution_symbols(
                 "error": str(e)
             }
         )
-        
-    except Exception as e:
-        logger.error(f"❌ Failed to get index distribution: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get index distribution: {str(e)}")
 
 # =============================================================================
 # STRATEGY SIMULATION ENDPOINTS
@@ -2250,31 +2373,128 @@ class HoldingsMultiParams(BaseModel):
     exchange: str = "NSE"
     custom_brokerage_rate: float = 0.0
     portfolio_turnover_estimate: float = 0.5
-    multipliers: list[int] = [1, 2, 3, 4]  # Holding size multipliers
-    multipliers: list = [1, 2, 3, 4]  # Multipliers for base_max_holdings
+    multipliers: tuple[int, ...] = (1, 2, 3, 4)  # Multipliers for base_max_holdings
+
+# Per-run metrics aggregated by the multi-run endpoints
+RUN_METRICS_DTYPE = np.dtype([("total_return", "f8"), ("alpha", "f8"), ("sharpe_ratio", "f8")])
+
+def collect_completed_metrics(run_results: list) -> tuple:
+    """Completed runs and their RUN_METRICS_DTYPE array, in one pass over run_results"""
+    completed_results = []
+    rows = []
+    for result in run_results:
+        if result["status"] == "completed":
+            completed_results.append(result)
+            rows.append((result["total_return"], result["alpha"], result["sharpe_ratio"]))
+    return completed_results, np.array(rows, dtype=RUN_METRICS_DTYPE)
+
+# Universe names accepted by the simulation endpoints -> index_meta index_name
+UNIVERSE_MAPPING = {
+    "NIFTY50": "NIFTY50",
+    "NIFTY100": "NIFTY100",
+    "NIFTY500": "NIFTY 500",  # Map to database format with space
+    "NIFTY 500": "NIFTY 500"  # Also handle if already correct
+}
+
+# Universe names (same keys as UNIVERSE_MAPPING) -> benchmark index symbol in the price data
+UNIVERSE_BENCHMARK = {
+    "NIFTY50": "Nifty 50",
+    "NIFTY100": "Nifty 100",
+    "NIFTY500": "Nifty 500",
+    "NIFTY 500": "Nifty 500"
+}
+DEFAULT_BENCHMARK_SYMBOL = "Nifty 50"
+
+# Per-trade charge components summed into charge_analytics["component_breakdown"]
+CHARGE_COMPONENTS = ("stt", "transaction_charges", "sebi_charges", "stamp_duty", "brokerage", "gst")
+
+@lru_cache(maxsize=16384)
+def parse_simulation_date(date_str: str) -> datetime:
+    """Parse a 'YYYY-MM-DD' simulation date, once per distinct string across requests"""
+    return datetime.strptime(date_str, "%Y-%m-%d")
+
+@lru_cache(maxsize=16384)
+def simulation_date_key(date_value: datetime) -> str:
+    """'YYYY-MM-DD' key for a document date, formatted once per distinct date across loads"""
+    return date_value.strftime('%Y-%m-%d')
+
+# Indicator document fields read by the simulations
+INDICATOR_SIMULATION_PROJECTION = {
+    "_id": 0,
+    "date": 1,
+    "symbol": 1,
+    "data.truevx_score": 1,
+    "data.mean_short": 1,
+    "data.mean_mid": 1,
+    "data.mean_long": 1
+}
+
+# Strategy fields needed to run a simulation
+STRATEGY_SIMULATION_PROJECTION = {"_id": 0, "id": 1, "name": 1, "rules": 1}
+
+# Optional persistence of multi-run results (fire-and-forget batch writes)
+PERSIST_SIMULATION_RUNS = os.getenv("PERSIST_SIMULATION_RUNS", "false").lower() == "true"
+
+async def persist_multi_simulation_run(multi_simulation_result: Dict[str, Any]) -> None:
+    """Store period results plus the aggregate doc in simulation_runs with one insert_many"""
+    run_id = uuid.uuid4().hex
+    created_at = datetime.now().isoformat()
+    # Copies: insert_many adds _id to the documents it is given
+    docs = [
+        {**period, "run_id": run_id, "doc_type": "period", "created_at": created_at}
+        for period in multi_simulation_result["periods"]
+    ]
+    docs.append({
+        "run_id": run_id,
+        "doc_type": "aggregate",
+        "created_at": created_at,
+        "params": multi_simulation_result["params"],
+        "aggregate_metrics": multi_simulation_result["aggregate_metrics"]
+    })
+    runs_coll = mongo_conn.async_db.simulation_runs.with_options(write_concern=WriteConcern(w=0))
+    await runs_coll.insert_many(docs, ordered=False)
+
+# Cache for universe constituents (index_meta changes only on URL processing)
+UNIVERSE_SYMBOLS_TTL_SECONDS = 3600
+_universe_symbols_cache = {}  # normalized_universe -> (expires_at, symbols)
+
+async def load_universe_symbols(normalized_universe: str) -> List[str]:
+    """Get the constituent symbols of a universe (cached for UNIVERSE_SYMBOLS_TTL_SECONDS)"""
+    now = time.monotonic()
+    cached = _universe_symbols_cache.get(normalized_universe)
+    if cached is not None and now < cached[0]:
+        return list(cached[1])
+    
+    index_meta_coll = mongo_conn.async_db.index_meta
+    universe_symbols = await index_meta_coll.distinct("Symbol", {"index_name": normalized_universe})
+    
+    # Don't cache empty results so a freshly loaded index is picked up immediately
+    if universe_symbols:
+        _universe_symbols_cache[normalized_universe] = (now + UNIVERSE_SYMBOLS_TTL_SECONDS, tuple(universe_symbols))
+    return universe_symbols
 
 @app.post("/api/simulation/strategies")
 async def save_strategy(strategy: Strategy):
     """Save a new trading strategy"""
     try:
-        if mongo_conn.db is None:
+        if mongo_conn.async_db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
-        strategies_coll = mongo_conn.db.simulation_strategies
+        strategies_coll = mongo_conn.async_db.simulation_strategies
         
         # Generate ID and timestamps
-        strategy_data = strategy.dict()
-        strategy_data["id"] = f"strategy_{int(datetime.now().timestamp() * 1000)}"
-        strategy_data["created_at"] = datetime.now().isoformat()
-        strategy_data["last_modified"] = datetime.now().isoformat()
+        strategy_data = strategy.model_dump()
+        # Random id: millisecond timestamps collide when saves arrive together
+        strategy_data["id"] = f"strategy_{uuid.uuid4().hex}"
+        strategy_data["created_at"] = strategy_data["last_modified"] = datetime.now().isoformat()
         
         # Insert into database
-        result = strategies_coll.insert_one(strategy_data)
+        result = await strategies_coll.insert_one(strategy_data)
         strategy_data["_id"] = str(result.inserted_id)
         
         logger.info(f"💾 Saved strategy: {strategy.name} with {len(strategy.rules)} rules")
         
-        return JSONResponse(content={
+        return NumpyORJSONResponse(content={
             "success": True,
             "strategy_id": strategy_data["id"],
             "message": "Strategy saved successfully"
@@ -2288,23 +2508,39 @@ async def save_strategy(strategy: Strategy):
 async def get_strategies():
     """Get all saved trading strategies"""
     try:
-        if mongo_conn.db is None:
+        if mongo_conn.async_db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
-        strategies_coll = mongo_conn.db.simulation_strategies
+        strategies_coll = mongo_conn.async_db.simulation_strategies
+        
+        # Stream strategies straight from the cursor instead of building the full list.
+        # The cursor is lazy, so the first batch is fetched here: query and connection
+        # errors still surface as a 500 before any response bytes are sent
+        cursor = strategies_coll.find().sort("last_modified", -1).batch_size(100)
+        first_batch = await cursor.to_list(100)
         
-        # Get all strategies
-        strategies = []
-        for strategy_doc in strategies_coll.find().sort("last_modified", -1):
+        def encode_strategy(strategy_doc):
             strategy_doc["_id"] = str(strategy_doc["_id"])
-            strategies.append(strategy_doc)
+            return orjson.dumps(strategy_doc, option=orjson.OPT_SERIALIZE_NUMPY)
         
-        logger.info(f"📋 Retrieved {len(strategies)} strategies")
+        async def stream_strategies():
+            count = 0
+            try:
+                yield b'{"success":true,"strategies":['
+                for strategy_doc in first_batch:
+                    yield (b"," if count else b"") + encode_strategy(strategy_doc)
+                    count += 1
+                async for strategy_doc in cursor:
+                    yield (b"," if count else b"") + encode_strategy(strategy_doc)
+                    count += 1
+                yield b"]}"
+                logger.info(f"📋 Retrieved {count} strategies")
+            except Exception as e:
+                # Headers are already sent; the body ends here as truncated JSON
+                logger.error(f"❌ Error streaming strategies after {count} documents: {e}")
+                raise
         
-        return JSONResponse(content={
-            "success": True,
-            "strategies": strategies
-        })
+        return StreamingResponse(stream_strategies(), media_type="application/json")
         
     except Exception as e:
         logger.error(f"❌ Error getting strategies: {e}")
@@ -2314,18 +2550,13 @@ async def get_strategies():
 async def update_strategy(strategy_id: str, strategy: Strategy):
     """Update an existing trading strategy"""
     try:
-        if mongo_conn.db is None:
+        if mongo_conn.async_db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
-        strategies_coll = mongo_conn.db.simulation_strategies
-        
-        # Check if strategy exists
-        existing_strategy = strategies_coll.find_one({"id": strategy_id})
-        if not existing_strategy:
-            raise HTTPException(status_code=404, detail="Strategy not found")
+        strategies_coll = mongo_conn.async_db.simulation_strategies
         
         # Update strategy data (preserve the ID)
-        strategy_data = strategy.dict()
+        strategy_data = strategy.model_dump()
         strategy_data["last_modified"] = datetime.now().isoformat()
         
         # Remove id from update data to prevent overwriting
@@ -2333,17 +2564,20 @@ async def update_strategy(strategy_id: str, strategy: Strategy):
             del strategy_data["id"]
         
         # Update in database
-        result = strategies_coll.update_one(
+        result = await strategies_coll.update_one(
             {"id": strategy_id}, 
             {"$set": strategy_data}
         )
         
+        if result.matched_count == 0:
+            raise HTTPException(status_code=404, detail="Strategy not found")
+        
         if result.modified_count == 0:
             raise HTTPException(status_code=400, detail="No changes made to strategy")
         
         logger.info(f"✏️ Updated strategy: {strategy.name} with {len(strategy.rules)} rules")
         
-        return JSONResponse(content={
+        return NumpyORJSONResponse(content={
             "success": True,
             "strategy_id": strategy_id,
             "message": "Strategy updated successfully"
@@ -2359,25 +2593,23 @@ async def update_strategy(strategy_id: str, strategy: Strategy):
 async def delete_strategy(strategy_id: str):
     """Delete a trading strategy"""
     try:
-        if mongo_conn.db is None:
+        if mongo_conn.async_db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
-        strategies_coll = mongo_conn.db.simulation_strategies
-        
-        # Check if strategy exists
-        existing_strategy = strategies_coll.find_one({"id": strategy_id})
-        if not existing_strategy:
-            raise HTTPException(status_code=404, detail="Strategy not found")
+        strategies_coll = mongo_conn.async_db.simulation_strategies
         
-        # Delete from database
-        result = strategies_coll.delete_one({"id": strategy_id})
+        # Delete from database (returns the removed document, None if it didn't exist)
+        deleted_strategy = await strategies_coll.find_one_and_delete(
+            {"id": strategy_id},
+            projection={"_id": 0, "name": 1}
+        )
         
-        if result.deleted_count == 0:
-            raise HTTPException(status_code=400, detail="Failed to delete strategy")
+        if deleted_strategy is None:
+            raise HTTPException(status_code=404, detail="Strategy not found")
         
-        logger.info(f"🗑️ Deleted strategy: {existing_strategy.get('name', 'Unknown')}")
+        logger.info(f"🗑️ Deleted strategy: {deleted_strategy.get('name', 'Unknown')}")
         
-        return JSONResponse(content={
+        return NumpyORJSONResponse(content={
             "success": True,
             "strategy_id": strategy_id,
             "message": "Strategy deleted successfully"
@@ -2390,10 +2622,11 @@ async def delete_strategy(strategy_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to delete strategy: {str(e)}")
 
 @app.post("/api/simulation/run")
-async def run_simulation(params: SimulationParams):
+async def run_simulation(params: SimulationParams, data_manager: IndicatorDataManager = Depends(get_indicator_mgr),
+                         stock_manager: StockDataManager = Depends(get_stock_mgr)):
     """Run a trading strategy simulation"""
     try:
-        if mongo_conn.db is None:
+        if mongo_conn.async_db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
         logger.info(f"🚀 Starting simulation for strategy {params.strategy_id}")
@@ -2401,45 +2634,33 @@ async def run_simulation(params: SimulationParams):
         logger.info(f"🎯 Universe: {params.universe}")
         
         # Normalize universe name to match database format
-        universe_mapping = {
-            "NIFTY50": "NIFTY50",
-            "NIFTY100": "NIFTY100", 
-            "NIFTY500": "NIFTY 500",  # Map to database format with space
-            "NIFTY 500": "NIFTY 500"  # Also handle if already correct
-        }
-        
-        normalized_universe = universe_mapping.get(params.universe, params.universe)
+        normalized_universe = UNIVERSE_MAPPING.get(params.universe, params.universe)
         logger.info(f"🔄 Normalized universe: {params.universe} → {normalized_universe}")
         
         # Get strategy details
-        strategies_coll = mongo_conn.db.simulation_strategies
-        strategy = strategies_coll.find_one({"id": params.strategy_id})
+        strategies_coll = mongo_conn.async_db.simulation_strategies
+        strategy = await strategies_coll.find_one({"id": params.strategy_id}, STRATEGY_SIMULATION_PROJECTION)
         
         if not strategy:
             raise HTTPException(status_code=404, detail="Strategy not found")
         
         # Get universe symbols using normalized name
-        index_meta_coll = mongo_conn.db.index_meta
-        universe_symbols = []
-        for doc in index_meta_coll.find({"index_name": normalized_universe}, {"Symbol": 1}):
-            universe_symbols.append(doc["Symbol"])
+        universe_symbols = await load_universe_symbols(normalized_universe)
         
         logger.info(f"📊 Found {len(universe_symbols)} symbols in {normalized_universe}")
         
         # Run simulation
-        from indicator_data_manager import IndicatorDataManager
-        
-        async with IndicatorDataManager() as data_manager:
-            simulation_results = await run_strategy_simulation(
-                data_manager, 
-                strategy, 
-                universe_symbols, 
-                params
-            )
+        simulation_results = await run_strategy_simulation(
+            data_manager, 
+            strategy, 
+            universe_symbols, 
+            params,
+            stock_manager=stock_manager
+        )
         
         logger.info(f"✅ Simulation completed with {len(simulation_results['results'])} data points")
         
-        return JSONResponse(content={
+        return NumpyORJSONResponse(content={
             "success": True,
             "simulation": simulation_results
         })
@@ -2451,52 +2672,47 @@ async def run_simulation(params: SimulationParams):
 
 def calculate_monthly_metrics(daily_results, base_value):
     """Calculate monthly-level metrics from daily simulation results"""
-    from datetime import datetime
-    from collections import defaultdict
+    if not daily_results:
+        return {
+            "monthly_returns": [],
+            "avg_monthly_return": 0,
+            "monthly_win_rate": 0,
+            "avg_monthly_churn": 0,
+            "volatility": 0
+        }
     
-    # Group results by month
-    monthly_groups = defaultdict(list)
-    for day_result in daily_results:
-        date_obj = datetime.strptime(day_result["date"], "%Y-%m-%d")
-        month_key = f"{date_obj.year}-{date_obj.month:02d}"
-        monthly_groups[month_key].append(day_result)
+    # Columnar frame of only the fields we aggregate; dates are ISO strings so
+    # the month key is a plain prefix slice (no per-row datetime parsing)
+    df = pd.DataFrame({
+        "month": [day["date"][:7] for day in daily_results],
+        "portfolio_value": [day["portfolio_value"] for day in daily_results],
+        "trades": [len(day.get("new_added", [])) + len(day.get("exited", [])) for day in daily_results],
+        "portfolio_size": [len(day.get("holdings", [])) for day in daily_results]
+    })
+    monthly = df.groupby("month", sort=True)
     
-    # Calculate monthly returns
-    monthly_returns = []
-    monthly_churn_rates = []
+    # Monthly return from first to last day of each month
+    month_values = monthly["portfolio_value"]
+    raw_returns = ((month_values.last() / month_values.first()) - 1) * 100
+    # Python round() per month (Series.round rounds half to even on the binary
+    # value and can differ in the last cent); the aggregates below use the
+    # rounded returns, as reported
+    returns = [round(float(ret), 2) for ret in raw_returns]
+    monthly_returns = [{"month": month, "return": ret} for month, ret in zip(raw_returns.index, returns)]
     
-    for month_key in sorted(monthly_groups.keys()):
-        month_days = monthly_groups[month_key]
-        
-        if len(month_days) > 0:
-            first_day = month_days[0]
-            last_day = month_days[-1]
-            
-            # Monthly return
-            month_return = ((last_day["portfolio_value"] / first_day["portfolio_value"]) - 1) * 100
-            monthly_returns.append({
-                "month": month_key,
-                "return": round(month_return, 2)
-            })
-            
-            # Monthly churn (count rebalances in this month)
-            month_trades = sum(len(day.get("new_added", [])) + len(day.get("exited", [])) for day in month_days)
-            # Average portfolio size for the month
-            avg_portfolio_size = sum(len(day.get("holdings", [])) for day in month_days) / len(month_days)
-            churn_rate = (month_trades / (avg_portfolio_size * 2)) * 100 if avg_portfolio_size > 0 else 0
-            monthly_churn_rates.append(churn_rate)
+    # Monthly churn: trades relative to average portfolio size for the month
+    month_trades = monthly["trades"].sum()
+    avg_portfolio_size = monthly["portfolio_size"].mean()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        churn_rates = np.where(avg_portfolio_size > 0, month_trades / (avg_portfolio_size * 2) * 100, 0)
     
     # Calculate metrics
-    avg_monthly_return = sum(m["return"] for m in monthly_returns) / len(monthly_returns) if monthly_returns else 0
-    monthly_win_rate = (sum(1 for m in monthly_returns if m["return"] > 0) / len(monthly_returns) * 100) if monthly_returns else 0
-    avg_monthly_churn = sum(monthly_churn_rates) / len(monthly_churn_rates) if monthly_churn_rates else 0
+    avg_monthly_return = sum(returns) / len(returns)
+    monthly_win_rate = sum(1 for ret in returns if ret > 0) / len(returns) * 100
+    avg_monthly_churn = float(churn_rates.mean())
     
     # Calculate volatility (standard deviation of monthly returns)
-    if len(monthly_returns) > 1:
-        import statistics
-        volatility = statistics.stdev([m["return"] for m in monthly_returns])
-    else:
-        volatility = 0
+    volatility = statistics.stdev(returns) if len(returns) > 1 else 0
     
     return {
         "monthly_returns": monthly_returns,
@@ -2508,22 +2724,19 @@ def calculate_monthly_metrics(daily_results, base_value):
 
 
 @app.post("/api/simulation/multi-run")
-async def run_multi_dimension_simulation(params: SimulationParams):
+async def run_multi_dimension_simulation(params: SimulationParams, data_manager: IndicatorDataManager = Depends(get_indicator_mgr),
+                                         stock_manager: StockDataManager = Depends(get_stock_mgr)):
     """Run parallel simulations across multiple time periods ending on the same date"""
     try:
-        import asyncio
-        from datetime import datetime
-        from dateutil.relativedelta import relativedelta
-        
-        if mongo_conn.db is None:
+        if mongo_conn.async_db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
         logger.info(f"🎯 Starting multi-dimension simulation for strategy {params.strategy_id}")
         logger.info(f"📅 Base period: {params.start_date} to {params.end_date}")
         
         # Parse end date
-        end_date = datetime.strptime(params.end_date, "%Y-%m-%d")
-        base_start_date = datetime.strptime(params.start_date, "%Y-%m-%d")
+        end_date = parse_simulation_date(params.end_date)
+        base_start_date = parse_simulation_date(params.start_date)
         
         # Generate time periods - all ending on same end_date
         # Calculate years between start and end
@@ -2549,48 +2762,57 @@ async def run_multi_dimension_simulation(params: SimulationParams):
             logger.info(f"  📆 {p['label']}: {p['start_date']} to {p['end_date']}")
         
         # Normalize universe
-        universe_mapping = {
-            "NIFTY50": "NIFTY50",
-            "NIFTY100": "NIFTY100", 
-            "NIFTY500": "NIFTY 500",
-            "NIFTY 500": "NIFTY 500"
-        }
-        normalized_universe = universe_mapping.get(params.universe, params.universe)
+        normalized_universe = UNIVERSE_MAPPING.get(params.universe, params.universe)
         
         # Get strategy and universe symbols
-        strategies_coll = mongo_conn.db.simulation_strategies
-        strategy = strategies_coll.find_one({"id": params.strategy_id})
+        strategies_coll = mongo_conn.async_db.simulation_strategies
+        strategy = await strategies_coll.find_one({"id": params.strategy_id}, STRATEGY_SIMULATION_PROJECTION)
         
         if not strategy:
             raise HTTPException(status_code=404, detail="Strategy not found")
         
-        index_meta_coll = mongo_conn.db.index_meta
-        universe_symbols = []
-        for doc in index_meta_coll.find({"index_name": normalized_universe}, {"Symbol": 1}):
-            universe_symbols.append(doc["Symbol"])
+        universe_symbols = await load_universe_symbols(normalized_universe)
         
         logger.info(f"📊 Using {len(universe_symbols)} symbols from {normalized_universe}")
         
-        # Run simulations in parallel
-        from indicator_data_manager import IndicatorDataManager
+        # Load data once for the widest period (all periods share end_date); each
+        # period simulation slices it to its own range
+        simulation_data = await load_simulation_data(
+            data_manager,
+            stock_manager,
+            universe_symbols,
+            base_start_date,
+            end_date,
+            resolve_benchmark_symbol(params)
+        )
+        
+        # Run simulations in parallel on the process pool
+        loop = asyncio.get_running_loop()
+        executor = get_simulation_executor()
         
         async def run_single_period(period_config):
             """Run simulation for a single time period"""
             try:
                 logger.info(f"⚡ Starting simulation for {period_config['label']}")
                 
-                # Create params for this period
-                period_params = params.copy()
-                period_params.start_date = period_config["start_date"]
-                period_params.end_date = period_config["end_date"]
+                # Create params for this period (fields already validated, skip re-validation)
+                period_params = params.model_copy(update={
+                    "start_date": period_config["start_date"],
+                    "end_date": period_config["end_date"]
+                })
                 
-                async with IndicatorDataManager() as data_manager:
-                    results = await run_strategy_simulation(
-                        data_manager,
-                        strategy,
-                        universe_symbols,
-                        period_params
-                    )
+                # Slice before handing off so only this period's data is pickled to the
+                # worker; price arrays are shared and sliced in the worker
+                period_data = slice_simulation_data(worker_data, period_config["start_date"], period_config["end_date"])
+                results = await loop.run_in_executor(
+                    executor,
+                    run_strategy_simulation_worker,
+                    strategy,
+                    universe_symbols,
+                    period_params,
+                    period_data,
+                    price_arrays_manifest
+                )
                 
                 # Extract key metrics from summary (which has all calculated metrics)
                 summary = results.get("summary", {})
@@ -2606,10 +2828,6 @@ async def run_multi_dimension_simulation(params: SimulationParams):
                 last_day = results["results"][-1] if results["results"] else None
                 final_portfolio_value = last_day["portfolio_value"] if last_day else params.portfolio_base_value
                 
-                # Get final portfolio value
-                last_day = results["results"][-1] if results["results"] else None
-                final_portfolio_value = last_day["portfolio_value"] if last_day else params.portfolio_base_value
-                
                 logger.info(f"✅ Completed {period_config['label']}: {total_return:.2f}% return, Alpha: {alpha:.2f}%")
                 
                 return {
@@ -2647,24 +2865,30 @@ async def run_multi_dimension_simulation(params: SimulationParams):
         
         # Execute all simulations in parallel
         logger.info(f"🚀 Launching {len(periods)} parallel simulations...")
-        period_results = await asyncio.gather(*[run_single_period(p) for p in periods])
+        period_semaphore = asyncio.Semaphore(MAX_PARALLEL_PERIODS)
+        
+        async def run_bounded_period(period_config):
+            async with period_semaphore:
+                return await run_single_period(period_config)
+        
+        with shared_simulation_data(simulation_data) as (worker_data, price_arrays_manifest):
+            period_results = await asyncio.gather(*[run_bounded_period(p) for p in periods])
         
         # Calculate aggregate metrics
-        completed_results = [r for r in period_results if r["status"] == "completed"]
+        completed_results, metrics = collect_completed_metrics(period_results)
         
         if completed_results:
-            avg_return = sum(r["total_return"] for r in completed_results) / len(completed_results)
-            avg_alpha = sum(r["alpha"] for r in completed_results) / len(completed_results)
-            avg_sharpe = sum(r["sharpe_ratio"] for r in completed_results) / len(completed_results)
+            returns = metrics["total_return"]
+            avg_return = float(returns.mean())
+            avg_alpha = float(metrics["alpha"].mean())
+            avg_sharpe = float(metrics["sharpe_ratio"].mean())
             
-            best_period = max(completed_results, key=lambda x: x["total_return"])
-            worst_period = min(completed_results, key=lambda x: x["total_return"])
+            best_period = completed_results[int(returns.argmax())]
+            worst_period = completed_results[int(returns.argmin())]
             
             # Consistency score: how close are returns to average (lower std = higher consistency)
-            returns = [r["total_return"] for r in completed_results]
             if len(returns) > 1:
-                import statistics
-                std_returns = statistics.stdev(returns)
+                std_returns = float(returns.std(ddof=1))
                 # Convert to 0-100 scale (100 = perfect consistency)
                 consistency_score = max(0, 100 - (std_returns / max(abs(avg_return), 1) * 100))
             else:
@@ -2674,7 +2898,7 @@ async def run_multi_dimension_simulation(params: SimulationParams):
             best_period = worst_period = {"period_label": "N/A"}
         
         multi_simulation_result = {
-            "params": params.dict(),
+            "params": params.model_dump(),
             "periods": period_results,
             "aggregate_metrics": {
                 "avg_return": round(avg_return, 2),
@@ -2686,54 +2910,48 @@ async def run_multi_dimension_simulation(params: SimulationParams):
             }
         }
         
+        if PERSIST_SIMULATION_RUNS:
+            try:
+                await persist_multi_simulation_run(multi_simulation_result)
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to persist multi-dimension simulation run: {e}")
+        
         logger.info(f"🎉 Multi-dimension simulation completed!")
         logger.info(f"📊 Avg Return: {avg_return:.2f}%, Avg Alpha: {avg_alpha:.2f}%, Consistency: {consistency_score:.1f}%")
         
-        return JSONResponse(content={
+        return NumpyORJSONResponse(content={
             "success": True,
             "multi_simulation": multi_simulation_result
         })
         
     except Exception as e:
         logger.error(f"❌ Error in multi-dimension simulation: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Failed to run multi-dimension simulation: {str(e)}")
 
 
 @app.post("/api/simulation/holdings-multi-run")
-async def run_holdings_multi_dimension_simulation(params: HoldingsMultiParams):
+async def run_holdings_multi_dimension_simulation(params: HoldingsMultiParams, data_manager: IndicatorDataManager = Depends(get_indicator_mgr),
+                                                  stock_manager: StockDataManager = Depends(get_stock_mgr)):
     """Run parallel simulations with different max holdings (base * multipliers)"""
     try:
-        import asyncio
-        from datetime import datetime
-        
-        if mongo_conn.db is None:
+        if mongo_conn.async_db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
         logger.info(f"🎯 Starting holdings multi-dimension simulation for strategy {params.strategy_id}")
         logger.info(f"📊 Base max holdings: {params.base_max_holdings}, Multipliers: {params.multipliers}")
         
         # Normalize universe
-        universe_mapping = {
-            "NIFTY50": "NIFTY50",
-            "NIFTY100": "NIFTY100", 
-            "NIFTY500": "NIFTY 500",
-            "NIFTY 500": "NIFTY 500"
-        }
-        normalized_universe = universe_mapping.get(params.universe, params.universe)
+        normalized_universe = UNIVERSE_MAPPING.get(params.universe, params.universe)
         
         # Get strategy and universe symbols
-        strategies_coll = mongo_conn.db.simulation_strategies
-        strategy = strategies_coll.find_one({"id": params.strategy_id})
+        strategies_coll = mongo_conn.async_db.simulation_strategies
+        strategy = await strategies_coll.find_one({"id": params.strategy_id}, STRATEGY_SIMULATION_PROJECTION)
         
         if not strategy:
             raise HTTPException(status_code=404, detail="Strategy not found")
         
-        index_meta_coll = mongo_conn.db.index_meta
-        universe_symbols = []
-        for doc in index_meta_coll.find({"index_name": normalized_universe}, {"Symbol": 1}):
-            universe_symbols.append(doc["Symbol"])
+        universe_symbols = await load_universe_symbols(normalized_universe)
         
         logger.info(f"📊 Using {len(universe_symbols)} symbols from {normalized_universe}")
         
@@ -2749,8 +2967,27 @@ async def run_holdings_multi_dimension_simulation(params: HoldingsMultiParams):
         
         logger.info(f"🔢 Generated {len(holding_configs)} holding configurations: {[h['holding_size'] for h in holding_configs]}")
         
-        # Run simulations in parallel
-        from indicator_data_manager import IndicatorDataManager
+        # All holding sizes share the same date range, so load the data once
+        simulation_data = await load_simulation_data(
+            data_manager,
+            stock_manager,
+            universe_symbols,
+            parse_simulation_date(params.start_date),
+            parse_simulation_date(params.end_date),
+            resolve_benchmark_symbol(params)
+        )
+        
+        # Run simulations in parallel on the process pool
+        loop = asyncio.get_running_loop()
+        executor = get_simulation_executor()
+        
+        # Serialize the request params once: echoed in the response, and all fields
+        # but the holdings grid are shared by every holding size's SimulationParams
+        params_data = params.model_dump()
+        shared_param_fields = {
+            field: value for field, value in params_data.items()
+            if field not in ("base_max_holdings", "multipliers")
+        }
         
         async def run_single_holding_simulation(holding_config):
             """Run simulation for a single holding size"""
@@ -2758,32 +2995,22 @@ async def run_holdings_multi_dimension_simulation(params: HoldingsMultiParams):
                 holding_size = holding_config["holding_size"]
                 logger.info(f"⚡ Starting simulation for {holding_size} holdings")
                 
-                # Create SimulationParams for this holding size
-                holding_params = SimulationParams(
-                    strategy_id=params.strategy_id,
-                    portfolio_base_value=params.portfolio_base_value,
-                    rebalance_frequency=params.rebalance_frequency,
-                    rebalance_date=params.rebalance_date,
-                    rebalance_type=params.rebalance_type,
-                    universe=params.universe,
-                    benchmark_symbol=params.benchmark_symbol,
-                    max_holdings=holding_size,
-                    momentum_ranking=params.momentum_ranking,
-                    start_date=params.start_date,
-                    end_date=params.end_date,
-                    include_brokerage=params.include_brokerage,
-                    exchange=params.exchange,
-                    custom_brokerage_rate=params.custom_brokerage_rate,
-                    portfolio_turnover_estimate=params.portfolio_turnover_estimate
+                # Create SimulationParams for this holding size (fields already
+                # validated on HoldingsMultiParams, skip re-validation)
+                holding_params = SimulationParams.model_construct(
+                    **shared_param_fields,
+                    max_holdings=holding_size
                 )
                 
-                async with IndicatorDataManager() as data_manager:
-                    results = await run_strategy_simulation(
-                        data_manager,
-                        strategy,
-                        universe_symbols,
-                        holding_params
-                    )
+                results = await loop.run_in_executor(
+                    executor,
+                    run_strategy_simulation_worker,
+                    strategy,
+                    universe_symbols,
+                    holding_params,
+                    worker_data,
+                    price_arrays_manifest
+                )
                 
                 # Extract metrics from summary
                 summary = results.get("summary", {})
@@ -2796,57 +3023,40 @@ async def run_holdings_multi_dimension_simulation(params: HoldingsMultiParams):
                 total_trades_summary = summary.get("total_trades", 0)
                 
                 # Calculate volatility from daily returns
-                portfolio_values = [day["portfolio_value"] for day in results["results"]]
-                daily_returns = []
-                for i in range(1, len(portfolio_values)):
-                    daily_ret = (portfolio_values[i] - portfolio_values[i-1]) / portfolio_values[i-1] * 100
-                    daily_returns.append(daily_ret)
-                
-                import statistics
-                volatility = statistics.stdev(daily_returns) * (252 ** 0.5) if len(daily_returns) > 1 else 0
+                days = results["results"]
+                portfolio_values = np.fromiter((day["portfolio_value"] for day in days), dtype=np.float64, count=len(days))
+                daily_returns = np.diff(portfolio_values) / portfolio_values[:-1] * 100
+                volatility = float(daily_returns.std(ddof=1) * np.sqrt(252)) if len(daily_returns) > 1 else 0
                 
-                # Calculate monthly metrics
-                monthly_data = {}
-                for day in results["results"]:
-                    date_str = day["date"]
-                    month_key = date_str[:7]  # YYYY-MM
-                    
-                    if month_key not in monthly_data:
-                        monthly_data[month_key] = {
-                            "start_value": day["portfolio_value"],
-                            "end_value": day["portfolio_value"],
-                            "trades": 0
-                        }
-                    
-                    monthly_data[month_key]["end_value"] = day["portfolio_value"]
-                    monthly_data[month_key]["trades"] += len(day.get("new_added", [])) + len(day.get("exited", []))
+                # Calculate monthly metrics (first/last value and trade count per YYYY-MM)
+                monthly = pd.DataFrame({
+                    "month": [day["date"][:7] for day in days],
+                    "portfolio_value": portfolio_values,
+                    "trades": [len(day.get("new_added", [])) + len(day.get("exited", [])) for day in days]
+                }).groupby("month", sort=True)
+                start_values = monthly["portfolio_value"].first().to_numpy()
+                end_values = monthly["portfolio_value"].last().to_numpy()
+                monthly_trades = monthly["trades"].sum().to_numpy()
                 
                 # Calculate monthly returns and churn
-                monthly_returns = []
-                monthly_churns = []
-                for month_key, data in monthly_data.items():
-                    monthly_return = (data["end_value"] - data["start_value"]) / data["start_value"] * 100
-                    monthly_returns.append(monthly_return)
-                    
-                    # Churn = trades / (holdings * 2) to normalize
-                    monthly_churn = (data["trades"] / (holding_size * 2)) * 100 if holding_size > 0 else 0
-                    monthly_churns.append(monthly_churn)
+                monthly_returns = (end_values - start_values) / start_values * 100
+                # Churn = trades / (holdings * 2) to normalize
+                if holding_size > 0:
+                    monthly_churns = monthly_trades / (holding_size * 2) * 100
+                else:
+                    monthly_churns = np.zeros(len(monthly_trades))
                 
                 # Calculate monthly win rate
-                positive_months = sum(1 for r in monthly_returns if r > 0)
-                monthly_win_rate = (positive_months / len(monthly_returns)) * 100 if monthly_returns else 0
+                monthly_win_rate = float((monthly_returns > 0).mean() * 100) if len(monthly_returns) else 0
                 
-                avg_monthly_churn = statistics.mean(monthly_churns) if monthly_churns else 0
+                avg_monthly_churn = float(monthly_churns.mean()) if len(monthly_churns) else 0
                 
-                # Prepare portfolio values for charting
-                portfolio_values_data = [
-                    {
-                        "date": day["date"],
-                        "value": day["portfolio_value"],
-                        "benchmark": day["benchmark_value"]
-                    }
-                    for day in results["results"]
-                ]
+                # Prepare portfolio values for charting (columnar: one array per series)
+                portfolio_values_data = {
+                    "dates": [day["date"] for day in days],
+                    "values": portfolio_values,
+                    "benchmarks": np.fromiter((day["benchmark_value"] for day in days), dtype=np.float64, count=len(days))
+                }
                 
                 # Get final portfolio value
                 last_day = results["results"][-1] if results["results"] else None
@@ -2867,7 +3077,7 @@ async def run_holdings_multi_dimension_simulation(params: HoldingsMultiParams):
                     "monthly_win_rate": round(monthly_win_rate, 2),
                     "final_portfolio_value": final_portfolio_value,
                     "days_count": len(results["results"]),
-                    "monthly_returns": [round(r, 2) for r in monthly_returns],
+                    "monthly_returns": [round(r, 2) for r in monthly_returns.tolist()],
                     "portfolio_values": portfolio_values_data,
                     "status": "completed"
                 }
@@ -2888,37 +3098,35 @@ async def run_holdings_multi_dimension_simulation(params: HoldingsMultiParams):
                     "final_portfolio_value": params.portfolio_base_value,
                     "days_count": 0,
                     "monthly_returns": [],
-                    "portfolio_values": [],
+                    "portfolio_values": {"dates": [], "values": [], "benchmarks": []},
                     "status": "error",
                     "error_message": str(e)
                 }
         
-        # Execute all simulations sequentially to avoid resource conflicts
-        logger.info(f"🚀 Starting {len(holding_configs)} sequential simulations...")
-        holding_results = []
-        for holding_config in holding_configs:
-            result = await run_single_holding_simulation(holding_config)
-            holding_results.append(result)
+        # Execute all simulations in parallel on the process pool (no shared mutable state)
+        logger.info(f"🚀 Launching {len(holding_configs)} parallel simulations...")
+        with shared_simulation_data(simulation_data) as (worker_data, price_arrays_manifest):
+            holding_results = await asyncio.gather(*[run_single_holding_simulation(h) for h in holding_configs])
         
         # Calculate aggregate metrics
-        completed_results = [r for r in holding_results if r["status"] == "completed"]
+        completed_results, metrics = collect_completed_metrics(holding_results)
         
         if completed_results:
-            avg_return = sum(r["total_return"] for r in completed_results) / len(completed_results)
-            avg_alpha = sum(r["alpha"] for r in completed_results) / len(completed_results)
-            avg_sharpe = sum(r["sharpe_ratio"] for r in completed_results) / len(completed_results)
+            avg_return = float(metrics["total_return"].mean())
+            avg_alpha = float(metrics["alpha"].mean())
+            avg_sharpe = float(metrics["sharpe_ratio"].mean())
             
-            best_return_result = max(completed_results, key=lambda x: x["total_return"])
-            worst_return_result = min(completed_results, key=lambda x: x["total_return"])
+            best_return_result = completed_results[int(metrics["total_return"].argmax())]
+            worst_return_result = completed_results[int(metrics["total_return"].argmin())]
             
             # Find optimal risk-adjusted (best Sharpe ratio)
-            best_sharpe_result = max(completed_results, key=lambda x: x["sharpe_ratio"])
+            best_sharpe_result = completed_results[int(metrics["sharpe_ratio"].argmax())]
         else:
             avg_return = avg_alpha = avg_sharpe = 0
             best_return_result = worst_return_result = best_sharpe_result = {"holding_size": 0}
         
         multi_holdings_result = {
-            "params": params.dict(),
+            "params": params_data,
             "holdings_results": holding_results,
             "aggregate_metrics": {
                 "average_return": round(avg_return, 2),
@@ -2933,71 +3141,59 @@ async def run_holdings_multi_dimension_simulation(params: HoldingsMultiParams):
         logger.info(f"🎉 Holdings multi-dimension simulation completed!")
         logger.info(f"📊 Best: {best_return_result['holding_size']} holdings, Optimal: {best_sharpe_result['holding_size']} holdings")
         
-        return JSONResponse(content={
+        return NumpyORJSONResponse(content={
             "success": True,
             "multi_holdings_simulation": multi_holdings_result
         })
         
     except Exception as e:
         logger.error(f"❌ Error in holdings multi-dimension simulation: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Failed to run holdings multi-dimension simulation: {str(e)}")
 
 
 @app.post("/api/simulation/debug")
-async def debug_simulation(params: SimulationParams):
+async def debug_simulation(params: SimulationParams, data_manager: IndicatorDataManager = Depends(get_indicator_mgr),
+                           stock_manager: StockDataManager = Depends(get_stock_mgr)):
     """Run simulation with detailed debugging for first few days"""
     try:
-        if mongo_conn.db is None:
+        if mongo_conn.async_db is None:
             raise HTTPException(status_code=500, detail="Database connection not available")
         
         logger.info(f"🔍 DEBUG MODE: Starting simulation for strategy {params.strategy_id}")
         
         # Normalize universe name to match database format
-        universe_mapping = {
-            "NIFTY50": "NIFTY50",
-            "NIFTY100": "NIFTY100", 
-            "NIFTY500": "NIFTY 500",  # Map to database format with space
-            "NIFTY 500": "NIFTY 500"  # Also handle if already correct
-        }
-        
-        normalized_universe = universe_mapping.get(params.universe, params.universe)
+        normalized_universe = UNIVERSE_MAPPING.get(params.universe, params.universe)
         logger.info(f"🔄 DEBUG: Normalized universe: {params.universe} → {normalized_universe}")
         
         # Get strategy details
-        strategies_coll = mongo_conn.db.simulation_strategies
-        strategy = strategies_coll.find_one({"id": params.strategy_id})
+        strategies_coll = mongo_conn.async_db.simulation_strategies
+        strategy = await strategies_coll.find_one({"id": params.strategy_id}, STRATEGY_SIMULATION_PROJECTION)
         
         if not strategy:
             raise HTTPException(status_code=404, detail="Strategy not found")
         
         # Get universe symbols (limit to first 20 for debugging)
-        index_meta_coll = mongo_conn.db.index_meta
-        universe_symbols = []
-        for doc in index_meta_coll.find({"index_name": normalized_universe}, {"Symbol": 1}).limit(20):
-            universe_symbols.append(doc["Symbol"])
+        universe_symbols = (await load_universe_symbols(normalized_universe))[:20]
         
         logger.info(f"🧪 DEBUG: Using {len(universe_symbols)} symbols: {universe_symbols}")
         
         # Use the full date range provided by user (no artificial limits)
-        debug_params = params.copy()
+        debug_params = params.model_copy()
         # Keep original start_date and end_date from user
         
-        from indicator_data_manager import IndicatorDataManager
-        
-        async with IndicatorDataManager() as data_manager:
-            simulation_results = await run_strategy_simulation_debug(
-                data_manager, 
-                strategy, 
-                universe_symbols, 
-                debug_params
-            )
+        simulation_results = await run_strategy_simulation_debug(
+            data_manager, 
+            stock_manager,
+            strategy, 
+            universe_symbols, 
+            debug_params
+        )
         
         total_days = len(simulation_results["debug_results"]) if simulation_results["debug_results"] else 0
         rebalance_days = len([r for r in simulation_results["debug_results"] if r["should_rebalance"]]) if simulation_results["debug_results"] else 0
         
-        return JSONResponse(content={
+        return NumpyORJSONResponse(content={
             "success": True,
             "debug_simulation": simulation_results,
             "message": f"Debug simulation completed for {total_days} days with {rebalance_days} rebalance events"
@@ -3014,8 +3210,8 @@ async def estimate_simulation_charges(params: SimulationParams):
         logger.info(f"🧮 Estimating charges for strategy {params.strategy_id}")
         
         # Calculate simulation duration
-        start_date = datetime.strptime(params.start_date, "%Y-%m-%d")
-        end_date = datetime.strptime(params.end_date, "%Y-%m-%d")
+        start_date = parse_simulation_date(params.start_date)
+        end_date = parse_simulation_date(params.end_date)
         simulation_days = (end_date - start_date).days
         
         # Initialize brokerage calculator
@@ -3152,213 +3348,161 @@ async def download_tradebook(request: dict):
         logger.error(f"❌ Error generating PDF tradebook: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to generate tradebook: {str(e)}")
 
-async def calculate_stock_momentum(symbol: str, current_date: str, price_data_history: dict, 
-                                   indicator_data_history: dict = None, method: str = "20_day_return") -> float:
-    """Calculate momentum score for a stock based on historical performance"""
+# Calendar-day price lookback per momentum method (trading days + buffer); others use 30
+MOMENTUM_LOOKBACK_DAYS = {"price_roc_66d": 90, "price_roc_222d": 300}
+
+# Trading-day periods of the price rate-of-change momentum methods
+PRICE_ROC_PERIODS = {"20_day_return": 20, "price_roc_66d": 66, "price_roc_222d": 222}
+
+def build_symbol_price_arrays(price_data_history: dict) -> dict:
+    """Per-symbol (dates, closes) NumPy arrays in date order, built once per simulation"""
+    symbol_dates = defaultdict(list)
+    symbol_closes = defaultdict(list)
+    for date_str in sorted(price_data_history):
+        for symbol, price in price_data_history[date_str].items():
+            symbol_dates[symbol].append(date_str)
+            symbol_closes[symbol].append(price["close_price"])
+    
+    return {
+        symbol: (np.array(dates, dtype="datetime64[D]"), np.array(symbol_closes[symbol], dtype=np.float64))
+        for symbol, dates in symbol_dates.items()
+    }
+
+def slice_symbol_price_arrays(symbol_price_arrays: dict, start_date_str: str, end_date_str: str) -> dict:
+    """Restrict per-symbol price arrays to [start_date_str, end_date_str] (views, no copies)"""
+    start_day = np.datetime64(start_date_str, "D")
+    end_day = np.datetime64(end_date_str, "D")
+    sliced = {}
+    for symbol, (dates_np, closes_np) in symbol_price_arrays.items():
+        lo = np.searchsorted(dates_np, start_day, side="left")
+        hi = np.searchsorted(dates_np, end_day, side="right")
+        if hi > lo:
+            sliced[symbol] = (dates_np[lo:hi], closes_np[lo:hi])
+    return sliced
+
+# Indicator-based momentum methods -> indicator column whose rate of change they rank by
+INDICATOR_MOMENTUM_COLUMNS = {
+    "truevx_roc": "truevx_score",
+    "short_mean_roc": "mean_short",
+    "mid_mean_roc": "mean_mid",
+    "long_mean_roc": "mean_long",
+    "stock_score_roc": "stock_score"
+}
+
+# Column of each indicator method in build_indicator_momentum's matrices
+INDICATOR_MOMENTUM_INDEX = {method: i for i, method in enumerate(INDICATOR_MOMENTUM_COLUMNS)}
+
+# StockScore weights per indicator column
+STOCK_SCORE_WEIGHTS = {"truevx_score": 0.1, "mean_short": 0.2, "mean_mid": 0.3, "mean_long": 0.4}
+
+# Indicator momentum compares each symbol's latest record with the one this many records earlier
+INDICATOR_ROC_LAG = 22
+
+def build_indicator_momentum(indicator_data_history: dict) -> Optional[dict]:
+    """
+    Rate of change (%) of each indicator over INDICATOR_ROC_LAG records, for every
+    (symbol, date) record, computed once per simulation with a grouped shift.
+    
+    Returns {symbol: (dates, momentum)}: the symbol's record dates as sorted
+    datetime64[D] and a (records, methods) float64 matrix whose columns follow
+    INDICATOR_MOMENTUM_COLUMNS.
+    """
+    rows = [
+        (symbol, date_str, values.get("truevx_score"), values.get("mean_short"),
+         values.get("mean_mid"), values.get("mean_long"))
+        for date_str, day_indicators in indicator_data_history.items()
+        for symbol, values in day_indicators.items()
+    ]
+    if not rows:
+        return None
+    
+    frame = pd.DataFrame(rows, columns=["symbol", "date", "truevx_score", "mean_short", "mean_mid", "mean_long"])
+    frame = frame.sort_values(["symbol", "date"], kind="stable").set_index(["symbol", "date"])
+    frame = frame.fillna(0)  # Missing values count as 0
+    
+    # StockScore: weighted blend of the TrueValueX score and the three means, as one
+    # matrix-vector product over all records
+    frame["stock_score"] = frame[list(STOCK_SCORE_WEIGHTS)].to_numpy(dtype=np.float64) @ np.fromiter(
+        STOCK_SCORE_WEIGHTS.values(), dtype=np.float64, count=len(STOCK_SCORE_WEIGHTS)
+    )
+    
+    current = frame[list(INDICATOR_MOMENTUM_COLUMNS.values())]
+    past = current.groupby(level="symbol", sort=False).shift(INDICATOR_ROC_LAG).to_numpy(dtype=np.float64)
+    
+    # Branch-free ROC over every record: 0 where there is no positive past value
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(past > 0, (current.to_numpy(dtype=np.float64) - past) / past * 100.0, 0.0)
+    np.nan_to_num(values, copy=False)
+    
+    # Split into contiguous per-symbol arrays (rows are already grouped by symbol)
+    symbols = current.index.get_level_values("symbol").to_numpy()
+    dates = current.index.get_level_values("date").to_numpy().astype("datetime64[D]")
+    starts = np.flatnonzero(np.r_[True, symbols[1:] != symbols[:-1]])
+    ends = np.r_[starts[1:], len(symbols)]
+    return {symbols[start]: (dates[start:end], values[start:end]) for start, end in zip(starts, ends)}
+
+def calculate_stock_momentum(symbol: str, current_date: Union[str, np.datetime64], symbol_price_arrays: dict, 
+                             indicator_momentum: dict = None, method: str = "20_day_return") -> float:
+    """Calculate momentum score for a stock based on historical performance
+    
+    current_date: ISO date string, or np.datetime64[D] when the caller already converted it
+    symbol_price_arrays: output of build_symbol_price_arrays for the simulation's price data
+    indicator_momentum: output of build_indicator_momentum (indicator-based methods only)
+    """
     try:
-        current_date_obj = datetime.strptime(current_date, "%Y-%m-%d")
-        
-        # Get lookback period based on method
-        if method == "price_roc_66d":
-            lookback_days = 90  # 66 trading days + buffer
-            required_days = 66
-        elif method == "price_roc_222d":
-            lookback_days = 300  # 222 trading days + buffer
-            required_days = 222
-        else:
-            lookback_days = 30  # 20-22 trading days + buffer
-            required_days = 20
-        
-        start_date = current_date_obj - timedelta(days=lookback_days)
-        
-        # Get price history for this symbol
-        symbol_prices = []
-        for date_str, prices in price_data_history.items():
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            if start_date <= date_obj <= current_date_obj and symbol in prices:
-                symbol_prices.append({
-                    "date": date_obj,
-                    "close": prices[symbol]["close_price"]
-                })
-        
-        # Sort by date
-        symbol_prices.sort(key=lambda x: x["date"])
-        
-        if len(symbol_prices) < 2:
+        series = symbol_price_arrays.get(symbol)
+        if series is None:
+            return 0.0  # No price history for this symbol
+        dates_np, closes_np = series
+        
+        # Closes within the lookback window ending on current_date (inclusive)
+        current_day = np.datetime64(current_date, "D")
+        lookback_days = MOMENTUM_LOOKBACK_DAYS.get(method, 30)
+        window_start = np.searchsorted(dates_np, current_day - np.timedelta64(lookback_days, "D"), side="left")
+        window_end = np.searchsorted(dates_np, current_day, side="right")
+        window = closes_np[window_start:window_end]
+        
+        if len(window) < 2:
             return 0.0  # No momentum if insufficient data
         
-        current_price = symbol_prices[-1]["close"]
-        
-        if method == "20_day_return":
-            # Simple 20-day return (or available period)
-            if len(symbol_prices) >= 20:
-                lookback_price = symbol_prices[-20]["close"]
-            else:
-                lookback_price = symbol_prices[0]["close"]
-            
-            if lookback_price > 0:
-                return ((current_price / lookback_price) - 1) * 100  # Return as percentage
-            return 0.0
-        
-        elif method == "price_roc_66d":
-            # 66-day price momentum
-            if len(symbol_prices) >= 66:
-                lookback_price = symbol_prices[-66]["close"]
-            else:
-                lookback_price = symbol_prices[0]["close"]
-            
-            if lookback_price > 0:
-                return ((current_price / lookback_price) - 1) * 100
-            return 0.0
-        
-        elif method == "price_roc_222d":
-            # 222-day price momentum
-            if len(symbol_prices) >= 222:
-                lookback_price = symbol_prices[-222]["close"]
-            else:
-                lookback_price = symbol_prices[0]["close"]
-            
-            if lookback_price > 0:
-                return ((current_price / lookback_price) - 1) * 100
-            return 0.0
+        if method in PRICE_ROC_PERIODS:
+            # N-day price return as percentage (or available period)
+            return momentum_kernels.roc(window, PRICE_ROC_PERIODS[method])
             
         elif method == "risk_adjusted":
-            # Risk-adjusted return (Sharpe-like calculation)
-            if len(symbol_prices) < 5:
-                return 0.0
-            
-            # Calculate daily returns
-            daily_returns = []
-            for i in range(1, len(symbol_prices)):
-                prev_price = symbol_prices[i-1]["close"]
-                curr_price = symbol_prices[i]["close"]
-                if prev_price > 0:
-                    daily_return = (curr_price / prev_price) - 1
-                    daily_returns.append(daily_return)
-            
-            if not daily_returns:
-                return 0.0
-                
-            # Calculate mean and std of returns
-            if len(daily_returns) > 0:
-                mean_return = sum(daily_returns) / len(daily_returns)
-                variance = sum((r - mean_return) ** 2 for r in daily_returns) / len(daily_returns)
-                std_return = variance ** 0.5
-                
-                # Risk-adjusted score (annualized)
-                if std_return > 0:
-                    sharpe_like = (mean_return / std_return) * (252 ** 0.5)  # Annualized
-                    return sharpe_like * 100  # Scale for comparison
-                return mean_return * 100
-            else:
+            # Risk-adjusted return (annualized Sharpe-like score)
+            if len(window) < 5:
                 return 0.0
+            return momentum_kernels.risk_adjusted(window)
             
         elif method == "technical":
-            # Technical momentum combining price and trend
-            if len(symbol_prices) < 10:
+            # Technical momentum combining price (vs MA20) and trend (MA10 vs MA20)
+            if len(window) < 10:
                 return 0.0
-                
-            # Calculate 10-day and 20-day moving averages
-            prices_10 = symbol_prices[-10:] if len(symbol_prices) >= 10 else symbol_prices
-            prices_20 = symbol_prices[-20:] if len(symbol_prices) >= 20 else symbol_prices
-            
-            if len(prices_10) > 0 and len(prices_20) > 0:
-                ma_10 = sum(p["close"] for p in prices_10) / len(prices_10)
-                ma_20 = sum(p["close"] for p in prices_20) / len(prices_20)
-                
-                # Price momentum (current vs 20-day average)
-                price_momentum = ((current_price / ma_20) - 1) * 100 if ma_20 > 0 else 0
-                
-                # Trend momentum (10-day MA vs 20-day MA)
-                trend_momentum = ((ma_10 / ma_20) - 1) * 100 if ma_20 > 0 else 0
-            else:
-                price_momentum = 0
-                trend_momentum = 0
-            
-            # Combined score
-            return (price_momentum + trend_momentum) / 2
+            return momentum_kernels.technical(window)
         
-        elif method in ["truevx_roc", "short_mean_roc", "mid_mean_roc", "long_mean_roc", "stock_score_roc"]:
-            # Indicator-based momentum (requires indicator_data_history)
-            if not indicator_data_history:
+        elif method in INDICATOR_MOMENTUM_COLUMNS:
+            # Indicator-based momentum (requires indicator_momentum)
+            if indicator_momentum is None:
                 logger.warning(f"⚠️ No indicator data for {method} on symbol {symbol}")
                 return 0.0
             
-            # Get indicator history for this symbol (22 trading days lookback)
-            indicator_records = []
-            for date_str in sorted(indicator_data_history.keys()):
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                if date_obj <= current_date_obj and symbol in indicator_data_history[date_str]:
-                    indicator_records.append({
-                        "date": date_obj,
-                        "data": indicator_data_history[date_str][symbol]
-                    })
-            
-            # Sort by date and get most recent records
-            indicator_records.sort(key=lambda x: x["date"], reverse=True)
+            # Indicator records for this symbol up to current_date
+            symbol_momentum = indicator_momentum.get(symbol)
+            if symbol_momentum is not None:
+                record_dates, momentum_values = symbol_momentum
+                record_count = np.searchsorted(record_dates, current_day, side="right")
+            else:
+                record_count = 0
             
-            logger.info(f"📊 {symbol}: Found {len(indicator_records)} indicator records for {method}")
+            logger.info(f"📊 {symbol}: Found {record_count} indicator records for {method}")
             
-            if len(indicator_records) <= 22:
-                logger.warning(f"⚠️ {symbol}: Not enough indicator data ({len(indicator_records)} records, need > 22)")
+            if record_count <= INDICATOR_ROC_LAG:
+                logger.warning(f"⚠️ {symbol}: Not enough indicator data ({record_count} records, need > {INDICATOR_ROC_LAG})")
                 return 0.0  # Not enough data
             
-            # Current (most recent) and past (22 days ago)
-            current_indicators = indicator_records[0]["data"]
-            past_indicators = indicator_records[22]["data"]
-            
-            # Extract values with NaN handling (convert None to 0)
-            def safe_get(data, key):
-                val = data.get(key)
-                return val if val is not None else 0
-            
-            if method == "truevx_roc":
-                current_val = safe_get(current_indicators, "truevx_score")
-                past_val = safe_get(past_indicators, "truevx_score")
-                if past_val > 0:
-                    return ((current_val - past_val) / past_val) * 100
-                return 0.0
-            
-            elif method == "short_mean_roc":
-                current_val = safe_get(current_indicators, "mean_short")
-                past_val = safe_get(past_indicators, "mean_short")
-                if past_val > 0:
-                    return ((current_val - past_val) / past_val) * 100
-                return 0.0
-            
-            elif method == "mid_mean_roc":
-                current_val = safe_get(current_indicators, "mean_mid")
-                past_val = safe_get(past_indicators, "mean_mid")
-                if past_val > 0:
-                    return ((current_val - past_val) / past_val) * 100
-                return 0.0
-            
-            elif method == "long_mean_roc":
-                current_val = safe_get(current_indicators, "mean_long")
-                past_val = safe_get(past_indicators, "mean_long")
-                if past_val > 0:
-                    return ((current_val - past_val) / past_val) * 100
-                return 0.0
-            
-            elif method == "stock_score_roc":
-                # Calculate StockScore for both periods
-                current_truevx = safe_get(current_indicators, "truevx_score")
-                current_short = safe_get(current_indicators, "mean_short")
-                current_mid = safe_get(current_indicators, "mean_mid")
-                current_long = safe_get(current_indicators, "mean_long")
-                current_score = (0.1 * current_truevx + 0.2 * current_short + 
-                               0.3 * current_mid + 0.4 * current_long)
-                
-                past_truevx = safe_get(past_indicators, "truevx_score")
-                past_short = safe_get(past_indicators, "mean_short")
-                past_mid = safe_get(past_indicators, "mean_mid")
-                past_long = safe_get(past_indicators, "mean_long")
-                past_score = (0.1 * past_truevx + 0.2 * past_short + 
-                            0.3 * past_mid + 0.4 * past_long)
-                
-                if past_score > 0:
-                    return ((current_score - past_score) / past_score) * 100
-                return 0.0
+            # Rate of change between the most recent record and the one 22 records before
+            return float(momentum_values[record_count - 1, INDICATOR_MOMENTUM_INDEX[method]])
         
         return 0.0
         
@@ -3366,10 +3510,57 @@ async def calculate_stock_momentum(symbol: str, current_date: str, price_data_hi
         logger.warning(f"⚠️ Error calculating momentum for {symbol}: {e}")
         return 0.0
 
-async def select_top_stocks_by_momentum(qualified_stocks: list, current_holdings: dict, 
-                                price_data_history: dict, indicator_data_history: dict,
-                                current_date: str, max_holdings: int, 
-                                momentum_method: str = "20_day_return") -> tuple:
+def compute_momentum_batch(symbols: list, current_date: str, symbol_price_arrays: dict,
+                           indicator_momentum: dict = None, method: str = "20_day_return",
+                           momentum_cache: Optional[dict] = None) -> np.ndarray:
+    """
+    Momentum scores for all symbols on current_date in one call (aligned with symbols)
+    
+    momentum_cache: optional memo keyed by (symbol, current_date, method); only share
+    it between runs over the same simulation data (see get_worker_momentum_cache)
+    """
+    # Parse the date once for the whole batch rather than once per symbol
+    current_day = np.datetime64(current_date, "D")
+    if momentum_cache is None:
+        return np.fromiter(
+            (calculate_stock_momentum(symbol, current_day, symbol_price_arrays, indicator_momentum, method)
+             for symbol in symbols),
+            dtype=np.float64,
+            count=len(symbols)
+        )
+    
+    scores = np.empty(len(symbols), dtype=np.float64)
+    for i, symbol in enumerate(symbols):
+        key = (symbol, current_date, method)
+        score = momentum_cache.get(key)
+        if score is None:
+            score = calculate_stock_momentum(symbol, current_day, symbol_price_arrays, indicator_momentum, method)
+            momentum_cache[key] = score
+        scores[i] = score
+    return scores
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, highest first, in O(n) + O(k log k)
+    
+    Ties keep their original order, matching a stable descending sort.
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        kth_score = -np.partition(-scores, k - 1)[k - 1]
+        above = np.flatnonzero(scores > kth_score)
+        ties = np.flatnonzero(scores == kth_score)[:k - len(above)]
+        top_idx = np.sort(np.concatenate([above, ties]))
+    else:
+        top_idx = np.arange(len(scores))
+    return top_idx[np.argsort(-scores[top_idx], kind="stable")]
+
+def select_top_stocks_by_momentum(qualified_stocks: list, current_holdings: dict, 
+                                  symbol_price_arrays: dict, indicator_momentum: Optional[dict],
+                                  current_date: str, max_holdings: int, 
+                                  momentum_method: str = "20_day_return",
+                                  momentum_cache: Optional[dict] = None) -> tuple:
     """
     Select top stocks based on momentum ranking when portfolio limit is exceeded
     Returns: (selected_stocks, added_stocks, removed_stocks)
@@ -3383,66 +3574,45 @@ async def select_top_stocks_by_momentum(qualified_stocks: list, current_holdings
                          if stock["symbol"] not in current_holdings]
             return qualified_stocks, new_stocks, []
         
-        # Get all candidate stocks (current holdings + newly qualified)
-        all_candidates = []
+        # Get all candidate stocks (current holdings first, then newly qualified)
+        qualified_by_symbol = {stock["symbol"]: stock for stock in qualified_stocks}
+        candidate_symbols = list(current_holdings.keys()) + [
+            symbol for symbol in qualified_by_symbol if symbol not in current_holdings
+        ]
         
-        # Add current holdings with their momentum scores
-        for symbol in current_holdings.keys():
-            momentum = await calculate_stock_momentum(
-                symbol, current_date, price_data_history, indicator_data_history, momentum_method
-            )
+        # Score every candidate in one batch
+        momentum_scores = compute_momentum_batch(
+            candidate_symbols, current_date, symbol_price_arrays, indicator_momentum, momentum_method,
+            momentum_cache
+        )
+        
+        all_candidates = []
+        for symbol, momentum in zip(candidate_symbols, momentum_scores.tolist()):
+            is_current_holding = symbol in current_holdings
+            qualified_stock = qualified_by_symbol.get(symbol)
             all_candidates.append({
                 "symbol": symbol,
                 "momentum_score": momentum,
-                "is_current_holding": True,
-                "truevx_score": 0  # Will be updated if in qualified_stocks
+                "is_current_holding": is_current_holding,
+                "truevx_score": qualified_stock.get("truevx_score", 0) if qualified_stock else 0
             })
-            logger.info(f"🔍 Momentum ({momentum_method}) for {symbol} (holding): {momentum:.2f}")
-        
-        # Add newly qualified stocks
-        for stock in qualified_stocks:
-            symbol = stock["symbol"]
-            if symbol not in current_holdings:
-                momentum = await calculate_stock_momentum(
-                    symbol, current_date, price_data_history, indicator_data_history, momentum_method
-                )
-                all_candidates.append({
-                    "symbol": symbol,
-                    "momentum_score": momentum,
-                    "is_current_holding": False,
-                    "truevx_score": stock.get("truevx_score", 0)
-                })
-                logger.info(f"🔍 Momentum ({momentum_method}) for {symbol} (new): {momentum:.2f}")
-            else:
-                # Update truevx_score for existing holdings
-                for candidate in all_candidates:
-                    if candidate["symbol"] == symbol:
-                        candidate["truevx_score"] = stock.get("truevx_score", 0)
-                        break
-        
-        # Sort by momentum score (descending - highest momentum first)
-        all_candidates.sort(key=lambda x: x["momentum_score"], reverse=True)
+            logger.info(f"🔍 Momentum ({momentum_method}) for {symbol} ({'holding' if is_current_holding else 'new'}): {momentum:.2f}")
         
-        # Select top stocks up to max_holdings limit
-        selected_candidates = all_candidates[:max_holdings]
+        # Select top stocks up to max_holdings limit (highest momentum first)
+        selected_candidates = [all_candidates[i] for i in top_k_indices(momentum_scores, max_holdings)]
         selected_symbols = {candidate["symbol"] for candidate in selected_candidates}
         
-        # Determine added and removed stocks
-        current_symbols = set(current_holdings.keys())
+        # Determine added and removed stocks (current_holdings is a dict, O(1) membership)
         added_stocks = [candidate["symbol"] for candidate in selected_candidates 
-                       if candidate["symbol"] not in current_symbols]
-        removed_stocks = [symbol for symbol in current_symbols 
+                       if candidate["symbol"] not in current_holdings]
+        removed_stocks = [symbol for symbol in current_holdings 
                          if symbol not in selected_symbols]
         
         # Convert selected candidates back to qualified_stocks format
         selected_stocks = []
         for candidate in selected_candidates:
-            # Find the original stock data or create it
-            original_stock = None
-            for stock in qualified_stocks:
-                if stock["symbol"] == candidate["symbol"]:
-                    original_stock = stock
-                    break
+            # Original stock data when it qualified today, else rebuilt below
+            original_stock = qualified_by_symbol.get(candidate["symbol"])
             
             if original_stock:
                 selected_stocks.append(original_stock)
@@ -3468,116 +3638,86 @@ async def select_top_stocks_by_momentum(qualified_stocks: list, current_holdings
                      if stock["symbol"] not in current_holdings]
         return limited_stocks, new_stocks, []
 
-async def run_strategy_simulation_debug(data_manager, strategy, universe_symbols, params):
+async def run_strategy_simulation_debug(data_manager, stock_manager, strategy, universe_symbols, params):
     """Debug version of simulation with extensive logging"""
     try:
         logger.info(f"🔍 DEBUG: Starting simulation with {len(universe_symbols)} symbols")
-        indicators_coll = data_manager.db[data_manager.indicators_collection]
         
         # Parse date range
-        start_date = datetime.strptime(params.start_date, "%Y-%m-%d")
-        end_date = datetime.strptime(params.end_date, "%Y-%m-%d")
+        start_date = parse_simulation_date(params.start_date)
+        end_date = parse_simulation_date(params.end_date)
         
-        # Get indicator data (simplified for debug)
-        indicator_query = {
-            "indicator_type": "truevx",
-            "symbol": {"$in": universe_symbols},
-            "date": {"$gte": start_date, "$lte": end_date}
-        }
-        
-        indicator_data = {}
-        cursor = indicators_coll.find(indicator_query).sort("date", 1)
-        for doc in cursor:
-            date_str = doc["date"].strftime('%Y-%m-%d')
-            if date_str not in indicator_data:
-                indicator_data[date_str] = {}
-            
-            indicator_data[date_str][doc["symbol"]] = {
-                "symbol": doc["symbol"],
-                "truevx_score": doc["data"].get("truevx_score") or 0,
-                "mean_short": doc["data"].get("mean_short") or 0,
-                "mean_mid": doc["data"].get("mean_mid") or 0,
-                "mean_long": doc["data"].get("mean_long") or 0
-            }
-        
-        # Get price data
-        from stock_data_manager import StockDataManager
-        price_data = {}
-        
-        async with StockDataManager() as stock_manager:
-            for symbol in universe_symbols:
-                symbol_prices = await stock_manager.get_price_data(
-                    symbol=symbol,
-                    start_date=start_date,
-                    end_date=end_date,
-                    limit=10000,  # Increased limit for full date range
-                    sort_order=1
-                )
-                
-                for record in symbol_prices:
-                    date_str = record.date.strftime('%Y-%m-%d')
-                    if date_str not in price_data:
-                        price_data[date_str] = {}
-                    
-                    price_data[date_str][symbol] = {
-                        "symbol": symbol,
-                        "close_price": float(record.close_price),
-                    }
+        # Get indicator and price data concurrently (no benchmark for debug)
+        indicator_data, (price_data, _) = await asyncio.gather(
+            asyncio.to_thread(load_indicator_history, data_manager, universe_symbols, start_date, end_date),
+            load_price_history(stock_manager, universe_symbols, start_date, end_date)
+        )
         
         # Initialize simulation
         portfolio_value = params.portfolio_base_value
         current_holdings = {}
+        holding_records = {}  # Per-symbol holding dicts reused across rebalances
         debug_results = []
         
         # Get trading dates
         dates = sorted(set(indicator_data.keys()) & set(price_data.keys()))
         rebalance_dates = get_rebalance_dates(dates, params.rebalance_frequency, params.rebalance_date)
+        rebalance_flags = get_rebalance_flags(dates, rebalance_dates, params.rebalance_frequency)
+        strategy_rules = compile_strategy_rules(strategy["rules"])
+        indicator_columns = build_indicator_columns(indicator_data)
+        symbol_price_arrays = build_symbol_price_arrays(price_data)
+        indicator_momentum = (build_indicator_momentum(indicator_data)
+                              if params.momentum_ranking in INDICATOR_MOMENTUM_COLUMNS else None)
         
         logger.info(f"🧪 DEBUG: Processing {len(dates)} dates")
         logger.info(f"🧪 DEBUG: Rebalance dates: {list(rebalance_dates)}")
         
+        # Per-day trace goes to DEBUG with lazy formatting; loops that only log are
+        # skipped entirely unless DEBUG is enabled
+        debug_logging = logger.isEnabledFor(logging.DEBUG)
+        
         for i, date_str in enumerate(dates):
-            logger.info(f"\n📅 DEBUG DAY {i+1}: {date_str}")
+            logger.debug("\n📅 DEBUG DAY %d: %s", i + 1, date_str)
             
             day_indicators = indicator_data.get(date_str, {})
             day_prices = price_data.get(date_str, {})
             
-            logger.info(f"📊 Available indicators: {len(day_indicators)}, Available prices: {len(day_prices)}")
-            if day_indicators:
-                sample_symbol = list(day_indicators.keys())[0]
-                logger.info(f"📈 Sample indicator data for {sample_symbol}: {day_indicators[sample_symbol]}")
+            logger.debug("📊 Available indicators: %d, Available prices: %d", len(day_indicators), len(day_prices))
+            if debug_logging and day_indicators:
+                sample_symbol = next(iter(day_indicators))
+                logger.debug("📈 Sample indicator data for %s: %s", sample_symbol, day_indicators[sample_symbol])
             
             if not day_indicators or not day_prices:
-                logger.info(f"⚠️ No data for {date_str}, skipping")
+                logger.debug("⚠️ No data for %s, skipping", date_str)
                 continue
             
             # Log strategy rules for debugging
-            logger.info(f"📋 Strategy rules: {strategy['rules']}")
+            logger.debug("📋 Strategy rules: %s", strategy["rules"])
             
             # Apply strategy rules
-            qualified_stocks = apply_strategy_rules(day_indicators, strategy["rules"])
+            qualified_stocks = apply_strategy_rules(indicator_columns[date_str], strategy_rules)
             qualified_symbols = [stock["symbol"] for stock in qualified_stocks]
             
-            logger.info(f"🎯 Qualified stocks: {qualified_symbols} (from {len(day_indicators)} available)")
+            logger.debug("🎯 Qualified stocks: %s (from %d available)", qualified_symbols, len(day_indicators))
             
             # Check if rebalancing
-            should_rebalance = (params.rebalance_frequency == "dynamic" or 
-                              date_str in rebalance_dates or 
-                              i == 0)
+            should_rebalance = rebalance_flags[i]
             
-            logger.info(f"🔄 Should rebalance: {should_rebalance}")
+            logger.debug("🔄 Should rebalance: %s", should_rebalance)
             
             if should_rebalance:
                 current_portfolio_value = calculate_current_portfolio_value(current_holdings, day_prices)
-                logger.info(f"💰 Current portfolio value: ₹{current_portfolio_value:,.2f}")
+                logger.debug("💰 Current portfolio value: ₹%.2f", current_portfolio_value)
                 
                 # Log detailed holdings
-                logger.info(f"📊 Current holdings ({len(current_holdings)}):")
-                for symbol, holding in current_holdings.items():
-                    if symbol in day_prices:
-                        price = day_prices[symbol]["close_price"]
-                        value = holding["shares"] * price
-                        logger.info(f"  • {symbol}: {holding['shares']:.2f} @ ₹{price:.2f} = ₹{value:,.2f}")
+                if debug_logging:
+                    logger.debug("📊 Current holdings (%d):", len(current_holdings))
+                    for symbol, holding in current_holdings.items():
+                        symbol_prices = day_prices.get(symbol)
+                        if symbol_prices is not None:
+                            price = symbol_prices["close_price"]
+                            value = holding["shares"] * price
+                            logger.debug("  • %s: %.2f @ ₹%.2f = ₹%.2f", symbol, holding["shares"], price, value)
                 
                 # Simple rebalancing for debug (no momentum for clarity)
                 if i == 0:
@@ -3586,11 +3726,11 @@ async def run_strategy_simulation_debug(data_manager, strategy, universe_symbols
                     rebalance_value = current_portfolio_value
                 
                 # Apply momentum-based portfolio limit selection (same as actual simulation)
-                selected_stocks, momentum_added, momentum_removed = await select_top_stocks_by_momentum(
+                selected_stocks, momentum_added, momentum_removed = select_top_stocks_by_momentum(
                     qualified_stocks=qualified_stocks,
                     current_holdings=current_holdings,
-                    price_data_history=price_data,
-                    indicator_data_history=indicator_data,
+                    symbol_price_arrays=symbol_price_arrays,
+                    indicator_momentum=indicator_momentum,
                     current_date=date_str,
                     max_holdings=params.max_holdings,
                     momentum_method=params.momentum_ranking
@@ -3599,36 +3739,34 @@ async def run_strategy_simulation_debug(data_manager, strategy, universe_symbols
                 # Update symbols list to only selected stocks
                 selected_symbols = [stock["symbol"] for stock in selected_stocks]
                 
-                logger.info(f"💵 Rebalance value: ₹{rebalance_value:,.2f}")
-                logger.info(f"📊 Selected {len(selected_symbols)}/{len(qualified_symbols)} stocks by momentum")
+                logger.debug("💵 Rebalance value: ₹%.2f", rebalance_value)
+                logger.debug("📊 Selected %d/%d stocks by momentum", len(selected_symbols), len(qualified_symbols))
                 
-                # Clear holdings and rebuild
-                current_holdings = {}
+                # Clear holdings and rebuild (same dicts, refilled in place)
+                current_holdings.clear()
                 
                 # Equal weight allocation among selected momentum stocks
                 if selected_symbols:
                     allocation_per_stock = rebalance_value / len(selected_symbols)
-                    logger.info(f"📊 Allocation per stock: ₹{allocation_per_stock:,.2f}")
+                    logger.debug("📊 Allocation per stock: ₹%.2f", allocation_per_stock)
                     
                     for symbol in selected_symbols:
-                        if symbol in day_prices:
-                            price = day_prices[symbol]["close_price"]
+                        symbol_prices = day_prices.get(symbol)
+                        if symbol_prices is not None:
+                            price = symbol_prices["close_price"]
                             shares = allocation_per_stock / price
-                            current_holdings[symbol] = {
-                                "shares": shares,
-                                "avg_price": price
-                            }
-                            logger.info(f"  📈 Bought {symbol}: {shares:.2f} shares @ ₹{price:.2f}")
+                            assign_holding(current_holdings, holding_records, symbol, shares, price)
+                            logger.debug("  📈 Bought %s: %.2f shares @ ₹%.2f", symbol, shares, price)
                 
                 # Recalculate portfolio value
                 new_portfolio_value = calculate_current_portfolio_value(current_holdings, day_prices)
-                logger.info(f"✅ New portfolio value: ₹{new_portfolio_value:,.2f}")
+                logger.debug("✅ New portfolio value: ₹%.2f", new_portfolio_value)
                 portfolio_value = new_portfolio_value
             else:
                 # Just update portfolio value
                 if current_holdings:
                     portfolio_value = calculate_current_portfolio_value(current_holdings, day_prices)
-                    logger.info(f"📊 Updated portfolio value: ₹{portfolio_value:,.2f}")
+                    logger.debug("📊 Updated portfolio value: ₹%.2f", portfolio_value)
             
             # Create debug result
             debug_results.append({
@@ -3642,16 +3780,17 @@ async def run_strategy_simulation_debug(data_manager, strategy, universe_symbols
                     {
                         "symbol": symbol,
                         "shares": holding["shares"],
-                        "price": day_prices.get(symbol, {}).get("close_price", 0),
-                        "value": holding["shares"] * day_prices.get(symbol, {}).get("close_price", 0)
+                        "price": price,
+                        "value": holding["shares"] * price
                     }
                     for symbol, holding in current_holdings.items()
                     if symbol in day_prices
+                    for price in (day_prices[symbol]["close_price"],)  # Bind the close once
                 ]
             })
         
         return {
-            "params": params.dict(),
+            "params": params.model_dump(),
             "debug_results": debug_results,
             "summary": {
                 "total_days": len(debug_results),
@@ -3669,7 +3808,8 @@ async def rebalance_portfolio_with_charges(current_holdings: dict,
                                          day_prices: dict,
                                          available_capital: float,
                                          params,
-                                         holding_periods: dict = None) -> dict:
+                                         holding_periods: dict = None,
+                                         calculator: Optional[BrokerageCalculator] = None) -> dict:
     """
     Rebalance portfolio accounting for transaction charges
     
@@ -3679,16 +3819,19 @@ async def rebalance_portfolio_with_charges(current_holdings: dict,
         day_prices: Current day prices {symbol: {"close_price": float, ...}}
         available_capital: Available capital for rebalancing
         params: Simulation parameters including brokerage settings
+        calculator: BrokerageCalculator for params' exchange and rate, reused across
+            rebalances (built from params when omitted)
         
     Returns:
         Dictionary with new holdings, charges, and trade details
     """
     try:
-        # Initialize brokerage calculator
-        calculator = BrokerageCalculator(
-            default_exchange=params.exchange,
-            custom_brokerage_rate=params.custom_brokerage_rate
-        )
+        # Initialize brokerage calculator unless the simulation passed its own
+        if calculator is None:
+            calculator = BrokerageCalculator(
+                default_exchange=params.exchange,
+                custom_brokerage_rate=params.custom_brokerage_rate
+            )
         
         rebalance_result = {
             "new_holdings": {},
@@ -3702,18 +3845,20 @@ async def rebalance_portfolio_with_charges(current_holdings: dict,
         }
         
         # Phase 1: Calculate sell transactions and charges
-        sell_trades = []
         total_sell_proceeds = 0.0
         
-        for symbol, holding in current_holdings.items():
-            if symbol not in selected_symbols and symbol in day_prices:
-                # Create sell trade
-                sell_trade = {
-                    "symbol": symbol,
-                    "quantity": holding["shares"],
-                    "price": day_prices[symbol]["close_price"]
-                }
-                sell_trades.append(sell_trade)
+        # Holdings dropped from the basket, in holding order (set for O(1) membership;
+        # selected_symbols is a list). Sticky baskets leave this empty.
+        selected_set = set(selected_symbols)
+        sell_trades = [
+            {
+                "symbol": symbol,
+                "quantity": holding["shares"],
+                "price": day_prices[symbol]["close_price"]
+            }
+            for symbol, holding in current_holdings.items()
+            if symbol not in selected_set and symbol in day_prices
+        ]
         
         # Calculate sell charges if there are sell trades
         if sell_trades:
@@ -3743,15 +3888,18 @@ async def rebalance_portfolio_with_charges(current_holdings: dict,
                         total_value=total_available
                     )
                     
-                    # Estimate total buy charges for skewed allocation
+                    # Estimate total buy charges for skewed allocation (symbols with the same
+                    # holding period get identical allocations, so charge each amount once)
                     estimated_buy_charges = 0.0
+                    charges_by_allocation = {}
                     for symbol in valid_symbols:
                         allocation = skewed_allocations[symbol]
-                        estimated_charges = calculator.calculate_transaction_charges(
-                            trade_value=allocation,
-                            trade_type="BUY"
-                        )
-                        estimated_buy_charges += estimated_charges.total_charges
+                        if allocation not in charges_by_allocation:
+                            charges_by_allocation[allocation] = calculator.calculate_transaction_charges(
+                                trade_value=allocation,
+                                trade_type="BUY"
+                            ).total_charges
+                        estimated_buy_charges += charges_by_allocation[allocation]
                     
                     # Adjust allocations proportionally to account for charges
                     available_for_investment = max(0, total_available - estimated_buy_charges)
@@ -3760,8 +3908,9 @@ async def rebalance_portfolio_with_charges(current_holdings: dict,
                     # Create buy trades with skewed allocations
                     buy_trades = []
                     for symbol in valid_symbols:
-                        if symbol in day_prices:
-                            price = day_prices[symbol]["close_price"]
+                        symbol_prices = day_prices.get(symbol)
+                        if symbol_prices is not None:
+                            price = symbol_prices["close_price"]
                             adjusted_allocation = skewed_allocations[symbol] * adjustment_factor
                             shares_to_buy = adjusted_allocation / price if price > 0 else 0
                             
@@ -3779,33 +3928,34 @@ async def rebalance_portfolio_with_charges(current_holdings: dict,
                         # Initial allocation estimate (will be adjusted for charges)
                         initial_allocation_per_stock = total_available / len(valid_symbols)
                         
-                        # Estimate total buy charges
-                        estimated_buy_charges = 0.0
-                        for symbol in valid_symbols:
-                            estimated_charges = calculator.calculate_transaction_charges(
-                                trade_value=initial_allocation_per_stock,
-                                trade_type="BUY"
-                            )
-                            estimated_buy_charges += estimated_charges.total_charges
+                        # Estimate total buy charges (every stock gets the same allocation)
+                        estimated_charges = calculator.calculate_transaction_charges(
+                            trade_value=initial_allocation_per_stock,
+                            trade_type="BUY"
+                        )
+                        estimated_buy_charges = estimated_charges.total_charges * len(valid_symbols)
                         
                         # Adjust allocation to account for estimated charges
                         available_for_investment = max(0, total_available - estimated_buy_charges)
                         target_investment_per_stock = available_for_investment / len(valid_symbols) if valid_symbols else 0
                         
-                        # Create buy trades
-                        buy_trades = []
-                        for symbol in valid_symbols:
-                            if symbol in day_prices:
-                                price = day_prices[symbol]["close_price"]
-                                shares_to_buy = target_investment_per_stock / price if price > 0 else 0
-                            
-                            if shares_to_buy > 0:
-                                buy_trade = {
-                                    "symbol": symbol,
-                                    "quantity": shares_to_buy,
-                                    "price": price
-                                }
-                                buy_trades.append(buy_trade)
+                        # Create buy trades (every valid symbol has a price today)
+                        prices = np.fromiter(
+                            (day_prices[symbol]["close_price"] for symbol in valid_symbols),
+                            dtype=np.float64,
+                            count=len(valid_symbols)
+                        )
+                        with np.errstate(divide="ignore", invalid="ignore"):
+                            shares_to_buy = np.where(prices > 0, target_investment_per_stock / prices, 0.0)
+                        buy_trades = [
+                            {
+                                "symbol": symbol,
+                                "quantity": quantity,
+                                "price": price
+                            }
+                            for symbol, quantity, price in zip(valid_symbols, shares_to_buy.tolist(), prices.tolist())
+                            if quantity > 0
+                        ]
                     else:
                         # No valid symbols for allocation
                         logger.warning(f"⚠️  No valid symbols for charge-aware rebalancing")
@@ -3909,168 +4059,348 @@ def calculate_skewed_allocation(selected_symbols: list,
     if not selected_symbols:
         return {}
     
-    # Calculate weights based on holding periods
-    symbol_weights = {}
-    total_weight = 0
-    
-    for symbol in selected_symbols:
-        # Get holding period (0 for new stocks)
-        periods_held = holding_periods.get(symbol, 0)
-        
-        # Calculate weight using exponential function
-        # Formula: weight = 1 + (holding_periods * 0.3)
-        # This gives: 0 periods = weight 1.0, 1 period = weight 1.3, 2 periods = weight 1.6, etc.
-        weight = 1.0 + (periods_held * 0.3)
-        
-        symbol_weights[symbol] = weight
-        total_weight += weight
+    # Calculate weights based on holding periods (0 for new stocks)
+    # Formula: weight = 1 + (holding_periods * 0.3)
+    # This gives: 0 periods = weight 1.0, 1 period = weight 1.3, 2 periods = weight 1.6, etc.
+    periods_held = np.fromiter(
+        (holding_periods.get(symbol, 0) for symbol in selected_symbols),
+        dtype=np.float64,
+        count=len(selected_symbols)
+    )
+    weights = 1.0 + periods_held * 0.3
+    total_weight = weights.sum()
     
     # Calculate allocation amounts
-    allocations = {}
     if total_weight > 0:  # Check for division by zero
-        for symbol in selected_symbols:
-            weight_ratio = symbol_weights[symbol] / total_weight
-            allocation = total_value * weight_ratio
-            allocations[symbol] = allocation
+        allocation_amounts = total_value * (weights / total_weight)
     else:
         # If total_weight is 0, use equal allocation
-        if selected_symbols:
-            equal_allocation = total_value / len(selected_symbols)
-            for symbol in selected_symbols:
-                allocations[symbol] = equal_allocation
+        allocation_amounts = np.full(len(selected_symbols), total_value / len(selected_symbols))
+    allocations = dict(zip(selected_symbols, allocation_amounts.tolist()))
     
-    logger.info(f"📊 Skewed allocation calculated:")
-    for symbol in selected_symbols:
-        periods = holding_periods.get(symbol, 0)
-        weight = symbol_weights[symbol]
-        allocation = allocations[symbol]
-        logger.info(f"  📈 {symbol}: {periods} periods held, weight {weight:.1f}, allocation ₹{allocation:,.0f}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("📊 Skewed allocation calculated:")
+        for symbol, periods, weight, allocation in zip(selected_symbols, periods_held, weights, allocation_amounts):
+            logger.debug("  📈 %s: %d periods held, weight %.1f, allocation ₹%.0f", symbol, periods, weight, allocation)
     
     return allocations
 
-async def run_strategy_simulation(data_manager, strategy, universe_symbols, params):
-    """Execute the strategy simulation logic with daily rebalancing"""
+def resolve_benchmark_symbol(params):
+    """Benchmark symbol for a simulation: explicit override, else the universe's index"""
+    return params.benchmark_symbol or UNIVERSE_BENCHMARK.get(params.universe, DEFAULT_BENCHMARK_SYMBOL)
+
+def load_indicator_history(data_manager, universe_symbols, start_date: datetime, end_date: datetime) -> dict:
+    """
+    TrueValueX indicator values by date for the universe: {date_str: {symbol: values}}
+    
+    Uses the synchronous driver, so async callers run it in a worker thread.
+    """
+    indicators_coll = data_manager.db[data_manager.indicators_collection]
+    
+    # Get all indicator data for the universe and date range
+    indicator_query = {
+        "indicator_type": "truevx",
+        "symbol": {"$in": universe_symbols},
+        "date": {
+            "$gte": start_date,
+            "$lte": end_date
+        }
+    }
+    
+    # Process indicator data by date (only the fields the simulation reads)
+    indicator_data = defaultdict(dict)
+    cursor = indicators_coll.find(indicator_query, INDICATOR_SIMULATION_PROJECTION).sort("date", 1).batch_size(5000)
+    for doc in cursor:
+        date_str = simulation_date_key(doc["date"])
+        data = doc.get("data", {})
+        indicator_data[date_str][doc["symbol"]] = {
+            "symbol": doc["symbol"],
+            "truevx_score": data.get("truevx_score") or 0,
+            "mean_short": data.get("mean_short") or 0,
+            "mean_mid": data.get("mean_mid") or 0,
+            "mean_long": data.get("mean_long") or 0
+        }
+    
+    # Plain dict for callers, so lookups of missing dates cannot insert them
+    return dict(indicator_data)
+
+async def load_price_history(stock_manager: StockDataManager, universe_symbols, start_date: datetime,
+                             end_date: datetime, benchmark_symbol: Optional[str] = None) -> tuple:
+    """
+    Universe prices by date plus the benchmark's closes: (price_data, benchmark_prices)
+    
+    stock_manager: the shared StockDataManager (see get_stock_mgr)
+    price_data is {date_str: {symbol: prices}}, benchmark_prices {date_str: close}
+    (empty when no benchmark_symbol is given).
+    """
+    price_data = defaultdict(dict)
+    benchmark_prices = {}
+    universe_symbol_set = set(universe_symbols)
+    requested_symbols = list(dict.fromkeys([*universe_symbols, benchmark_symbol] if benchmark_symbol else universe_symbols))
+    
+    logger.info(f"🔄 Loading price data for {len(universe_symbols)} symbols" + (f" and benchmark {benchmark_symbol}" if benchmark_symbol else ""))
+    
+    # Universe and benchmark prices streamed from one bulk query per partition,
+    # each record filed as it arrives (no intermediate per-symbol lists)
+    async for record in stock_manager.iter_price_data_bulk(requested_symbols, start_date, end_date):
+        symbol = record.symbol
+        date_str = simulation_date_key(record.date)
+        
+        if symbol == benchmark_symbol:
+            benchmark_prices[date_str] = float(record.close_price)
+        if symbol not in universe_symbol_set:
+            continue
+        
+        price_data[date_str][symbol] = {
+            "symbol": symbol,
+            "close_price": float(record.close_price),
+            "open_price": float(record.open_price),
+            "high_price": float(record.high_price),
+            "low_price": float(record.low_price),
+            "volume": int(record.volume) if record.volume else 0
+        }
+    
+    logger.info(f"📊 Loaded price data for {len(price_data)} trading dates")
+    logger.info(f"📈 Loaded benchmark data for {len(benchmark_prices)} trading dates")
+    
+    # Plain dict for callers, so lookups of missing dates cannot insert them
+    return dict(price_data), benchmark_prices
+
+async def load_simulation_data(data_manager, stock_manager, universe_symbols, start_date: datetime, end_date: datetime,
+                               benchmark_symbol: str):
+    """
+    Load indicator, price and benchmark data for a simulation date range.
+    
+    Multi-run endpoints load the widest range once and hand the result to each
+    run_strategy_simulation call, which slices it to its own period.
+    """
+    # Indicators (sync driver, in a thread) and prices (async driver) load concurrently
+    indicator_data, (price_data, benchmark_prices) = await asyncio.gather(
+        asyncio.to_thread(load_indicator_history, data_manager, universe_symbols, start_date, end_date),
+        load_price_history(stock_manager, universe_symbols, start_date, end_date, benchmark_symbol)
+    )
+    
+    return {
+        "indicator_data": indicator_data,
+        "price_data": price_data,
+        "benchmark_prices": benchmark_prices,
+        # Per-symbol close arrays for momentum ranking, shared by every run over this data
+        "symbol_price_arrays": build_symbol_price_arrays(price_data)
+    }
+
+def slice_simulation_data(simulation_data, start_date_str: str, end_date_str: str):
+    """Restrict preloaded simulation data to [start_date_str, end_date_str] (ISO date keys)"""
+    sliced = {
+        key: {date_str: value for date_str, value in series.items() if start_date_str <= date_str <= end_date_str}
+        for key, series in simulation_data.items()
+        if key != "symbol_price_arrays"
+    }
+    if "symbol_price_arrays" in simulation_data:
+        sliced["symbol_price_arrays"] = slice_symbol_price_arrays(
+            simulation_data["symbol_price_arrays"], start_date_str, end_date_str
+        )
+    return sliced
+
+# Process pool for CPU-bound simulations over preloaded data (multi-run endpoints)
+SIMULATION_WORKERS = int(os.getenv("SIMULATION_WORKERS", os.cpu_count() or 1))
+# Periods of one multi-run request in flight at once (each holds its sliced data copy)
+MAX_PARALLEL_PERIODS = int(os.getenv("MAX_PARALLEL_PERIODS", "3"))
+_simulation_executor = None
+
+def get_simulation_executor() -> ProcessPoolExecutor:
+    global _simulation_executor
+    if _simulation_executor is None:
+        _simulation_executor = ProcessPoolExecutor(max_workers=SIMULATION_WORKERS)
+    return _simulation_executor
+
+@contextmanager
+def shared_simulation_data(simulation_data):
+    """
+    Move the per-symbol price arrays into one shared memory block for pool workers
+    
+    Yields (worker_data, price_arrays_manifest): worker_data is simulation_data
+    without the arrays, the manifest lets a worker map them back zero-copy
+    (see attach_symbol_price_arrays). The block is released on exit.
+    """
+    symbol_price_arrays = simulation_data["symbol_price_arrays"]
+    total = sum(len(closes_np) for _, closes_np in symbol_price_arrays.values())
+    
+    # Layout: [dates as datetime64[D] | closes as float64], 8 bytes per element each
+    shm = shared_memory.SharedMemory(create=True, size=max(total, 1) * 16)
+    try:
+        dates_buf = np.ndarray((total,), dtype="datetime64[D]", buffer=shm.buf)
+        closes_buf = np.ndarray((total,), dtype=np.float64, buffer=shm.buf, offset=total * 8)
+        offsets = {}
+        pos = 0
+        for symbol, (dates_np, closes_np) in symbol_price_arrays.items():
+            end = pos + len(closes_np)
+            dates_buf[pos:end] = dates_np
+            closes_buf[pos:end] = closes_np
+            offsets[symbol] = (pos, end)
+            pos = end
+        del dates_buf, closes_buf  # Drop buffer exports so the block can be closed
+        
+        worker_data = {key: value for key, value in simulation_data.items() if key != "symbol_price_arrays"}
+        yield worker_data, {"name": shm.name, "total": total, "offsets": offsets}
+    finally:
+        shm.close()
+        shm.unlink()
+
+def attach_symbol_price_arrays(manifest):
+    """Map shared price arrays (see shared_simulation_data) as views; returns (shm, arrays)"""
+    try:
+        shm = shared_memory.SharedMemory(name=manifest["name"], track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=manifest["name"])
+    total = manifest["total"]
+    dates_buf = np.ndarray((total,), dtype="datetime64[D]", buffer=shm.buf)
+    closes_buf = np.ndarray((total,), dtype=np.float64, buffer=shm.buf, offset=total * 8)
+    symbol_price_arrays = {
+        symbol: (dates_buf[start:end], closes_buf[start:end])
+        for symbol, (start, end) in manifest["offsets"].items()
+    }
+    return shm, symbol_price_arrays
+
+# Momentum scores memoized per worker process for the dataset it last simulated;
+# holding-size runs over the same shared data and date range reuse each other's scores
+_worker_momentum_cache = {"scope": None, "scores": {}}
+
+def get_worker_momentum_cache(scope: tuple) -> dict:
+    """Momentum memo for scope, dropping the previous dataset's scores when it changes"""
+    if _worker_momentum_cache["scope"] != scope:
+        _worker_momentum_cache["scope"] = scope
+        _worker_momentum_cache["scores"] = {}
+    return _worker_momentum_cache["scores"]
+
+def run_strategy_simulation_worker(strategy, universe_symbols, params, simulation_data, price_arrays_manifest=None):
+    """Process-pool entry point: run one simulation over preloaded data (no DB access)"""
+    if price_arrays_manifest is None:
+        return asyncio.run(run_strategy_simulation(None, strategy, universe_symbols, params, simulation_data=simulation_data))
+    
+    # Scores depend on the sliced data, so the memo is only shared within one block and date range
+    momentum_cache = get_worker_momentum_cache(
+        (price_arrays_manifest["name"], params.start_date, params.end_date)
+    )
+    shm, symbol_price_arrays = attach_symbol_price_arrays(price_arrays_manifest)
+    try:
+        simulation_data = {**simulation_data, "symbol_price_arrays": symbol_price_arrays}
+        return asyncio.run(run_strategy_simulation(None, strategy, universe_symbols, params,
+                                                   simulation_data=simulation_data, momentum_cache=momentum_cache))
+    finally:
+        simulation_data = symbol_price_arrays = None
+        try:
+            shm.close()
+        except BufferError:
+            pass  # A view is still referenced; the mapping goes away with it
+
+async def run_strategy_simulation(data_manager, strategy, universe_symbols, params, simulation_data=None,
+                                  momentum_cache: Optional[dict] = None,
+                                  stock_manager: Optional[StockDataManager] = None):
+    """
+    Execute the strategy simulation logic with daily rebalancing
+    
+    simulation_data: optional preloaded output of load_simulation_data covering at
+    least params.start_date..params.end_date (shared by multi-run endpoints)
+    momentum_cache: optional momentum memo shared with other runs over the same data
+    stock_manager: shared StockDataManager, needed when simulation_data is not given
+    """
     try:
-        # Initialize cumulative charges at the start of each simulation
-        # This fixes the bug where charges were persisting across API calls
-        run_strategy_simulation.cumulative_charges = 0.0
+        # Cumulative charges are local to each run, so they cannot persist across API calls
+        # (or leak between concurrent runs) and are read without attribute lookups per day
+        cumulative_charges = 0.0
         
         logger.info(f"🔍 Starting simulation with {len(universe_symbols)} symbols")
-        indicators_coll = data_manager.db[data_manager.indicators_collection]
         
         # Parse date range
-        start_date = datetime.strptime(params.start_date, "%Y-%m-%d")
-        end_date = datetime.strptime(params.end_date, "%Y-%m-%d")
+        start_date = parse_simulation_date(params.start_date)
+        end_date = parse_simulation_date(params.end_date)
         
-        # Get all indicator data for the universe and date range
-        indicator_query = {
-            "indicator_type": "truevx",
-            "symbol": {"$in": universe_symbols},
-            "date": {
-                "$gte": start_date,
-                "$lte": end_date
-            }
-        }
+        benchmark_symbol = resolve_benchmark_symbol(params)
         
-        # Process indicator data by date
-        indicator_data = {}
-        cursor = indicators_coll.find(indicator_query).sort("date", 1)
-        for doc in cursor:
-            date_str = doc["date"].strftime('%Y-%m-%d')
-            if date_str not in indicator_data:
-                indicator_data[date_str] = {}
-            
-            indicator_data[date_str][doc["symbol"]] = {
-                "symbol": doc["symbol"],
-                "truevx_score": doc["data"].get("truevx_score") or 0,
-                "mean_short": doc["data"].get("mean_short") or 0,
-                "mean_mid": doc["data"].get("mean_mid") or 0,
-                "mean_long": doc["data"].get("mean_long") or 0
-            }
+        if simulation_data is None:
+            simulation_data = await load_simulation_data(data_manager, stock_manager, universe_symbols, start_date, end_date,
+                                                         benchmark_symbol)
+        else:
+            simulation_data = slice_simulation_data(simulation_data, params.start_date, params.end_date)
         
-        # Process price data by date using StockDataManager
-        from stock_data_manager import StockDataManager
-        price_data = {}
+        indicator_data = simulation_data["indicator_data"]
+        price_data = simulation_data["price_data"]
+        benchmark_prices = simulation_data["benchmark_prices"]
         
-        logger.info(f"🔄 Loading price data for {len(universe_symbols)} symbols")
+        # Decode the stored rules once instead of re-reading rule dicts every day,
+        # and evaluate them on per-day indicator matrices rather than per stock
+        strategy_rules = compile_strategy_rules(strategy["rules"])
         
-        async with StockDataManager() as stock_manager:
-            for symbol in universe_symbols:
-                symbol_prices = await stock_manager.get_price_data(
-                    symbol=symbol,
-                    start_date=start_date,
-                    end_date=end_date,
-                    limit=10000,  # Get sufficient data for the date range
-                    sort_order=1   # Ascending order (oldest first)
-                )
-                
-                logger.info(f"📈 Got {len(symbol_prices)} price records for {symbol}")
-                
-                for record in symbol_prices:
-                    date_str = record.date.strftime('%Y-%m-%d')
-                    if date_str not in price_data:
-                        price_data[date_str] = {}
-                    
-                    price_data[date_str][symbol] = {
-                        "symbol": symbol,
-                        "close_price": float(record.close_price),
-                        "open_price": float(record.open_price),
-                        "high_price": float(record.high_price),
-                        "low_price": float(record.low_price),
-                        "volume": int(record.volume) if record.volume else 0
-                    }
+        # Contiguous per-symbol close arrays for momentum ranking (built at load time)
+        symbol_price_arrays = simulation_data["symbol_price_arrays"]
         
-        logger.info(f"📊 Loaded price data for {len(price_data)} trading dates")
+        # Indicator rate-of-change table, only needed for indicator-based momentum ranking
+        indicator_momentum = (build_indicator_momentum(indicator_data)
+                              if params.momentum_ranking in INDICATOR_MOMENTUM_COLUMNS else None)
         
         # Initialize simulation state
         portfolio_value = params.portfolio_base_value
         current_holdings = {}  # {symbol: {"shares": float, "avg_price": float}}
+        holding_records = {}  # Per-symbol holding dicts reused across rebalances (see assign_holding)
         cash_balance = params.portfolio_base_value  # Track cash separately
         simulation_results = []
         prev_portfolio_value = portfolio_value
         
+        # Brokerage settings are fixed for the run, so one calculator serves every rebalance
+        brokerage_calculator = BrokerageCalculator(
+            default_exchange=params.exchange,
+            custom_brokerage_rate=params.custom_brokerage_rate
+        ) if params.include_brokerage else None
+        
         # Initialize holding period tracking for skewed allocation
         holding_periods = {}  # {symbol: consecutive_rebalance_periods}
         rebalance_count = 0  # Track number of rebalances for logging
         
         # Initialize benchmark tracking
         benchmark_value = params.portfolio_base_value  # Start with same base value
-        prev_benchmark_close = None
-        
-        # Get benchmark data for comparison
-        if params.benchmark_symbol:
-            benchmark_symbol = params.benchmark_symbol
-        elif params.universe == "NIFTY50":
-            benchmark_symbol = "Nifty 50"
-        elif params.universe == "NIFTY100":
-            benchmark_symbol = "Nifty 100"  # Assuming this exists
-        elif params.universe == "NIFTY500":
-            benchmark_symbol = "Nifty 500"
-        else:
-            benchmark_symbol = "Nifty 50"  # Default fallback
-            
-        benchmark_prices = {}
-        
-        logger.info(f"📊 Loading benchmark data for {benchmark_symbol}")
-        
-        async with StockDataManager() as stock_manager:
-            benchmark_data = await stock_manager.get_price_data(
-                symbol=benchmark_symbol,
-                start_date=start_date,
-                end_date=end_date,
-                limit=10000,
-                sort_order=1
-            )
-            
-            for record in benchmark_data:
-                date_str = record.date.strftime('%Y-%m-%d')
-                benchmark_prices[date_str] = float(record.close_price)
-        
-        logger.info(f"📈 Loaded benchmark data for {len(benchmark_prices)} trading dates")
         
         # Get all trading dates where we have both indicator and price data
         dates = sorted(set(indicator_data.keys()) & set(price_data.keys()))
         rebalance_dates = get_rebalance_dates(dates, params.rebalance_frequency, params.rebalance_date)
+        rebalance_flags = get_rebalance_flags(dates, rebalance_dates, params.rebalance_frequency)
+        # Reason logged for every rebalance after the first; the frequency is fixed for the run
+        later_rebalance_reason = "Dynamic" if params.rebalance_frequency == "dynamic" else "Scheduled"
+        # Per-holding rebalance log lines are only formatted (and the rebalance log only
+        # emitted) when INFO is actually enabled
+        info_logging = logger.isEnabledFor(logging.INFO)
+        
+        # Run-constant settings read once here rather than from params on every day
+        include_brokerage = params.include_brokerage
+        portfolio_base_value = params.portfolio_base_value
+        exchange_used = params.exchange if include_brokerage else None
+        # Skewed portfolios list holdings by allocation weight, equal weight by market value
+        holdings_sort_key = operator.itemgetter("allocation_weight" if params.rebalance_type == "skewed" else "market_value")
+        
+        # Qualified stocks only feed rebalances, so rule matrices are built for those days alone
+        indicator_columns = build_indicator_columns({
+            date_str: indicator_data[date_str]
+            for date_str, rebalance_flag in zip(dates, rebalance_flags) if rebalance_flag
+        })
+        
+        # Benchmark value on every processed day with a benchmark close: the base value
+        # compounded by each day's close-to-close return, accumulated in day order
+        benchmark_dates = [
+            date_str for date_str in dates
+            if benchmark_prices.get(date_str) is not None and indicator_data[date_str] and price_data[date_str]
+        ]
+        benchmark_closes = np.fromiter(
+            (benchmark_prices[date_str] for date_str in benchmark_dates),
+            dtype=np.float64, count=len(benchmark_dates)
+        )
+        benchmark_growth = 1 + (benchmark_closes[1:] / benchmark_closes[:-1] - 1)
+        benchmark_by_date = dict(zip(
+            benchmark_dates,
+            np.cumprod(np.concatenate(([params.portfolio_base_value], benchmark_growth))).tolist()
+        ))
+        
+        # Daily portfolio values filled in as days are processed, for the drawdown and return statistics
+        portfolio_values = np.empty(len(dates), dtype=np.float64)
+        processed_days = 0
         
         logger.info(f"📅 Processing {len(dates)} trading days: {dates[:5]}...{dates[-5:] if len(dates) > 5 else ''}")
         logger.info(f"📊 Sample price data for first date: {list(price_data.get(dates[0], {}).keys())[:3] if dates else 'No dates'}")
@@ -4083,106 +4413,106 @@ async def run_strategy_simulation(data_manager, strategy, universe_symbols, para
             if not day_indicators or not day_prices:
                 continue
             
-            # Apply strategy rules to filter qualified stocks
-            qualified_stocks = apply_strategy_rules(day_indicators, strategy["rules"])
-            qualified_symbols = [stock["symbol"] for stock in qualified_stocks]
-            
             # Track additions and exits
             new_added = []
             exited = []
             exited_details = []  # Initialize detailed exit tracking
             
-            # Rebalance portfolio if needed (dynamic = daily, else use schedule)
-            should_rebalance = (params.rebalance_frequency == "dynamic" or 
-                              date_str in rebalance_dates or 
-                              i == 0)  # Always rebalance on first day
+            # Rebalance portfolio if needed (dynamic = daily, else use schedule, always on first day)
+            should_rebalance = rebalance_flags[i]
             
             if should_rebalance:
-                rebalance_reason = "First day" if i == 0 else ("Dynamic" if params.rebalance_frequency == "dynamic" else "Scheduled")
-                logger.info(f"📅 {rebalance_reason} rebalancing triggered on {date_str}")
-            
-            if should_rebalance :
+                # Rebalance log lines, emitted together once the rebalance is done
+                rebalance_log = []
+                rebalance_reason = "First day" if i == 0 else later_rebalance_reason
+                rebalance_log.append(f"📅 {rebalance_reason} rebalancing triggered on {date_str}")
+                
+                # Apply strategy rules to filter qualified stocks
+                qualified_stocks = apply_strategy_rules(indicator_columns[date_str], strategy_rules)
+                
                 # Calculate current portfolio value before rebalancing
                 current_portfolio_value = calculate_current_portfolio_value(current_holdings, day_prices, cash_balance)
-                prev_holdings = current_holdings.copy()
 
                 # Use current portfolio value (preserve capital) or base value on first day
                 if i == 0:  # First day
-                    rebalance_value = params.portfolio_base_value
+                    rebalance_value = portfolio_base_value
                 else:
                     # Use current portfolio value to preserve capital - don't amplify
                     rebalance_value = current_portfolio_value
                     # Safety floor to prevent portfolio from going to zero
-                    rebalance_value = max(rebalance_value, params.portfolio_base_value * 0.01)
+                    rebalance_value = max(rebalance_value, portfolio_base_value * 0.01)
                 
-                logger.info(f"🔄 Rebalancing on {date_str}: Current Value = ₹{current_portfolio_value:,.2f}, Rebalance Value = ₹{rebalance_value:,.2f}")
+                rebalance_log.append(f"🔄 Rebalancing on {date_str}: Current Value = ₹{current_portfolio_value:,.2f}, Rebalance Value = ₹{rebalance_value:,.2f}")
                 
                 # Log portfolio before rebalancing
-                logger.info(f"📊 BEFORE Rebalancing: {len(current_holdings)} holdings worth ₹{current_portfolio_value:,.2f}")
-                for symbol, holding in current_holdings.items():
-                    if symbol in day_prices:
-                        current_price = day_prices[symbol]["close_price"]
-                        market_value = holding["shares"] * current_price
-                        logger.info(f"  📈 {symbol}: {holding['shares']:.2f} shares @ ₹{current_price:.2f} = ₹{market_value:,.2f}")
+                rebalance_log.append(f"📊 BEFORE Rebalancing: {len(current_holdings)} holdings worth ₹{current_portfolio_value:,.2f}")
+                if info_logging:
+                    for symbol, holding in current_holdings.items():
+                        symbol_prices = day_prices.get(symbol)
+                        if symbol_prices is not None:
+                            current_price = symbol_prices["close_price"]
+                            market_value = holding["shares"] * current_price
+                            rebalance_log.append(f"  📈 {symbol}: {holding['shares']:.2f} shares @ ₹{current_price:.2f} = ₹{market_value:,.2f}")
                 
                 # Apply momentum-based portfolio limit selection
-                selected_stocks, momentum_added, momentum_removed = await select_top_stocks_by_momentum(
+                selected_stocks, momentum_added, momentum_removed = select_top_stocks_by_momentum(
                     qualified_stocks=qualified_stocks,
                     current_holdings=current_holdings,
-                    price_data_history=price_data,
-                    indicator_data_history=indicator_data,
+                    symbol_price_arrays=symbol_price_arrays,
+                    indicator_momentum=indicator_momentum,
                     current_date=date_str,
                     max_holdings=params.max_holdings,
-                    momentum_method=params.momentum_ranking
+                    momentum_method=params.momentum_ranking,
+                    momentum_cache=momentum_cache
                 )
                 
                 # Update symbols list to only selected stocks
                 selected_symbols = [stock["symbol"] for stock in selected_stocks]
                 
+                # Holdings are only restored when nothing was selected, so only then
+                # snapshot them before the exits below delete entries
+                prev_holdings = current_holdings.copy() if not selected_symbols else None
+                
                 # Track additions and exits based on momentum selection
                 new_added = momentum_added
                 # Start with momentum-based exits (just symbol names)
                 exited_symbols = list(momentum_removed) if momentum_removed else []
                 
-                # Calculate exit details for ALL stocks that will be removed BEFORE deleting them
-                for symbol in list(current_holdings.keys()):
-                    if symbol not in selected_symbols:
-                        # Calculate exit performance before deleting
-                        holding = current_holdings[symbol]
-                        if symbol in day_prices:
-                            current_price = day_prices[symbol]["close_price"]
-                            exit_pnl = (current_price - holding["avg_price"]) * holding["shares"]
-                            exit_pnl_percent = ((current_price / holding["avg_price"]) - 1) * 100 if holding["avg_price"] > 0 else 0
-                            
-                            exit_details = {
-                                "symbol": symbol,
-                                "company_name": symbol,  # TODO: Get from company mapping
-                                "quantity": holding["shares"],
-                                "avg_price": holding["avg_price"],
-                                "exit_price": current_price,
-                                "pnl": exit_pnl,
-                                "pnl_percent": exit_pnl_percent,
-                                "sector": "Unknown"  # TODO: Get from mapping
-                            }
-                            exited_details.append(exit_details)
-                            logger.info(f"📤 Exit details calculated for {symbol}: {exit_pnl_percent:.2f}% P&L")
+                # Exit every holding that was not selected in one pass: drop the holding,
+                # record exit performance and credit the sale proceeds (in holding order)
+                selected_set = set(selected_symbols)
+                exited_set = set(exited_symbols)
+                for symbol in [symbol for symbol in current_holdings if symbol not in selected_set]:
+                    holding = current_holdings.pop(symbol)
+                    symbol_prices = day_prices.get(symbol)
+                    if symbol_prices is not None:
+                        current_price = symbol_prices["close_price"]
+                        exit_pnl = (current_price - holding["avg_price"]) * holding["shares"]
+                        exit_pnl_percent = ((current_price / holding["avg_price"]) - 1) * 100 if holding["avg_price"] > 0 else 0
                         
-                        # Add to exit symbols list if not already there
-                        if symbol not in exited_symbols:
-                            exited_symbols.append(symbol)
-                
-                # Now remove the holdings and add cash from sales
-                for symbol in list(current_holdings.keys()):
-                    if symbol not in selected_symbols:
-                        # Calculate sale proceeds before deleting holding
-                        if symbol in day_prices:
-                            holding = current_holdings[symbol]
-                            sale_price = day_prices[symbol]["close_price"]
-                            sale_proceeds = holding["shares"] * sale_price
-                            cash_balance += sale_proceeds
-                            logger.info(f"💰 Sold {symbol}: {holding['shares']:.2f} shares @ ₹{sale_price:.2f} = ₹{sale_proceeds:,.2f}")
+                        exit_details = {
+                            "symbol": symbol,
+                            "company_name": symbol,  # TODO: Get from company mapping
+                            "quantity": holding["shares"],
+                            "avg_price": holding["avg_price"],
+                            "exit_price": current_price,
+                            "pnl": exit_pnl,
+                            "pnl_percent": exit_pnl_percent,
+                            "sector": "Unknown"  # TODO: Get from mapping
+                        }
+                        exited_details.append(exit_details)
+                        if info_logging:
+                            rebalance_log.append(f"📤 Exit details calculated for {symbol}: {exit_pnl_percent:.2f}% P&L")
                         
-                        del current_holdings[symbol]
+                        sale_proceeds = holding["shares"] * current_price
+                        cash_balance += sale_proceeds
+                        if info_logging:
+                            rebalance_log.append(f"💰 Sold {symbol}: {holding['shares']:.2f} shares @ ₹{current_price:.2f} = ₹{sale_proceeds:,.2f}")
+                    
+                    # Add to exit symbols list if not already there
+                    if symbol not in exited_set:
+                        exited_set.add(symbol)
+                        exited_symbols.append(symbol)
                 
                 # Set the final exited list
                 exited = exited_symbols
@@ -4192,9 +4522,9 @@ async def run_strategy_simulation(data_manager, strategy, universe_symbols, para
                 rebalance_trade_details = []
                 
                 # Choose rebalancing method based on brokerage settings
-                if params.include_brokerage:
+                if include_brokerage:
                     # Use charge-aware rebalancing
-                    logger.info(f"💰 Using charge-aware rebalancing with {params.exchange} exchange")
+                    rebalance_log.append(f"💰 Using charge-aware rebalancing with {params.exchange} exchange")
                     
                     rebalance_result = await rebalance_portfolio_with_charges(
                         current_holdings=current_holdings,
@@ -4202,7 +4532,8 @@ async def run_strategy_simulation(data_manager, strategy, universe_symbols, para
                         day_prices=day_prices,
                         available_capital=rebalance_value,
                         params=params,
-                        holding_periods=holding_periods
+                        holding_periods=holding_periods,
+                        calculator=brokerage_calculator
                     )
                     
                     # Update holdings with charge tracking
@@ -4212,50 +4543,37 @@ async def run_strategy_simulation(data_manager, strategy, universe_symbols, para
                     daily_charges = rebalance_result["charge_breakdown"]
                     rebalance_trade_details = rebalance_result["trade_details"]
                     
-                    # Adjust portfolio value for charges (charges are already deducted in rebalance logic)
-                    new_portfolio_value = calculate_current_portfolio_value(current_holdings, day_prices, 0)
+                    # Charges are already deducted in rebalance logic; the new value is priced below
                     cash_balance = rebalance_result["remaining_cash"]  # Update cash balance from rebalancing
-                    new_portfolio_value += cash_balance
                     
-                    logger.info(f"💰 Rebalancing with charges: Total charges = ₹{daily_charges['total_charges']:,.2f}")
-                    logger.info(f"📊 Buy charges: ₹{daily_charges['buy_charges']:,.2f}, Sell charges: ₹{daily_charges['sell_charges']:,.2f}")
-                    logger.info(f"🏦 Remaining cash: ₹{rebalance_result['remaining_cash']:,.2f}")
+                    rebalance_log.append(f"💰 Rebalancing with charges: Total charges = ₹{daily_charges['total_charges']:,.2f}")
+                    rebalance_log.append(f"📊 Buy charges: ₹{daily_charges['buy_charges']:,.2f}, Sell charges: ₹{daily_charges['sell_charges']:,.2f}")
+                    rebalance_log.append(f"🏦 Remaining cash: ₹{rebalance_result['remaining_cash']:,.2f}")
                     
                 else:
                     # Rebalancing without brokerage charges
                     if selected_symbols:
                         if params.rebalance_type == "skewed":
                             # Skewed allocation based on holding periods
-                            logger.info(f"📊 Using skewed allocation based on holding periods")
+                            rebalance_log.append(f"📊 Using skewed allocation based on holding periods")
                             skewed_allocations = calculate_skewed_allocation(
                                 selected_symbols=selected_symbols,
                                 holding_periods=holding_periods,
                                 total_value=cash_balance  # Use available cash
                             )
                             
-                            # Clear current holdings for fresh allocation
-                            current_holdings = {}
-                            total_invested = 0
-                            
-                            # Apply skewed allocations
-                            for symbol in selected_symbols:
-                                if symbol in day_prices:
-                                    allocation_amount = skewed_allocations[symbol]
-                                    price = day_prices[symbol]["close_price"]
-                                    target_shares = allocation_amount / price
-                                    investment_amount = target_shares * price
-                                    
-                                    current_holdings[symbol] = {
-                                        "shares": target_shares,
-                                        "avg_price": price
-                                    }
-                                    
-                                    total_invested += investment_amount
-                                    logger.info(f"📈 Skewed buy {symbol}: {target_shares:.2f} shares @ ₹{price:.2f} = ₹{investment_amount:,.2f}")
+                            # Apply skewed allocations (current holdings are refilled in place)
+                            bought, total_invested = buy_allocations_at_close(
+                                current_holdings, holding_records, selected_symbols,
+                                [skewed_allocations[symbol] for symbol in selected_symbols], day_prices
+                            )
+                            if info_logging:
+                                for symbol, target_shares, price, investment_amount in bought:
+                                    rebalance_log.append(f"📈 Skewed buy {symbol}: {target_shares:.2f} shares @ ₹{price:.2f} = ₹{investment_amount:,.2f}")
                             
                             # Update cash balance after purchases
                             cash_balance -= total_invested
-                            logger.info(f"💵 Cash remaining after skewed allocation: ₹{cash_balance:,.2f}")
+                            rebalance_log.append(f"💵 Cash remaining after skewed allocation: ₹{cash_balance:,.2f}")
                                     
                         else:
                             # Original equal weight allocation
@@ -4264,76 +4582,79 @@ async def run_strategy_simulation(data_manager, strategy, universe_symbols, para
                                 available_cash = cash_balance
                                 target_value_per_stock = available_cash / len(selected_symbols)
                                 
-                                logger.info(f"💰 Equal allocation (no charges): ₹{target_value_per_stock:,.2f} per stock across {len(selected_symbols)} stocks")
-                                logger.info(f"💵 Available cash for investment: ₹{available_cash:,.2f}")
-                                
-                                # Clear current holdings for fresh allocation
-                                current_holdings = {}
-                                total_invested = 0
+                                rebalance_log.append(f"💰 Equal allocation (no charges): ₹{target_value_per_stock:,.2f} per stock across {len(selected_symbols)} stocks")
+                                rebalance_log.append(f"💵 Available cash for investment: ₹{available_cash:,.2f}")
                                 
-                                # Rebalance all holdings to equal weights
-                                for symbol in selected_symbols:
-                                    if symbol in day_prices:
-                                        price = day_prices[symbol]["close_price"]
-                                        target_shares = target_value_per_stock / price
-                                        investment_amount = target_shares * price
-                                        
-                                        current_holdings[symbol] = {
-                                            "shares": target_shares,
-                                            "avg_price": price
-                                        }
-                                        
-                                        total_invested += investment_amount
-                                        logger.info(f"📈 Bought {symbol}: {target_shares:.2f} shares @ ₹{price:.2f} = ₹{investment_amount:,.2f}")
+                                # Rebalance all holdings to equal weights (current holdings are refilled in place)
+                                bought, total_invested = buy_allocations_at_close(
+                                    current_holdings, holding_records, selected_symbols,
+                                    [target_value_per_stock] * len(selected_symbols), day_prices
+                                )
+                                if info_logging:
+                                    for symbol, target_shares, price, investment_amount in bought:
+                                        rebalance_log.append(f"📈 Bought {symbol}: {target_shares:.2f} shares @ ₹{price:.2f} = ₹{investment_amount:,.2f}")
                                 
                                 # Update cash balance after purchases
                                 cash_balance -= total_invested
-                                logger.info(f"💵 Cash remaining after purchases: ₹{cash_balance:,.2f}")
+                                rebalance_log.append(f"💵 Cash remaining after purchases: ₹{cash_balance:,.2f}")
                             else:
                                 logger.warning(f"⚠️  No stocks selected for rebalancing on {date_str}, keeping previous holdings")
                                 current_holdings = prev_holdings
                     else:
                         current_holdings = prev_holdings
-                    
-                    # Recalculate portfolio value after rebalancing
-                    new_portfolio_value = calculate_current_portfolio_value(current_holdings, day_prices, cash_balance)
+                
+                # Price the rebalanced holdings once; the portfolio value, the listing below
+                # and the holdings list share it
+                priced_symbols, shares, avg_prices, current_prices = price_holdings(current_holdings, day_prices)
+                market_values = shares * current_prices
+                
+                # Recalculate portfolio value after rebalancing (holdings plus remaining cash)
+                new_portfolio_value = sum(market_values.tolist(), 0) + cash_balance
                 
                 # Log portfolio after rebalancing
-                logger.info(f"📊 AFTER Rebalancing: {len(current_holdings)} holdings worth ₹{new_portfolio_value:,.2f}")
-                for symbol, holding in current_holdings.items():
-                    if symbol in day_prices:
-                        current_price = day_prices[symbol]["close_price"]
-                        market_value = holding["shares"] * current_price
-                        logger.info(f"  📈 {symbol}: {holding['shares']:.2f} shares @ ₹{current_price:.2f} = ₹{market_value:,.2f}")
+                rebalance_log.append(f"📊 AFTER Rebalancing: {len(current_holdings)} holdings worth ₹{new_portfolio_value:,.2f}")
+                if info_logging:
+                    for symbol, holding_shares, current_price, market_value in zip(
+                        priced_symbols, shares.tolist(), current_prices.tolist(), market_values.tolist()
+                    ):
+                        rebalance_log.append(f"  📈 {symbol}: {holding_shares:.2f} shares @ ₹{current_price:.2f} = ₹{market_value:,.2f}")
                 
-                logger.info(f"✅ Rebalancing complete: ₹{current_portfolio_value:,.2f} → ₹{new_portfolio_value:,.2f}")
+                rebalance_log.append(f"✅ Rebalancing complete: ₹{current_portfolio_value:,.2f} → ₹{new_portfolio_value:,.2f}")
                 portfolio_value = new_portfolio_value
                 
                 # Update holding periods after rebalancing
                 rebalance_count += 1
-                logger.info(f"📊 Updating holding periods after rebalance #{rebalance_count}")
+                rebalance_log.append(f"📊 Updating holding periods after rebalance #{rebalance_count}")
+                
+                # Update holding periods in place: stocks no longer selected drop out
+                for symbol in [symbol for symbol in holding_periods if symbol not in selected_set]:
+                    del holding_periods[symbol]
                 
                 # Increment holding periods for stocks that remain in portfolio
-                new_holding_periods = {}
                 for symbol in selected_symbols:
-                    if symbol in holding_periods:
+                    previous_periods = holding_periods.get(symbol)
+                    if previous_periods is not None:
                         # Stock was already held, increment its period
-                        new_holding_periods[symbol] = holding_periods[symbol] + 1
-                        logger.info(f"  📈 {symbol}: holding period {holding_periods[symbol]} → {new_holding_periods[symbol]}")
+                        holding_periods[symbol] = previous_periods + 1
+                        if info_logging:
+                            rebalance_log.append(f"  📈 {symbol}: holding period {previous_periods} → {previous_periods + 1}")
                     else:
                         # New stock, start with 0 periods
-                        new_holding_periods[symbol] = 0
-                        logger.info(f"  🆕 {symbol}: new stock, holding period = 0")
+                        holding_periods[symbol] = 0
+                        if info_logging:
+                            rebalance_log.append(f"  🆕 {symbol}: new stock, holding period = 0")
                 
-                # Replace holding_periods with updated values
-                holding_periods = new_holding_periods
+                # The whole rebalance narrative goes out as one log record
+                if info_logging:
+                    logger.info("\n".join(rebalance_log))
             else:
-                if current_holdings:
-                    # Just update portfolio value based on price changes
-                    portfolio_value = calculate_current_portfolio_value(current_holdings, day_prices, cash_balance)
-                else:
-                    # No holdings, portfolio value is just cash
-                    portfolio_value = cash_balance 
+                # Aligned vectors of the day's priced holdings, shared by the mark-to-market
+                # below and the holdings list
+                priced_symbols, shares, avg_prices, current_prices = price_holdings(current_holdings, day_prices)
+                market_values = shares * current_prices
+                
+                # Just update portfolio value based on price changes (only cash without holdings)
+                portfolio_value = sum(market_values.tolist(), 0) + cash_balance
 
             # Calculate day PnL
             day_pnl = portfolio_value - prev_portfolio_value
@@ -4342,15 +4663,7 @@ async def run_strategy_simulation(data_manager, strategy, universe_symbols, para
             # Calculate benchmark value
             current_benchmark_close = benchmark_prices.get(date_str)
             if current_benchmark_close is not None:
-                if prev_benchmark_close is not None:
-                    # Calculate benchmark daily return and apply to benchmark value
-                    benchmark_return = (current_benchmark_close / prev_benchmark_close) - 1
-                    benchmark_value = benchmark_value * (1 + benchmark_return)
-                else:
-                    # First day - initialize
-                    benchmark_value = params.portfolio_base_value
-                
-                prev_benchmark_close = current_benchmark_close
+                benchmark_value = benchmark_by_date[date_str]
             else:
                 logger.warning(f"⚠️ No benchmark data for {date_str}, using previous value")
             
@@ -4358,76 +4671,67 @@ async def run_strategy_simulation(data_manager, strategy, universe_symbols, para
             holdings_list = []
             total_portfolio_value = portfolio_value  # Use current portfolio value for weight calculation
             
-            for symbol, holding in current_holdings.items():
-                if symbol in day_prices:
-                    current_price = day_prices[symbol]["close_price"]
-                    market_value = holding["shares"] * current_price
-                    pnl = (current_price - holding["avg_price"]) * holding["shares"]
-                    pnl_percent = ((current_price / holding["avg_price"]) - 1) * 100 if holding["avg_price"] > 0 else 0
-                    
-                    # Calculate portfolio weight percentage
-                    weight_percent = (market_value / total_portfolio_value * 100) if total_portfolio_value > 0 else 0
-                    
-                    # Get holding period and allocation weight
-                    holding_periods_count = holding_periods.get(symbol, 0)
-                    allocation_weight = 1.0 + (holding_periods_count * 0.3)
-                    
-                    holding_info = {
-                        "symbol": symbol,
-                        "company_name": symbol,  # TODO: Get from company mapping
-                        "quantity": holding["shares"],
-                        "avg_price": holding["avg_price"],
-                        "current_price": current_price,
-                        "market_value": market_value,
-                        "pnl": pnl,
-                        "pnl_percent": pnl_percent,
-                        "sector": "Unknown",  # TODO: Get from mapping
-                        "weight": weight_percent,  # Portfolio weight percentage
-                        "holding_periods": holding_periods_count,  # Number of consecutive periods held
-                        "allocation_weight": allocation_weight  # Skewed allocation weight
-                    }
-                    
-                    # Add charge tracking if available
-                    if "total_cost" in holding:
-                        holding_info["total_cost"] = holding["total_cost"]
-                    # Removed cumulative_charges aggregation from individual holdings
-                    
-                    holdings_list.append(holding_info)
-            
-            # Sort holdings by allocation weight (descending) for skewed rebalancing display
-            if params.rebalance_type == "skewed":
-                holdings_list.sort(key=lambda x: x["allocation_weight"], reverse=True)
+            # Value every priced holding at once from the aligned vectors
+            if priced_symbols:
+                pnls = (current_prices - avg_prices) * shares
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    pnl_percents = ((current_prices / avg_prices - 1) * 100).tolist()
+                # Holdings without a positive average price report a plain 0
+                for index in np.flatnonzero(avg_prices <= 0):
+                    pnl_percents[index] = 0
+                
+                # Calculate portfolio weight percentages
+                if total_portfolio_value > 0:
+                    weight_percents = (market_values / total_portfolio_value * 100).tolist()
+                else:
+                    weight_percents = [0] * len(priced_symbols)
+                
+                priced_holdings = zip(
+                    priced_symbols, current_prices.tolist(), market_values.tolist(),
+                    pnls.tolist(), pnl_percents, weight_percents
+                )
             else:
-                # For equal weight, sort by market value (descending)
-                holdings_list.sort(key=lambda x: x["market_value"], reverse=True)
+                priced_holdings = ()
             
-            # Track cumulative charges
-            if not hasattr(run_strategy_simulation, 'cumulative_charges'):
-                run_strategy_simulation.cumulative_charges = 0.0
+            for symbol, current_price, market_value, pnl, pnl_percent, weight_percent in priced_holdings:
+                holding = current_holdings[symbol]
+                
+                # Get holding period and allocation weight
+                holding_periods_count = holding_periods.get(symbol, 0)
+                allocation_weight = 1.0 + (holding_periods_count * 0.3)
+                
+                holding_info = {
+                    "symbol": symbol,
+                    "company_name": symbol,  # TODO: Get from company mapping
+                    "quantity": holding["shares"],
+                    "avg_price": holding["avg_price"],
+                    "current_price": current_price,
+                    "market_value": market_value,
+                    "pnl": pnl,
+                    "pnl_percent": pnl_percent,
+                    "sector": "Unknown",  # TODO: Get from mapping
+                    "weight": weight_percent,  # Portfolio weight percentage
+                    "holding_periods": holding_periods_count,  # Number of consecutive periods held
+                    "allocation_weight": allocation_weight  # Skewed allocation weight
+                }
+                
+                # Add charge tracking if available
+                if "total_cost" in holding:
+                    holding_info["total_cost"] = holding["total_cost"]
+                # Removed cumulative_charges aggregation from individual holdings
+                
+                holdings_list.append(holding_info)
             
-            if should_rebalance and params.include_brokerage:
-                run_strategy_simulation.cumulative_charges += daily_charges.get("total_charges", 0.0)
+            # Sort holdings for display (descending allocation weight or market value)
+            holdings_list.sort(key=holdings_sort_key, reverse=True)
             
-            # Sanitize trade details for JSON serialization
-            sanitized_trade_details = []
-            if should_rebalance and rebalance_trade_details:
-                for trade in rebalance_trade_details:
-                    sanitized_trade = {}
-                    for key, value in trade.items():
-                        if isinstance(value, datetime):
-                            sanitized_trade[key] = value.isoformat()
-                        elif hasattr(value, '__dict__'):
-                            # Handle nested objects (like TransactionCharges)
-                            sanitized_nested = {}
-                            for nested_key, nested_value in value.__dict__.items():
-                                if isinstance(nested_value, datetime):
-                                    sanitized_nested[nested_key] = nested_value.isoformat()
-                                else:
-                                    sanitized_nested[nested_key] = nested_value
-                            sanitized_trade[key] = sanitized_nested
-                        else:
-                            sanitized_trade[key] = value
-                    sanitized_trade_details.append(sanitized_trade)
+            # Track cumulative charges
+            if should_rebalance and include_brokerage:
+                cumulative_charges += daily_charges.get("total_charges", 0.0)
+            
+            # Trade details are plain dicts (dataclasses.asdict in BrokerageCalculator), owned by
+            # this rebalance; their datetimes are converted by sanitize_for_json with the results
+            day_trade_details = rebalance_trade_details if should_rebalance else []
             
             # Create day result with enhanced charge tracking
             day_result = {
@@ -4439,17 +4743,17 @@ async def run_strategy_simulation(data_manager, strategy, universe_symbols, para
                 "exited": exited,
                 "exited_details": exited_details,
                 "cash": cash_balance,  # Actual cash balance
-                "total_pnl": portfolio_value - params.portfolio_base_value,
+                "total_pnl": portfolio_value - portfolio_base_value,
                 "day_pnl": day_pnl,
                 "benchmark_price": current_benchmark_close or 0,
                 
                 # Enhanced charge tracking
                 "daily_charges": daily_charges if should_rebalance else {"total_charges": 0.0, "buy_charges": 0.0, "sell_charges": 0.0},
-                "cumulative_charges": getattr(run_strategy_simulation, 'cumulative_charges', 0.0),
-                "charge_impact_percent": (getattr(run_strategy_simulation, 'cumulative_charges', 0.0) / params.portfolio_base_value) * 100,
-                "trade_details": sanitized_trade_details,
-                "brokerage_enabled": params.include_brokerage,
-                "exchange_used": params.exchange if params.include_brokerage else None
+                "cumulative_charges": cumulative_charges,
+                "charge_impact_percent": (cumulative_charges / portfolio_base_value) * 100,
+                "trade_details": day_trade_details,
+                "brokerage_enabled": include_brokerage,
+                "exchange_used": exchange_used
             }
             
             # Debug logging for exit details
@@ -4459,6 +4763,10 @@ async def run_strategy_simulation(data_manager, strategy, universe_symbols, para
                 logger.info(f"⚠️ Day {date_str}: Have {len(exited)} exits but no exit details: {exited}")
             
             simulation_results.append(day_result)
+            portfolio_values[processed_days] = portfolio_value
+            processed_days += 1
+        
+        portfolio_values = portfolio_values[:processed_days]
         
         # Calculate comprehensive summary statistics with charge analytics
         final_portfolio_value = portfolio_value
@@ -4466,27 +4774,17 @@ async def run_strategy_simulation(data_manager, strategy, universe_symbols, para
         benchmark_return = (benchmark_value / params.portfolio_base_value - 1) * 100 if params.portfolio_base_value > 0 else 0
         
         # Calculate cumulative charge impact
-        total_cumulative_charges = getattr(run_strategy_simulation, 'cumulative_charges', 0.0)
+        total_cumulative_charges = cumulative_charges
         charge_impact_percent = (total_cumulative_charges / params.portfolio_base_value) * 100
         
         # Calculate theoretical return without charges (approximate)
         theoretical_value_without_charges = final_portfolio_value + total_cumulative_charges
         theoretical_return_without_charges = (theoretical_value_without_charges / params.portfolio_base_value - 1) * 100
         
-        # Calculate max drawdown
-        peak_value = params.portfolio_base_value
-        max_drawdown = 0
-        drawdown_details = []
-        for result in simulation_results:
-            peak_value = max(peak_value, result["portfolio_value"])
-            drawdown = (result["portfolio_value"] / peak_value - 1) * 100
-            max_drawdown = min(max_drawdown, drawdown)
-            drawdown_details.append({
-                "date": result["date"],
-                "portfolio_value": result["portfolio_value"],
-                "peak_value": peak_value,
-                "drawdown_percent": drawdown
-            })
+        # Calculate max drawdown (running peak starts from the base value)
+        peak_values = np.maximum.accumulate(np.maximum(portfolio_values, params.portfolio_base_value))
+        drawdowns = (portfolio_values / peak_values - 1) * 100
+        max_drawdown = min(0, float(drawdowns.min())) if len(drawdowns) else 0
         
         # Calculate rebalance statistics
         rebalance_events = [result for result in simulation_results if result["daily_charges"]["total_charges"] > 0]
@@ -4506,62 +4804,41 @@ async def run_strategy_simulation(data_manager, strategy, universe_symbols, para
         
         # Enhanced charge breakdown by components (aggregate from all rebalances)
         if params.include_brokerage and rebalance_events:
-            aggregate_breakdown = {
-                "total_buy_charges": 0.0,
-                "total_sell_charges": 0.0,
-                "stt_total": 0.0,
-                "transaction_charges_total": 0.0,
-                "sebi_charges_total": 0.0,
-                "stamp_duty_total": 0.0,
-                "brokerage_total": 0.0,
-                "gst_total": 0.0
-            }
+            # Charge dicts of all trades, then one (trades x components) matrix summed per column
+            trade_charges = [
+                trade["charges"]
+                for result in simulation_results if result["trade_details"]
+                for trade in result["trade_details"]
+                if isinstance(trade.get("charges"), dict)
+            ]
+            component_totals = np.fromiter(
+                (charges.get(component, 0.0) for charges in trade_charges for component in CHARGE_COMPONENTS),
+                dtype=np.float64, count=len(trade_charges) * len(CHARGE_COMPONENTS)
+            ).reshape(len(trade_charges), len(CHARGE_COMPONENTS)).sum(axis=0)
             
-            # Aggregate charges from all trade details
-            for result in simulation_results:
-                if result["trade_details"]:
-                    for trade in result["trade_details"]:
-                        if "charges" in trade and isinstance(trade["charges"], dict):
-                            charges = trade["charges"]
-                            aggregate_breakdown["stt_total"] += charges.get("stt", 0.0)
-                            aggregate_breakdown["transaction_charges_total"] += charges.get("transaction_charges", 0.0)
-                            aggregate_breakdown["sebi_charges_total"] += charges.get("sebi_charges", 0.0)
-                            aggregate_breakdown["stamp_duty_total"] += charges.get("stamp_duty", 0.0)
-                            aggregate_breakdown["brokerage_total"] += charges.get("brokerage", 0.0)
-                            aggregate_breakdown["gst_total"] += charges.get("gst", 0.0)
-                
-                aggregate_breakdown["total_buy_charges"] += result["daily_charges"].get("buy_charges", 0.0)
-                aggregate_breakdown["total_sell_charges"] += result["daily_charges"].get("sell_charges", 0.0)
+            # Buy / sell totals come from every day's charge summary
+            side_totals = np.fromiter(
+                (result["daily_charges"].get(side, 0.0) for result in simulation_results for side in ("buy_charges", "sell_charges")),
+                dtype=np.float64, count=len(simulation_results) * 2
+            ).reshape(len(simulation_results), 2).sum(axis=0)
             
             charge_analytics["component_breakdown"] = {
-                "stt": round(aggregate_breakdown["stt_total"], 2),
-                "transaction_charges": round(aggregate_breakdown["transaction_charges_total"], 2),
-                "sebi_charges": round(aggregate_breakdown["sebi_charges_total"], 2),
-                "stamp_duty": round(aggregate_breakdown["stamp_duty_total"], 2),
-                "brokerage": round(aggregate_breakdown["brokerage_total"], 2),
-                "gst": round(aggregate_breakdown["gst_total"], 2),
-                "total_buy_charges": round(aggregate_breakdown["total_buy_charges"], 2),
-                "total_sell_charges": round(aggregate_breakdown["total_sell_charges"], 2)
+                **{component: round(float(total), 2) for component, total in zip(CHARGE_COMPONENTS, component_totals)},
+                "total_buy_charges": round(float(side_totals[0]), 2),
+                "total_sell_charges": round(float(side_totals[1]), 2)
             }
         
         # Calculate performance metrics
-        daily_returns = []
-        for i in range(1, len(simulation_results)):
-            prev_portfolio_value = simulation_results[i-1]["portfolio_value"]
-            curr_portfolio_value = simulation_results[i]["portfolio_value"]
-            
-            if prev_portfolio_value > 0:
-                daily_return = (curr_portfolio_value / prev_portfolio_value) - 1
-                daily_returns.append(daily_return)
-            else:
-                # Skip this calculation if previous value is 0
-                logger.warning(f"⚠️ Skipping daily return calculation: previous portfolio value is 0 on day {i-1}")
-                continue
+        prev_portfolio_values = portfolio_values[:-1]
+        valid_returns = prev_portfolio_values > 0
+        daily_returns_array = portfolio_values[1:][valid_returns] / prev_portfolio_values[valid_returns] - 1
+        
+        # Skip days whose previous value is 0
+        for day_index in np.flatnonzero(~valid_returns):
+            logger.warning(f"⚠️ Skipping daily return calculation: previous portfolio value is 0 on day {day_index}")
         
         # Calculate Sharpe ratio (assuming 6% risk-free rate)
-        if daily_returns:
-            import numpy as np
-            daily_returns_array = np.array(daily_returns)
+        if len(daily_returns_array):
             avg_daily_return = np.mean(daily_returns_array)
             daily_volatility = np.std(daily_returns_array)
             
@@ -4577,7 +4854,7 @@ async def run_strategy_simulation(data_manager, strategy, universe_symbols, para
         
         # Sanitize all results for JSON serialization
         sanitized_results = sanitize_for_json({
-            "params": params.dict(),
+            "params": params.model_dump(),
             "benchmark_symbol": benchmark_symbol,
             "results": simulation_results,
             "charge_analytics": charge_analytics,
@@ -4598,74 +4875,149 @@ async def run_strategy_simulation(data_manager, strategy, universe_symbols, para
         return sanitized_results
         
     except Exception as e:
-        import traceback
         error_details = traceback.format_exc()
         logger.error(f"❌ Error in simulation logic: {e}")
         logger.error(f"❌ Full traceback: {error_details}")
         raise
 
-def apply_strategy_rules(day_indicators, rules):
-    """Apply strategy rules to filter qualified stocks"""
-    qualified_stocks = []
+# Comparison operators supported in strategy rules
+RULE_OPERATORS = {
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne
+}
+
+# Indicator fields strategy rules can test, in build_indicator_columns column order
+INDICATOR_RULE_METRICS = ("truevx_score", "mean_short", "mean_mid", "mean_long")
+INDICATOR_RULE_INDEX = {metric: column for column, metric in enumerate(INDICATOR_RULE_METRICS)}
+
+def compile_strategy_rules(rules):
+    """Decode stored rule dicts once into (column, compare, threshold) tuples"""
+    # column indexes INDICATOR_RULE_METRICS, None for a metric the data lacks (reads as 0);
+    # rules with an unknown operator never filtered anything, so they are dropped
+    compiled = []
+    for rule in rules:
+        if rule["operator"] not in RULE_OPERATORS:
+            continue
+        column = INDICATOR_RULE_INDEX.get(rule["metric"])
+        compare = RULE_OPERATORS[rule["operator"]]
+        # A missing metric is 0 for every stock, so the rule either passes everyone
+        # (dropped here) or no one (kept, and short-circuits apply_strategy_rules)
+        if column is None and compare(0, rule["threshold"]):
+            continue
+        compiled.append((column, compare, rule["threshold"]))
+    return tuple(compiled)
+
+def build_indicator_columns(indicator_data):
+    """
+    Column-oriented view of indicator_data for vectorized rule filtering
     
-    for symbol, stock_data in day_indicators.items():
-        qualifies = True
-        
-        for rule in rules:
-            metric_value = stock_data.get(rule["metric"]) or 0  # Handle None values
-            threshold = rule["threshold"]
-            operator = rule["operator"]
-            
-            if operator == ">" and not (metric_value > threshold):
-                qualifies = False
-                break
-            elif operator == "<" and not (metric_value < threshold):
-                qualifies = False
-                break
-            elif operator == ">=" and not (metric_value >= threshold):
-                qualifies = False
-                break
-            elif operator == "<=" and not (metric_value <= threshold):
-                qualifies = False
-                break
-            elif operator == "==" and not (metric_value == threshold):
-                qualifies = False
-                break
-            elif operator == "!=" and not (metric_value != threshold):
-                qualifies = False
-                break
-        
-        if qualifies:
-            qualified_stocks.append(stock_data)
+    Returns {date_str: (stocks, values)}: the day's stock dicts in their original
+    order and an (INDICATOR_RULE_METRICS, stocks) float64 matrix of their values,
+    one contiguous row per metric so each rule compares a contiguous vector.
+    """
+    indicator_columns = {}
+    for date_str, day_indicators in indicator_data.items():
+        stocks = list(day_indicators.values())
+        values = np.array(
+            [[stock.get(metric) or 0 for stock in stocks] for metric in INDICATOR_RULE_METRICS],
+            dtype=np.float64
+        ).reshape(len(INDICATOR_RULE_METRICS), len(stocks))  # Handle None values as 0
+        indicator_columns[date_str] = (stocks, values)
+    return indicator_columns
+
+def apply_strategy_rules(day_columns, rules):
+    """Apply compiled strategy rules to one day of build_indicator_columns output"""
+    stocks, values = day_columns
+    qualified = np.ones(len(stocks), dtype=bool)
     
-    return qualified_stocks
+    for column, compare, threshold in rules:
+        if column is None:
+            return []
+        qualified &= compare(values[column], threshold)
+    
+    return [stocks[i] for i in np.flatnonzero(qualified)]
+
+def assign_holding(current_holdings: dict, holding_records: dict, symbol: str, shares: float, avg_price: float):
+    """Set current_holdings[symbol], reusing the symbol's record dict from earlier rebalances"""
+    holding = holding_records.get(symbol)
+    if holding is None:
+        holding = holding_records[symbol] = {}
+    holding["shares"] = shares
+    holding["avg_price"] = avg_price
+    current_holdings[symbol] = holding
+
+def buy_allocations_at_close(current_holdings: dict, holding_records: dict, symbols: list,
+                             allocations: list, day_prices: dict):
+    """
+    Refill current_holdings with each symbol's allocation bought at the day's close
+    
+    symbols and allocations are aligned; symbols without a price that day are skipped.
+    Share counts and invested amounts are computed as vectors. Returns the
+    (symbol, shares, price, invested) rows bought and the total invested.
+    """
+    bought_symbols = []
+    bought_allocations = []
+    bought_prices = []
+    for symbol, allocation in zip(symbols, allocations):
+        symbol_prices = day_prices.get(symbol)
+        if symbol_prices is not None:
+            bought_symbols.append(symbol)
+            bought_allocations.append(allocation)
+            bought_prices.append(symbol_prices["close_price"])
+    
+    prices = np.array(bought_prices, dtype=np.float64)
+    shares = np.array(bought_allocations, dtype=np.float64) / prices
+    invested = (shares * prices).tolist()
+    share_counts = shares.tolist()
+    
+    current_holdings.clear()
+    for symbol, symbol_shares, price in zip(bought_symbols, share_counts, bought_prices):
+        assign_holding(current_holdings, holding_records, symbol, symbol_shares, price)
+    
+    return list(zip(bought_symbols, share_counts, bought_prices, invested)), sum(invested, 0)
 
 def calculate_current_portfolio_value(current_holdings, day_prices, cash_balance=0):
     """Calculate current portfolio value based on current prices plus cash"""
     total_value = 0
     
-    # Calculate value of stock holdings
+    # Calculate value of stock holdings (one price lookup per holding)
     for symbol, holding in current_holdings.items():
-        if symbol in day_prices:
-            current_price = day_prices[symbol]["close_price"]
-            market_value = holding["shares"] * current_price
-            total_value += market_value
+        symbol_prices = day_prices.get(symbol)
+        if symbol_prices is not None:
+            total_value += holding["shares"] * symbol_prices["close_price"]
     
     # Add cash balance
     total_value += cash_balance
     
     return total_value
 
+def price_holdings(current_holdings, day_prices):
+    """
+    Aligned float64 vectors for the holdings that have a price on a day
+    
+    Returns (symbols, shares, avg_prices, close_prices) in current_holdings order;
+    holdings missing from day_prices are left out, as in calculate_current_portfolio_value.
+    """
+    symbols = [symbol for symbol in current_holdings if symbol in day_prices]
+    count = len(symbols)
+    shares = np.fromiter((current_holdings[symbol]["shares"] for symbol in symbols), dtype=np.float64, count=count)
+    avg_prices = np.fromiter((current_holdings[symbol]["avg_price"] for symbol in symbols), dtype=np.float64, count=count)
+    close_prices = np.fromiter((day_prices[symbol]["close_price"] for symbol in symbols), dtype=np.float64, count=count)
+    return symbols, shares, avg_prices, close_prices
+
 def get_rebalance_dates(dates, frequency, date_type):
-    """Generate rebalance dates based on frequency and date type"""
+    """Generate rebalance dates (a frozenset of date strings) based on frequency and date type"""
     rebalance_dates = set()
     
     if frequency == "monthly":
         # Group dates by month
         monthly_groups = {}
         for date_str in dates:
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-            month_key = (date_obj.year, date_obj.month)
+            month_key = date_str[:7]  # "YYYY-MM"
             if month_key not in monthly_groups:
                 monthly_groups[month_key] = []
             monthly_groups[month_key].append(date_str)
@@ -4685,7 +5037,7 @@ def get_rebalance_dates(dates, frequency, date_type):
         # Group dates by week
         weekly_groups = {}
         for date_str in dates:
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+            date_obj = parse_simulation_date(date_str)
             week_key = (date_obj.year, date_obj.isocalendar()[1])
             if week_key not in weekly_groups:
                 weekly_groups[week_key] = []
@@ -4706,10 +5058,9 @@ def get_rebalance_dates(dates, frequency, date_type):
         # Group dates by quarter
         quarterly_groups = {}
         for date_str in dates:
-            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
             # Calculate quarter: Q1 (1-3), Q2 (4-6), Q3 (7-9), Q4 (10-12)
-            quarter = (date_obj.month - 1) // 3 + 1
-            quarter_key = (date_obj.year, quarter)
+            quarter = (int(date_str[5:7]) - 1) // 3 + 1
+            quarter_key = (date_str[:4], quarter)
             if quarter_key not in quarterly_groups:
                 quarterly_groups[quarter_key] = []
             quarterly_groups[quarter_key].append(date_str)
@@ -4725,7 +5076,13 @@ def get_rebalance_dates(dates, frequency, date_type):
                 mid_index = len(quarter_dates) // 2
                 rebalance_dates.add(quarter_dates[mid_index])
     
-    return rebalance_dates
+    return frozenset(rebalance_dates)
+
+def get_rebalance_flags(dates, rebalance_dates, frequency) -> list:
+    """Per-day rebalance flags aligned with dates (dynamic = daily, first day always)"""
+    if frequency == "dynamic":
+        return [True] * len(dates)
+    return [i == 0 or date_str in rebalance_dates for i, date_str in enumerate(dates)]
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=3001, reload=False)
@@ -50,7 +50,7 @@ interface HoldingResult {
   final_portfolio_value: number;
   days_count: number;
   monthly_returns: number[];
-  portfolio_values: { date: string; value: number; benchmark: number }[];
+  portfolio_values: { dates: string[]; values: number[]; benchmarks: number[] };
   status: 'completed' | 'running' | 'error';
   error_message?: string;
 }
@@ -164,24 +164,25 @@ const HoldingsMultiRunContent = () => {
     // Get all unique dates
     const allDates = new Set<string>();
     completedHoldings.forEach((h: HoldingResult) => {
-      if (h.portfolio_values && Array.isArray(h.portfolio_values)) {
-        h.portfolio_values.forEach((pv: any) => allDates.add(pv.date));
-      }
+      h.portfolio_values?.dates?.forEach((date: string) => allDates.add(date));
     });
     
     const sortedDates = Array.from(allDates).sort();
     
+    // Index each holding's columns by date
+    const dateIndexes = completedHoldings.map((h: HoldingResult) =>
+      new Map((h.portfolio_values?.dates ?? []).map((date: string, i: number) => [date, i]))
+    );
+    
     // Create data points for each date
     return sortedDates.map(date => {
       const dataPoint: any = { date };
       
-      completedHoldings.forEach((h: HoldingResult) => {
-        if (h.portfolio_values && Array.isArray(h.portfolio_values)) {
-          const value = h.portfolio_values.find((pv: any) => pv.date === date);
-          if (value) {
-            dataPoint[`holdings_${h.holding_size}`] = value.value;
-            dataPoint[`benchmark`] = value.benchmark;
-          }
+      completedHoldings.forEach((h: HoldingResult, k: number) => {
+        const i = dateIndexes[k].get(date);
+        if (i !== undefined) {
+          dataPoint[`holdings_${h.holding_size}`] = h.portfolio_values.values[i];
+          dataPoint[`benchmark`] = h.portfolio_values.benchmarks[i];
         }
       });
       
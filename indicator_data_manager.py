@@ -91,6 +91,8 @@ class IndicatorDataManager:
             
             indicators_coll.create_index([("symbol", 1), ("indicator_type", 1)])
             indicators_coll.create_index([("date", 1)])
+            # Simulation loads: indicator_type + symbol $in + date range in one bounded scan
+            indicators_coll.create_index([("indicator_type", 1), ("symbol", 1), ("date", 1)])
             
             # Jobs collection indexes
             jobs_coll = self.db[self.jobs_collection]
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Numeric kernels for price-based momentum ranking
+
+Each kernel takes a contiguous float64 window of closing prices (oldest first)
+and returns a score as a plain float. With numba installed the loop kernels are
+JIT-compiled (and warmed up at import); without it NumPy equivalents are used.
+
+Compiled code is cached on disk (cache=True), so only the first import after a
+change pays the compile; later imports (including simulation pool workers
+that are not forked from the warmed-up API process) just load it.
+"""
+
+import logging
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+ANNUALIZATION_FACTOR = 252 ** 0.5
+
+# fastmath flags for order-sensitive accumulations: everything except 'reassoc',
+# so LLVM cannot regroup the Welford updates and results stay reproducible
+STABLE_FASTMATH = {"nnan", "ninf", "nsz", "arcp", "contract", "afn"}
+
+def _roc(prices, period):
+    """Percent change from `period` closes back (or the first close) to the last close"""
+    n = prices.shape[0]
+    lookback_price = prices[n - period] if n >= period else prices[0]
+    if lookback_price > 0:
+        return (prices[n - 1] / lookback_price - 1.0) * 100.0
+    return 0.0
+
+def _risk_adjusted_loop(prices):
+    """
+    Annualized mean/std of daily returns x100, single pass (Welford)
+    
+    Welford's update avoids the cancellation of sum/sum-of-squares variance, so
+    long windows of small returns keep full precision.
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(1, prices.shape[0]):
+        prev_price = prices[i - 1]
+        if prev_price > 0:
+            daily_return = prices[i] / prev_price - 1.0
+            count += 1
+            delta = daily_return - mean
+            mean += delta / count
+            m2 += delta * (daily_return - mean)
+
+    if count == 0:
+        return 0.0
+    std = (m2 / count) ** 0.5
+    if std > 0:
+        return mean / std * ANNUALIZATION_FACTOR * 100.0
+    return mean * 100.0
+
+def _technical_loop(prices):
+    """Average of price-vs-MA20 and MA10-vs-MA20 momentum, both MAs in one loop"""
+    n = prices.shape[0]
+    n_10 = min(n, 10)
+    n_20 = min(n, 20)
+    sum_10 = 0.0
+    sum_20 = 0.0
+    for i in range(n - n_20, n):
+        sum_20 += prices[i]
+        if i >= n - n_10:
+            sum_10 += prices[i]
+
+    ma_10 = sum_10 / n_10
+    ma_20 = sum_20 / n_20
+    if ma_20 > 0:
+        price_momentum = (prices[n - 1] / ma_20 - 1.0) * 100.0
+        trend_momentum = (ma_10 / ma_20 - 1.0) * 100.0
+        return (price_momentum + trend_momentum) / 2.0
+    return 0.0
+
+def _risk_adjusted_numpy(prices):
+    """NumPy equivalent of _risk_adjusted_loop"""
+    prev_prices = prices[:-1]
+    valid = prev_prices > 0
+    daily_returns = prices[1:][valid] / prev_prices[valid] - 1
+    if len(daily_returns) == 0:
+        return 0.0
+
+    mean_return = daily_returns.mean()
+    std_return = daily_returns.std()
+    if std_return > 0:
+        return float(mean_return / std_return * ANNUALIZATION_FACTOR * 100)
+    return float(mean_return * 100)
+
+def _technical_numpy(prices):
+    """NumPy equivalent of _technical_loop"""
+    ma_10 = prices[-10:].mean()
+    ma_20 = prices[-20:].mean()
+    if ma_20 > 0:
+        price_momentum = ((prices[-1] / ma_20) - 1) * 100
+        trend_momentum = ((ma_10 / ma_20) - 1) * 100
+        return float((price_momentum + trend_momentum) / 2)
+    return 0.0
+
+if NUMBA_AVAILABLE:
+    roc = njit(cache=True, fastmath=True)(_roc)
+    risk_adjusted = njit(cache=True, fastmath=STABLE_FASTMATH)(_risk_adjusted_loop)
+    technical = njit(cache=True, fastmath=True)(_technical_loop)
+
+    # Pay the JIT compilation cost at import rather than on the first ranking
+    _warmup_start = time.perf_counter()
+    _warmup_prices = np.linspace(100.0, 110.0, 32)
+    roc(_warmup_prices, 20)
+    risk_adjusted(_warmup_prices)
+    technical(_warmup_prices)
+    logger.info(f"⚡ Momentum kernels ready with numba in {(time.perf_counter() - _warmup_start) * 1000:.0f}ms")
+else:
+    def roc(prices, period):
+        return float(_roc(prices, period))
+
+    risk_adjusted = _risk_adjusted_numpy
+    technical = _technical_numpy
@@ -8,7 +8,7 @@ partitioned by 5-year periods for horizontal scalability and performance.
 
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from dataclasses import asdict
 import logging
 from pymongo import MongoClient, ASCENDING, DESCENDING
@@ -107,6 +107,7 @@ class StockDataManager:
         try:
             await collection.create_index([("scrip_code", ASCENDING), ("date", ASCENDING)], unique=True)
             await collection.create_index([("symbol", ASCENDING), ("date", DESCENDING)])
+            await collection.create_index([("symbol", ASCENDING), ("date", ASCENDING)])
             await collection.create_index([("date", DESCENDING)])
             await collection.create_index([("year_partition", ASCENDING)])
         except Exception as e:
@@ -115,6 +116,11 @@ class StockDataManager:
         
         return collection
     
+    async def ensure_price_indexes(self):
+        """Ensure the (symbol, date) ascending index used by bulk reads on every price partition"""
+        for collection_name in await self.get_all_price_collections():
+            await self.db[collection_name].create_index([("symbol", ASCENDING), ("date", ASCENDING)])
+    
     async def get_all_price_collections(self) -> List[str]:
         """Get all existing price collection names"""
         collections = await self.db.list_collection_names()
@@ -343,6 +349,54 @@ class StockDataManager:
         logger.info(f"📊 Retrieved {len(all_records)} records, after deduplication: {len(deduplicated_records)}")
         return deduplicated_records
     
+    async def iter_price_data_bulk(
+        self,
+        symbols: List[str],
+        start_date: datetime,
+        end_date: datetime
+    ) -> AsyncIterator[PriceData]:
+        """
+        Stream price data for many symbols with one query per partition
+        
+        Yields records ordered by symbol then date within each partition, oldest
+        partition first, so each symbol's records arrive in date order.
+        """
+        query = {
+            "symbol": {"$in": list(symbols)},
+            "date": {"$gte": start_date, "$lte": end_date}
+        }
+        
+        # Partitions covering the range, oldest first, each queried once
+        collection_names = list(dict.fromkeys(
+            self._get_partition_collection_name(year)
+            for year in range(start_date.year, end_date.year + 1)
+        ))
+        
+        seen_keys = set()
+        total_records = 0
+        for collection_name in collection_names:
+            try:
+                cursor = self.db[collection_name].find(query).sort(
+                    [("symbol", ASCENDING), ("date", ASCENDING)]
+                ).batch_size(5000)
+                
+                async for doc in cursor:
+                    # Deduplicate by (symbol, date) in case of partition overlap
+                    key = (doc["symbol"], doc["date"])
+                    if key in seen_keys:
+                        continue
+                    seen_keys.add(key)
+                    
+                    doc.pop('_id', None)
+                    total_records += 1
+                    yield PriceData(**doc)
+                    
+            except Exception as e:
+                logger.warning(f"⚠️ Error querying partition {collection_name}: {e}")
+                continue
+        
+        logger.info(f"📊 Streamed {total_records} records for {len(symbols)} requested symbols")
+    
     async def get_price_data_count(
         self,
         symbol: str = None,
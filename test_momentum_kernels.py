@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the momentum kernels against the original list-based formulas
+
+Runs the loop kernels as plain Python, their NumPy equivalents and the public
+kernels (numba-compiled when available) on the same windows, including short
+windows (< 20 and < 10 closes) and non-positive previous prices.
+"""
+import math
+import random
+
+import numpy as np
+
+import momentum_kernels
+from momentum_kernels import (
+    _roc, _risk_adjusted_loop, _technical_loop, _risk_adjusted_numpy, _technical_numpy
+)
+
+# Kernels reorder float operations (Welford, fused MAs), so compare with a tolerance
+REL_TOLERANCE = 1e-9
+ABS_TOLERANCE = 1e-9
+
+def reference_roc(closes, period):
+    """Original N-day return: `period` closes back, or the first close if fewer"""
+    current_price = closes[-1]
+    lookback_price = closes[-period] if len(closes) >= period else closes[0]
+    if lookback_price > 0:
+        return ((current_price / lookback_price) - 1) * 100
+    return 0.0
+
+def reference_risk_adjusted(closes):
+    """Original Sharpe-like score over daily returns (population std)"""
+    daily_returns = []
+    for i in range(1, len(closes)):
+        prev_price = closes[i - 1]
+        curr_price = closes[i]
+        if prev_price > 0:
+            daily_returns.append((curr_price / prev_price) - 1)
+
+    if not daily_returns:
+        return 0.0
+
+    mean_return = sum(daily_returns) / len(daily_returns)
+    variance = sum((r - mean_return) ** 2 for r in daily_returns) / len(daily_returns)
+    std_return = variance ** 0.5
+    if std_return > 0:
+        return (mean_return / std_return) * (252 ** 0.5) * 100
+    return mean_return * 100
+
+def reference_technical(closes):
+    """Original price-vs-MA20 / MA10-vs-MA20 blend"""
+    current_price = closes[-1]
+    prices_10 = closes[-10:]
+    prices_20 = closes[-20:]
+    ma_10 = sum(prices_10) / len(prices_10)
+    ma_20 = sum(prices_20) / len(prices_20)
+    price_momentum = ((current_price / ma_20) - 1) * 100 if ma_20 > 0 else 0
+    trend_momentum = ((ma_10 / ma_20) - 1) * 100 if ma_20 > 0 else 0
+    return (price_momentum + trend_momentum) / 2
+
+def random_walk(rng, length, start=100.0):
+    closes = [start]
+    for _ in range(length - 1):
+        closes.append(closes[-1] * (1 + rng.gauss(0.0005, 0.02)))
+    return closes
+
+def sample_windows():
+    """Named windows covering long, short (< 20, < 10) and degenerate inputs"""
+    rng = random.Random(42)
+    windows = {
+        "long_walk": random_walk(rng, 250),
+        "window_25": random_walk(rng, 25),
+        "window_under_20": random_walk(rng, 15),
+        "window_under_10": random_walk(rng, 7),
+        "two_closes": [100.0, 101.5],
+        "zero_prev_price": [100.0, 102.0, 0.0, 98.0, 99.5, 101.0, 100.2, 103.4, 104.0, 102.8, 105.1],
+        "negative_prev_price": [50.0, -1.0, 51.0, 52.5, 51.7, 53.0],
+        "zero_lookback_price": [0.0] + random_walk(rng, 12),
+        "all_zero": [0.0] * 12,
+        "constant": [250.0] * 30,
+        "doubling": [2.0 ** i for i in range(8)],
+    }
+    for i in range(50):
+        windows[f"random_{i}"] = random_walk(rng, rng.randint(2, 300), start=rng.uniform(1, 5000))
+    return windows
+
+def assert_close(actual, expected, label):
+    assert math.isclose(actual, expected, rel_tol=REL_TOLERANCE, abs_tol=ABS_TOLERANCE), \
+        f"{label}: {actual!r} != {expected!r}"
+
+def test_roc_matches_reference():
+    """_roc and the public roc match the original N-day return for every period"""
+    for name, closes in sample_windows().items():
+        prices = np.array(closes, dtype=np.float64)
+        for period in (20, 66, 222):
+            expected = reference_roc(closes, period)
+            assert_close(_roc(prices, period), expected, f"_roc {name} period={period}")
+            assert_close(momentum_kernels.roc(prices, period), expected, f"roc {name} period={period}")
+
+    print("✅ roc matches the original formula")
+
+def test_risk_adjusted_matches_reference():
+    """Welford loop, NumPy variant and public kernel match the original two-pass formula"""
+    for name, closes in sample_windows().items():
+        prices = np.array(closes, dtype=np.float64)
+        expected = reference_risk_adjusted(closes)
+        assert_close(_risk_adjusted_loop(prices), expected, f"_risk_adjusted_loop {name}")
+        assert_close(_risk_adjusted_numpy(prices), expected, f"_risk_adjusted_numpy {name}")
+        assert_close(momentum_kernels.risk_adjusted(prices), expected, f"risk_adjusted {name}")
+
+    print("✅ risk_adjusted matches the original formula")
+
+def test_technical_matches_reference():
+    """Fused-MA loop, NumPy variant and public kernel match the original MA10/MA20 blend"""
+    for name, closes in sample_windows().items():
+        prices = np.array(closes, dtype=np.float64)
+        expected = reference_technical(closes)
+        assert_close(_technical_loop(prices), expected, f"_technical_loop {name}")
+        assert_close(_technical_numpy(prices), expected, f"_technical_numpy {name}")
+        assert_close(momentum_kernels.technical(prices), expected, f"technical {name}")
+
+    print("✅ technical matches the original formula")
+
+def test_degenerate_windows():
+    """Spot-check the branches for non-positive and flat prices"""
+    windows = sample_windows()
+
+    # Lookback close of 0: no return rather than a division error
+    assert _roc(np.array(windows["zero_lookback_price"]), 20) == 0.0
+    # Returns from a non-positive previous close are skipped, not counted as 0
+    zero_prev = np.array(windows["zero_prev_price"])
+    assert _risk_adjusted_loop(zero_prev) != _risk_adjusted_loop(np.where(zero_prev > 0, zero_prev, 1.0))
+    # Zero MA20 and zero std fall back to 0 and the plain mean return
+    assert _technical_loop(np.array(windows["all_zero"])) == 0.0
+    assert _risk_adjusted_loop(np.array(windows["constant"])) == 0.0
+    assert _risk_adjusted_loop(np.array(windows["doubling"])) == 100.0
+
+    print("✅ Degenerate windows handled like the original formulas")
+
+if __name__ == "__main__":
+    try:
+        print(f"🔧 numba available: {momentum_kernels.NUMBA_AVAILABLE}")
+        test_roc_matches_reference()
+        test_risk_adjusted_matches_reference()
+        test_technical_matches_reference()
+        test_degenerate_windows()
+        print("\n🎉 ALL TESTS PASSED - Momentum kernels match the original formulas!")
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the array-based simulation helpers in api_server
+
+Checks top-k ranking against a stable descending sort, momentum scores and
+portfolio-limit selection against the original dict-scanning formulas, period
+slicing at its boundaries, and the shared-memory price array round trip.
+"""
+import math
+import random
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from api_server import (
+    attach_symbol_price_arrays, build_indicator_momentum, build_symbol_price_arrays,
+    calculate_stock_momentum, select_top_stocks_by_momentum, shared_simulation_data,
+    slice_simulation_data, slice_symbol_price_arrays, top_k_indices
+)
+
+PRICE_METHODS = ["20_day_return", "price_roc_66d", "price_roc_222d", "risk_adjusted", "technical"]
+INDICATOR_METHODS = ["truevx_roc", "short_mean_roc", "mid_mean_roc", "long_mean_roc", "stock_score_roc"]
+INDICATOR_FIELDS = {
+    "truevx_roc": "truevx_score",
+    "short_mean_roc": "mean_short",
+    "mid_mean_roc": "mean_mid",
+    "long_mean_roc": "mean_long"
+}
+
+def make_history(seed=7, symbols=12, days=420):
+    """Weekday price and indicator histories with gaps, zero closes and missing indicator values"""
+    rng = random.Random(seed)
+    symbol_names = [f"SYM{i:02d}" for i in range(symbols)]
+    closes = {symbol: rng.uniform(20, 3000) for symbol in symbol_names}
+    price_data = {}
+    indicator_data = {}
+    day = date(2023, 1, 2)
+    for _ in range(days):
+        day += timedelta(days=1)
+        if day.weekday() >= 5:
+            continue
+        date_str = day.isoformat()
+        price_data[date_str] = {}
+        indicator_data[date_str] = {}
+        for symbol in symbol_names:
+            if rng.random() < 0.1:
+                continue  # Symbol not traded / no indicators that day
+            closes[symbol] *= 1 + rng.gauss(0, 0.02)
+            close = 0.0 if rng.random() < 0.01 else closes[symbol]
+            price_data[date_str][symbol] = {"close_price": close}
+            indicator_data[date_str][symbol] = {
+                field: (None if rng.random() < 0.05 else rng.uniform(-20, 100))
+                for field in ("truevx_score", "mean_short", "mean_mid", "mean_long")
+            }
+    return price_data, indicator_data
+
+def reference_momentum(symbol, current_date, price_data_history, indicator_data_history, method):
+    """Original calculate_stock_momentum formulas, scanning the per-date dicts"""
+    current_date_obj = datetime.strptime(current_date, "%Y-%m-%d")
+    lookback_days = {"price_roc_66d": 90, "price_roc_222d": 300}.get(method, 30)
+    start_date = current_date_obj - timedelta(days=lookback_days)
+
+    symbol_prices = sorted(
+        (datetime.strptime(date_str, "%Y-%m-%d"), prices[symbol]["close_price"])
+        for date_str, prices in price_data_history.items()
+        if symbol in prices and start_date <= datetime.strptime(date_str, "%Y-%m-%d") <= current_date_obj
+    )
+    closes = [close for _, close in symbol_prices]
+    if len(closes) < 2:
+        return 0.0
+    current_price = closes[-1]
+
+    if method in ("20_day_return", "price_roc_66d", "price_roc_222d"):
+        period = {"20_day_return": 20, "price_roc_66d": 66, "price_roc_222d": 222}[method]
+        lookback_price = closes[-period] if len(closes) >= period else closes[0]
+        return ((current_price / lookback_price) - 1) * 100 if lookback_price > 0 else 0.0
+
+    if method == "risk_adjusted":
+        if len(closes) < 5:
+            return 0.0
+        daily_returns = [(closes[i] / closes[i - 1]) - 1 for i in range(1, len(closes)) if closes[i - 1] > 0]
+        if not daily_returns:
+            return 0.0
+        mean_return = sum(daily_returns) / len(daily_returns)
+        std_return = (sum((r - mean_return) ** 2 for r in daily_returns) / len(daily_returns)) ** 0.5
+        if std_return > 0:
+            return (mean_return / std_return) * (252 ** 0.5) * 100
+        return mean_return * 100
+
+    if method == "technical":
+        if len(closes) < 10:
+            return 0.0
+        ma_10 = sum(closes[-10:]) / len(closes[-10:])
+        ma_20 = sum(closes[-20:]) / len(closes[-20:])
+        price_momentum = ((current_price / ma_20) - 1) * 100 if ma_20 > 0 else 0
+        trend_momentum = ((ma_10 / ma_20) - 1) * 100 if ma_20 > 0 else 0
+        return (price_momentum + trend_momentum) / 2
+
+    # Indicator methods: latest record vs the one 22 records earlier
+    records = [
+        indicator_data_history[date_str][symbol]
+        for date_str in sorted(indicator_data_history, reverse=True)
+        if datetime.strptime(date_str, "%Y-%m-%d") <= current_date_obj and symbol in indicator_data_history[date_str]
+    ]
+    if len(records) <= 22:
+        return 0.0
+
+    def value(data):
+        def safe_get(key):
+            val = data.get(key)
+            return val if val is not None else 0
+        if method == "stock_score_roc":
+            return (0.1 * safe_get("truevx_score") + 0.2 * safe_get("mean_short") +
+                    0.3 * safe_get("mean_mid") + 0.4 * safe_get("mean_long"))
+        return safe_get(INDICATOR_FIELDS[method])
+
+    current_val, past_val = value(records[0]), value(records[22])
+    return ((current_val - past_val) / past_val) * 100 if past_val > 0 else 0.0
+
+def reference_selection(qualified_stocks, current_holdings, max_holdings, momentum):
+    """Original select_top_stocks_by_momentum ranking (stable sort, holdings first)"""
+    if len(qualified_stocks) + len(current_holdings) <= max_holdings:
+        # Under the limit the original returns the new stock dicts, not symbols
+        return ([stock["symbol"] for stock in qualified_stocks],
+                [stock for stock in qualified_stocks if stock["symbol"] not in current_holdings], set())
+
+    candidates = list(current_holdings) + [
+        stock["symbol"] for stock in qualified_stocks if stock["symbol"] not in current_holdings
+    ]
+    candidates.sort(key=momentum, reverse=True)
+    selected = candidates[:max_holdings]
+    added = [symbol for symbol in selected if symbol not in current_holdings]
+    removed = {symbol for symbol in current_holdings if symbol not in selected}
+    return selected, added, removed
+
+def test_top_k_indices_matches_stable_sort():
+    """Same indices and order as a stable descending sort, ties included"""
+    rng = random.Random(1)
+    for _ in range(300):
+        n = rng.randint(0, 40)
+        # Few distinct values so most draws contain ties
+        scores = np.array([float(rng.randint(-3, 3)) for _ in range(n)], dtype=np.float64)
+        for k in range(-1, n + 3):
+            expected = sorted(range(n), key=lambda i: scores[i], reverse=True)[:max(k, 0)]
+            actual = top_k_indices(scores, k)
+            assert actual.tolist() == expected, f"scores={scores.tolist()} k={k}: {actual.tolist()} != {expected}"
+
+    assert top_k_indices(np.array([1.0, 2.0]), 0).size == 0
+    assert top_k_indices(np.array([1.0, 2.0]), -5).size == 0
+    assert top_k_indices(np.array([2.0, 5.0, 5.0]), 10).tolist() == [1, 2, 0]
+
+    print("✅ top_k_indices matches a stable descending sort")
+
+def test_calculate_stock_momentum_matches_reference():
+    """Array-based momentum matches the original formulas for every method"""
+    price_data, indicator_data = make_history()
+    symbol_price_arrays = build_symbol_price_arrays(price_data)
+    indicator_momentum = build_indicator_momentum(indicator_data)
+
+    trading_dates = sorted(price_data)
+    # Trading days near the start (short windows), later days and weekend dates
+    check_dates = trading_dates[:30:3] + trading_dates[30::17] + ["2023-06-03", "2024-02-11", "2022-12-01"]
+    for current_date in check_dates:
+        for symbol in list(symbol_price_arrays) + ["MISSING"]:
+            for method in PRICE_METHODS + INDICATOR_METHODS:
+                expected = reference_momentum(symbol, current_date, price_data, indicator_data, method)
+                actual = calculate_stock_momentum(symbol, current_date, symbol_price_arrays, indicator_momentum, method)
+                assert math.isclose(actual, expected, rel_tol=1e-9, abs_tol=1e-9), \
+                    f"{symbol} {current_date} {method}: {actual!r} != {expected!r}"
+
+    print("✅ calculate_stock_momentum matches the original formulas")
+
+def test_select_top_stocks_matches_reference():
+    """Portfolio-limit selection picks, orders and splits stocks like the original"""
+    price_data, indicator_data = make_history(seed=11)
+    symbol_price_arrays = build_symbol_price_arrays(price_data)
+    indicator_momentum = build_indicator_momentum(indicator_data)
+    symbols = sorted(symbol_price_arrays) + ["MISSING"]
+    trading_dates = sorted(price_data)
+    rng = random.Random(3)
+
+    for _ in range(60):
+        current_date = rng.choice(trading_dates)
+        method = rng.choice(PRICE_METHODS + INDICATOR_METHODS)
+        held = rng.sample(symbols, rng.randint(0, 6))
+        current_holdings = {symbol: {"shares": 1} for symbol in held}
+        qualified_stocks = [
+            {"symbol": symbol, "truevx_score": rng.uniform(0, 100)}
+            for symbol in rng.sample(symbols, rng.randint(0, len(symbols)))
+        ]
+        max_holdings = rng.randint(1, 10)
+
+        def momentum(symbol):
+            return reference_momentum(symbol, current_date, price_data, indicator_data, method)
+        expected_selected, expected_added, expected_removed = reference_selection(
+            qualified_stocks, current_holdings, max_holdings, momentum
+        )
+
+        for momentum_cache in (None, {}):
+            selected, added, removed = select_top_stocks_by_momentum(
+                qualified_stocks, current_holdings, symbol_price_arrays, indicator_momentum,
+                current_date, max_holdings, method, momentum_cache
+            )
+            assert [stock["symbol"] for stock in selected] == expected_selected, f"{current_date} {method}"
+            assert added == expected_added, f"{current_date} {method}"
+            assert set(removed) == expected_removed, f"{current_date} {method}"
+
+    print("✅ select_top_stocks_by_momentum matches the original ranking")
+
+def test_slicing_at_period_boundaries():
+    """Slices are inclusive at both ends and agree with rebuilding from the sliced dicts"""
+    price_data, indicator_data = make_history(seed=5, days=120)
+    simulation_data = {
+        "indicator_data": indicator_data,
+        "price_data": price_data,
+        "benchmark_prices": {date_str: 100.0 + i for i, date_str in enumerate(sorted(price_data))},
+        "symbol_price_arrays": build_symbol_price_arrays(price_data)
+    }
+    trading_dates = sorted(price_data)
+
+    periods = [
+        (trading_dates[0], trading_dates[-1]),        # Whole range
+        (trading_dates[10], trading_dates[10]),       # Single day
+        (trading_dates[5], trading_dates[40]),        # Both ends on trading days
+        ("2023-01-07", "2023-02-12"),                 # Both ends on weekends
+        ("2022-01-01", trading_dates[3]),             # Starts before the data
+        (trading_dates[-3], "2030-01-01"),            # Ends after the data
+        ("2030-01-01", "2030-12-31"),                 # Entirely after the data
+        (trading_dates[20], trading_dates[10]),       # Start after end
+    ]
+    for start_date_str, end_date_str in periods:
+        sliced = slice_simulation_data(simulation_data, start_date_str, end_date_str)
+        expected_dates = [d for d in trading_dates if start_date_str <= d <= end_date_str]
+        assert sorted(sliced["price_data"]) == expected_dates
+        assert sorted(sliced["indicator_data"]) == expected_dates
+        assert sorted(sliced["benchmark_prices"]) == expected_dates
+
+        expected_arrays = build_symbol_price_arrays(sliced["price_data"])
+        for arrays in (sliced["symbol_price_arrays"],
+                       slice_symbol_price_arrays(simulation_data["symbol_price_arrays"], start_date_str, end_date_str)):
+            assert arrays.keys() == expected_arrays.keys(), f"{start_date_str}..{end_date_str}"
+            for symbol, (dates_np, closes_np) in expected_arrays.items():
+                assert np.array_equal(arrays[symbol][0], dates_np)
+                assert np.array_equal(arrays[symbol][1], closes_np)
+
+    print("✅ Period slicing is inclusive and consistent at the boundaries")
+
+def check_round_trip(symbol_price_arrays):
+    simulation_data = {"price_data": {"2024-01-01": {}}, "symbol_price_arrays": symbol_price_arrays}
+    with shared_simulation_data(simulation_data) as (worker_data, manifest):
+        assert "symbol_price_arrays" not in worker_data
+        assert worker_data["price_data"] is simulation_data["price_data"]
+
+        shm, attached = attach_symbol_price_arrays(manifest)
+        try:
+            assert attached.keys() == symbol_price_arrays.keys()
+            for symbol, (dates_np, closes_np) in symbol_price_arrays.items():
+                assert attached[symbol][0].dtype == np.dtype("datetime64[D]")
+                assert attached[symbol][1].dtype == np.float64
+                assert np.array_equal(attached[symbol][0], dates_np)
+                assert np.array_equal(attached[symbol][1], closes_np)
+        finally:
+            attached = None
+            shm.close()
+
+def test_shared_price_arrays_round_trip():
+    """Arrays mapped back from shared memory equal the originals, empty inputs included"""
+    price_data, _ = make_history(seed=9, days=60)
+    symbol_price_arrays = build_symbol_price_arrays(price_data)
+
+    check_round_trip(symbol_price_arrays)
+    # No symbols at all (zero-length block) and a symbol without any closes
+    check_round_trip({})
+    check_round_trip({
+        "EMPTY": (np.array([], dtype="datetime64[D]"), np.array([], dtype=np.float64)),
+        **slice_symbol_price_arrays(symbol_price_arrays, "2023-01-01", "2023-01-31")
+    })
+
+    print("✅ Shared-memory price arrays round-trip intact")
+
+if __name__ == "__main__":
+    try:
+        test_top_k_indices_matches_stable_sort()
+        test_calculate_stock_momentum_matches_reference()
+        test_select_top_stocks_matches_reference()
+        test_slicing_at_period_boundaries()
+        test_shared_price_arrays_round_trip()
+        print("\n🎉 ALL TESTS PASSED - Simulation helpers match the original behaviour!")
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")